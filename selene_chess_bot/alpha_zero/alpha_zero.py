@@ -1,3 +1,8 @@
+import random
+import numpy as np
+
+from multiprocessing import Pool
+
 from game.game import Game
 
 from alpha_zero.mcst import MCST
@@ -23,20 +28,21 @@ class AlphaZero:
         state_manager = StateManager()
         game: Game = Game()
 
-        best_move: GameStateNode = GameStateNode.create_game_state(
+        self.root = GameStateNode.create_game_state(
             move=None,
             game=game,
             state_manager=state_manager,
         )
-        self.root = best_move
 
-        while not game.is_game_terminated:
+        # the same search is kept for the whole game, after every move the
+        # subtree of the move becomes the root of the next search
+        mcst = MCST(
+            root=self.root,
+            state_manager=state_manager,
+            exploration_weight=self.mcst_exploration_weight,
+        )
 
-            mcst = MCST(
-                root=best_move,
-                state_manager=state_manager,
-                exploration_weight=self.mcst_exploration_weight,
-            )
+        while not game.is_game_terminated:
 
             best_move = mcst.run(
                 iterations=self.depth_of_search,
@@ -52,14 +58,74 @@ class AlphaZero:
                 print('Game terminated.')
                 break
 
-            best_move = GameStateNode.create_game_state(
-                move=None,
-                game=game,
-                state_manager=state_manager,
-            )
+            mcst.advance_root(best_move)
 
         self.games_played += 1
         self.games_played_list.append(game)
 
         game.print_game_state()
         return self.root
+
+    def self_play(
+        self,
+        n_games: int,
+        n_workers: int = None,
+        seed: int = 0,
+    ) -> list[tuple[dict, int]]:
+        """
+        Play `n_games` independent games in parallel (root parallelism).
+
+        Every game runs in its own process with its own random seed, so the
+        rollouts do not share any state, and only the moves and the result
+        of each game are sent back to this process.
+
+        Parameters:
+        -----------
+        n_games : int
+            The number of games to be played.
+
+        n_workers : int, optional
+            The number of processes to use, defaults to the number of CPUs.
+
+        seed : int, optional
+            The seed of the first game, game `i` uses `seed + i`.
+
+        Returns:
+        --------
+        list[tuple[dict, int]]
+            A list of (moves, result) for each of the games played.
+        """
+
+        jobs = [
+            (seed + i, self.depth_of_search, self.mcst_exploration_weight)
+            for i in range(n_games)
+        ]
+
+        experience: list[tuple[dict, int]] = []
+        with Pool(n_workers) as pool:
+            for moves, result in pool.imap_unordered(_play_one_game, jobs):
+                experience.append((moves, result))
+
+        self.games_played += len(experience)
+        return experience
+
+
+def _play_one_game(job: tuple[int, int, float]) -> tuple[dict, int]:
+    """
+    Worker for AlphaZero.self_play, it has to live at module level so it can
+    be pickled by multiprocessing.
+    """
+
+    seed, depth_of_search, mcst_exploration_weight = job
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    alpha_zero = AlphaZero(
+        depth_of_search=depth_of_search,
+        mcst_exploration_weight=mcst_exploration_weight,
+    )
+    alpha_zero.play_game()
+
+    game: Game = alpha_zero.games_played_list[-1]
+    return game.moves, game.result
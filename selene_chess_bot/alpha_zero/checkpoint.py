@@ -33,6 +33,7 @@ class Checkpoint:
 
             node_data = {
                 'fen': node.fen,
+                'state': node.state,
                 'move': node.move,
                 'result': node.result,
                 'board_hash': node.board_hash,
@@ -1,9 +1,14 @@
 import numpy as np
 import pandas as pd
 
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
 from alpha_zero.node import GameStateNode
 from alpha_zero.state_manager import StateManager
 
+from board.encoder import BoardEncoder
+
 from core.printing import __print__ as pprint
 
 from game import Game
@@ -16,7 +21,21 @@ from pieces.utilites import PLAYER_VALUES
 # moves instead of calculating them again
 
 
+# Maximum number of positions kept in MCST.transposition_table, once it is
+# full the oldest entries are replaced first
+TRANSPOSITION_TABLE_SIZE: int = 1 << 16
+
+
 class MCST:
+
+    # Result of the forced checkmate search for every position seen by any
+    # search of the process, keyed by the Zobrist hash of the position (which
+    # includes the castling rights and the en passant file). It is
+    # a class attribute so it is shared between the searches of a game and
+    # between the tests run by the same worker, the value is the list of
+    # routes to checkmate, or None if there is no forced checkmate.
+    transposition_table: dict[int, list[dict] | None] = {}
+
     def __init__(
         self,
         initial_fen: str = None,
@@ -36,6 +55,10 @@ class MCST:
 
         self.root: GameStateNode = root
 
+        # encoded boards of the leaves evaluated together by run(batch_size)
+        self._batch_buffer: np.ndarray = None
+        self._packed_batches: bool = False
+
         self.initial_fen = initial_fen or self.root.fen
         self.state_manager = state_manager or StateManager()
         self.game: Game = Game.parse_fen(self.initial_fen)
@@ -103,7 +126,14 @@ class MCST:
         self,
         iterations: int = None,
         print_iterations: bool = True,
-        simulation_depth_penalty: float = 0.01
+        simulation_depth_penalty: float = 0.01,
+        n_threads: int = 1,
+        virtual_loss: int = 3,
+        batch_size: int = 1,
+        evaluate_batch: Callable[[np.ndarray], np.ndarray] = None,
+        early_exit_on_mate: bool = True,
+        mate_min_visits: int = 50,
+        packed_batches: bool = False,
     ) -> GameStateNode:
         """
         Run the Monte Carlo Tree Search for a specified number of iterations.
@@ -132,6 +162,38 @@ class MCST:
         simulation_depth_penalty : float
             The penalty for depth of simulation.
 
+        n_threads : int
+            The number of threads running iterations on the shared tree.
+
+        virtual_loss : int
+            The virtual loss applied to the selected path while an iteration
+            is running, so the threads (or the leaves of a batch) spread
+            over different nodes. Only used when n_threads or batch_size is
+            greater than 1.
+
+        batch_size : int
+            The number of leaves selected before they are evaluated together
+            (leaf parallelism).
+
+        evaluate_batch : Callable[[np.ndarray], np.ndarray], optional
+            Evaluates a (batch_size, 8, 8, 12) array of encoded boards in a
+            single call and returns one value per board, from the point of
+            view of white. Without it the leaves are evaluated by random
+            simulations.
+
+        early_exit_on_mate : bool
+            Stop before running all the iterations once a checkmate for the
+            player to move is found from the root, see `is_mate_found`.
+
+        mate_min_visits : int
+            The number of visits the best child of the root needs before a
+            checkmate found below it stops the search.
+
+        packed_batches : bool
+            Give `evaluate_batch` a (batch_size, 12) uint64 array with the
+            bitboards of each board instead of the (batch_size, 8, 8, 12)
+            array, see `BoardEncoder.encode_boards_packed`.
+
         Returns:
         --------
         Node
@@ -180,35 +242,143 @@ class MCST:
             )) * 3
             print(f"Number of iterations: {iterations}")
 
-        for i in range(iterations):
-            if print_iterations:
-                pprint(
-                    f"Running iteration {i+1}/{iterations}...",
-                    print_lines=False
+        if batch_size > 1:
+            self._packed_batches = packed_batches
+            if not packed_batches:
+                self._batch_buffer = np.zeros(
+                    (batch_size, 8, 8, 12), dtype=np.float32
+                )
+            for i in range(0, iterations, batch_size):
+                if early_exit_on_mate and self.is_mate_found(mate_min_visits):
+                    break
+                if print_iterations:
+                    pprint(
+                        f"Running iteration {i+1}/{iterations}...",
+                        print_lines=False
+                    )
+                self._run_batch(
+                    batch_size=min(batch_size, iterations - i),
+                    virtual_loss=virtual_loss,
+                    evaluate_batch=evaluate_batch,
+                    simulation_depth_penalty=simulation_depth_penalty,
                 )
 
-            node = self.root
-
-            while node.is_fully_expanded:
-                node = node.get_best_child()
+        elif n_threads > 1:
+            def run_iteration(i: int) -> None:
+                # the iterations already queued are skipped once the mate
+                # is found
+                if early_exit_on_mate and self.is_mate_found(mate_min_visits):
+                    return
+                self._run_iteration(
+                    iteration=i,
+                    iterations=iterations,
+                    virtual_loss=virtual_loss,
+                    print_iterations=print_iterations,
+                    simulation_depth_penalty=simulation_depth_penalty,
+                )
 
-                if node.is_game_terminated:
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                list(executor.map(run_iteration, range(iterations)))
+        else:
+            for i in range(iterations):
+                if early_exit_on_mate and self.is_mate_found(mate_min_visits):
                     break
+                self._run_iteration(
+                    iteration=i,
+                    iterations=iterations,
+                    virtual_loss=0,
+                    print_iterations=print_iterations,
+                    simulation_depth_penalty=simulation_depth_penalty,
+                )
 
-            if not node.is_game_terminated:
+        legal_moves = self.game.get_legal_moves(
+            show_as_list=True,
+            show_in_algebraic=True,
+            color=self.game.player_turn,
+        )
+        action_probs = np.zeros(len(legal_moves))
+        self.create_actions_df(legal_moves, action_probs)
+
+        return legal_moves[np.argmax(action_probs)]
+
+    def is_mate_found(self, min_visits: int = 50) -> bool:
+        """
+        Check if the search already found a checkmate for the player to move
+        on the root, so the remaining iterations can't change the best move.
+
+        This is the case when the root is terminated (the checkmate detector
+        found a forced checkmate from it, or the game is over), or when the
+        most visited child of the root has been visited more than
+        `min_visits` times and its value is a checkmate for the player to
+        move.
+
+        Parameters:
+        -----------
+        min_visits : int
+            The number of visits the most visited child needs.
+
+        Returns:
+        --------
+        bool
+            True if the search can stop.
+        """
 
-                # before expanding, we need to check if there is a
-                # force checkmate on the position
+        root = self.root
+        if root.is_game_terminated:
+            # every iteration would only backpropagate the root again
+            return True
 
-                value = self._manage_checkmate(node)
+        if not root.children:
+            return False
+
+        best_child = max(
+            root.children.values(), key=lambda child: child.num_visits
+        )
+        mate_value = PLAYER_VALUES[root.player_turn] * float('inf')
+
+        return (
+            best_child.num_visits > min_visits
+            and best_child.total_value == mate_value
+        )
+
+    def _run_iteration(
+        self,
+        iteration: int,
+        iterations: int,
+        virtual_loss: int,
+        print_iterations: bool,
+        simulation_depth_penalty: float,
+    ) -> None:
+        """
+        Run a single select, expand, simulate and backpropagate iteration.
+
+        When virtual_loss is given, every node on the selected path counts
+        as visited and lost until the iteration backpropagates, so other
+        threads selecting at the same time are pushed to other branches.
+        """
+
+        if print_iterations:
+            pprint(
+                f"Running iteration {iteration+1}/{iterations}...",
+                print_lines=False
+            )
+
+        path = self._select_path(virtual_loss)
+        node = path[-1]
+
+        try:
+            if not node.is_game_terminated:
+
+                node, value = self._expand_leaf(node)
+                if node is None:
+                    return
 
                 if not value:
-                    node = node.expand(Game.parse_fen(node.fen))
                     try:
                         value, simulation_depth = node.simulate()
                     except Exception as e:
                         pprint(e)
-                        continue
+                        return
                 else:
                     simulation_depth = 0
 
@@ -222,15 +392,208 @@ class MCST:
                 depth_penalty=simulation_depth_penalty
             )
 
-        legal_moves = self.game.get_legal_moves(
-            show_as_list=True,
-            show_in_algebraic=True,
-            color=self.game.player_turn,
-        )
-        action_probs = np.zeros(len(legal_moves))
-        self.create_actions_df(legal_moves, action_probs)
+        finally:
+            self._revert_virtual_loss(path, virtual_loss)
 
-        return legal_moves[np.argmax(action_probs)]
+    def _run_batch(
+        self,
+        batch_size: int,
+        virtual_loss: int,
+        evaluate_batch: Callable[[np.ndarray], np.ndarray],
+        simulation_depth_penalty: float,
+    ) -> None:
+        """
+        Select `batch_size` leaves, evaluate the new ones together and
+        backpropagate all of them.
+
+        The virtual loss of every selected path is kept until the whole batch
+        is evaluated, so the descents of the same batch diverge.
+        """
+
+        paths: list[list[GameStateNode]] = []
+        results: list[tuple[GameStateNode, float, int]] = []
+        pending: list[GameStateNode] = []
+
+        try:
+            for _ in range(batch_size):
+                path = self._select_path(virtual_loss)
+                paths.append(path)
+                node = path[-1]
+
+                if node.is_game_terminated:
+                    results.append((node, node.result, 0))
+                    continue
+
+                node, value = self._expand_leaf(node)
+                if node is None:
+                    continue
+
+                if value:
+                    results.append((node, value, 0))
+                else:
+                    pending.append(node)
+
+            results.extend(self._evaluate_leaves(pending, evaluate_batch))
+
+        finally:
+            for path in paths:
+                self._revert_virtual_loss(path, virtual_loss)
+
+        for node, value, simulation_depth in results:
+            node.backpropagate(
+                value=value,
+                simulation_depth=simulation_depth,
+                depth_penalty=simulation_depth_penalty
+            )
+
+    def _select_path(self, virtual_loss: int) -> list[GameStateNode]:
+        """
+        Descend from the root following the best child of every fully
+        expanded node, applying the virtual loss to each node of the path.
+        """
+
+        node = self.root
+        path: list[GameStateNode] = [node]
+
+        while node.is_fully_expanded:
+            node = node.get_best_child()
+            path.append(node)
+
+            if node.is_game_terminated:
+                break
+
+        if virtual_loss:
+            for path_node in path:
+                path_node.update_stats(
+                    visits=virtual_loss, value=-virtual_loss
+                )
+
+        return path
+
+    @staticmethod
+    def _revert_virtual_loss(
+        path: list[GameStateNode],
+        virtual_loss: int
+    ) -> None:
+
+        if virtual_loss:
+            for path_node in path:
+                path_node.update_stats(
+                    visits=-virtual_loss, value=virtual_loss
+                )
+
+    def _expand_leaf(
+        self,
+        node: GameStateNode
+    ) -> tuple[GameStateNode, int]:
+        """
+        Look for a forced checkmate on the node and expand it if there is
+        none.
+
+        Returns:
+        --------
+        tuple[GameStateNode, int]
+            The node to evaluate and the checkmate value (0 if there is no
+            forced checkmate). The node is None when another thread finished
+            the node while this one was waiting for the lock.
+        """
+
+        # only the expansion takes a lock, the selection reads the children
+        # of fully expanded nodes without one
+        with node.expansion_lock:
+            if node.is_game_terminated or node.is_fully_expanded:
+                return None, 0
+
+            # before expanding, we need to check if there is a force
+            # checkmate on the position
+            value = self._manage_checkmate(node)
+
+            if not value:
+                node = node.expand(Game.unpack_state(node.state))
+
+        return node, value
+
+    def _evaluate_leaves(
+        self,
+        nodes: list[GameStateNode],
+        evaluate_batch: Callable[[np.ndarray], np.ndarray],
+    ) -> list[tuple[GameStateNode, float, int]]:
+        """
+        Evaluate the new leaves of a batch, with a single call to
+        `evaluate_batch` if given, or with a random simulation each.
+        """
+
+        results: list[tuple[GameStateNode, float, int]] = []
+
+        if evaluate_batch is None:
+            for node in nodes:
+                try:
+                    value, simulation_depth = node.simulate()
+                except Exception as e:
+                    pprint(e)
+                    continue
+                results.append((node, value, simulation_depth))
+            return results
+
+        if not nodes:
+            return results
+
+        # all the leaves are encoded at once, straight into the buffer
+        boards = (Game.unpack_state(node.state).board for node in nodes)
+        if self._packed_batches:
+            batch = BoardEncoder.encode_boards_packed(boards)
+        else:
+            batch = BoardEncoder.encode_boards_into(
+                boards, self._batch_buffer
+            )
+
+        values = evaluate_batch(batch)
+        for node, value in zip(nodes, values):
+            results.append((node, float(value), node.depth))
+
+        return results
+
+    def advance_root(self, move: str) -> GameStateNode:
+        """
+        Make a move on the game of the search and keep the subtree of that
+        move as the new root, so the next call to `run` starts from the
+        iterations already spent on it.
+
+        Parameters:
+        -----------
+        move : str
+            The move played from the current root, in algebraic notation.
+
+        Returns:
+        --------
+        GameStateNode
+            The new root of the tree.
+        """
+
+        child: GameStateNode = self.root.children.get(move)
+        self.game.move_piece(move)
+
+        # the children created for the routes of a forced checkmate keep the
+        # position of their parent, so they can't be reused either
+        if child is None or child.board_hash != self.game.current_board_hash:
+            # the move was never expanded, so the search starts from scratch
+            child = GameStateNode.create_game_state(
+                move=move,
+                game=self.game,
+                state_manager=self.state_manager,
+                exploration_weight=self.root.exploration_weight,
+            )
+
+        # without the parent the backpropagation stops at the new root. The
+        # siblings are only freed if nothing else holds the old root,
+        # AlphaZero.play_game keeps the first root of the game to return the
+        # whole tree, so there they stay alive until the game ends
+        child.parent = None
+
+        self.root = child
+        self.initial_fen = child.fen
+
+        return child
 
     def create_actions_df(self, legal_moves: list, action_probs: np.array):
         visits = np.zeros(len(legal_moves))
@@ -256,21 +619,17 @@ class MCST:
         node: GameStateNode
     ) -> int:
 
-        checkmate_detector = CheckmateDetector(
-            fen=node.fen,
-            detecting_mate_for=node.player_turn
-        )
-        checkmate_detector.find_force_checkmate()
+        routes = self._probe_checkmate_routes(node)
 
         player_mate: int = 0
 
-        if checkmate_detector.is_checkmate:
+        if routes is not None:
             player_mate = PLAYER_VALUES[node.player_turn]
 
             # take the routes of the checkmate and create the children
             # of the node
 
-            for move_dict in checkmate_detector.get_routes_to_checkmates():
+            for move_dict in routes:
                 for move in move_dict:
 
                     if move == 'best_depth':
@@ -278,7 +637,7 @@ class MCST:
 
                     new_node = GameStateNode.create_game_state(
                         move=move,
-                        game=Game.parse_fen(node.fen),
+                        game=Game.unpack_state(node.state),
                         exploration_weight=node.exploration_weight,
                     )
                     new_node.backpropagate(
@@ -295,3 +654,40 @@ class MCST:
             node.is_game_terminated = True
 
         return player_mate
+
+    def _probe_checkmate_routes(
+        self,
+        node: GameStateNode
+    ) -> list[dict] | None:
+        """
+        Get the routes to a forced checkmate from the position of the node,
+        running the checkmate detector only if the position is not in the
+        transposition table yet.
+
+        Returns:
+        --------
+        list[dict] | None
+            The routes to checkmate, or None if there is no forced checkmate.
+        """
+
+        table = MCST.transposition_table
+
+        if node.board_hash in table:
+            return table[node.board_hash]
+
+        checkmate_detector = CheckmateDetector(
+            fen=node.fen,
+            detecting_mate_for=node.player_turn
+        )
+        checkmate_detector.find_force_checkmate()
+
+        routes: list[dict] | None = None
+        if checkmate_detector.is_checkmate:
+            routes = checkmate_detector.get_routes_to_checkmates()
+
+        if len(table) >= TRANSPOSITION_TABLE_SIZE:
+            # dicts keep the insertion order, so the first key is the oldest
+            table.pop(next(iter(table)), None)
+
+        table[node.board_hash] = routes
+        return routes
@@ -1,30 +1,70 @@
 import math
+import random
+import itertools
+import threading
 import numpy as np
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from pieces.utilites import PieceColor
 
 from game.game import Game
+from game.encoder import GameEncoder
 
 if TYPE_CHECKING:
     from alpha_zero.state_manager import StateManager
 
 
+# Most of the nodes in the tree have small visit counts, so the log of the
+# parent visits and the inverse square root of the child visits are looked up
+# in precomputed tables instead of being calculated on every selection.
+# NOTE: The tables are stored as lists, indexing a numpy array with a python
+# int returns a numpy scalar which is slower than math.log itself.
+UCB_TABLE_SIZE: int = 1 << 16
+
+LOG_TABLE: list[float] = np.log(
+    np.arange(1, UCB_TABLE_SIZE + 1)
+).tolist()
+
+SQRT_INV_TABLE: list[float] = np.sqrt(
+    1.0 / np.arange(1, UCB_TABLE_SIZE + 1)
+).tolist()
+
+
+# The visit count and total value of a node are updated by every thread that
+# backpropagates through it, instead of one global mutex the updates take one
+# of a fixed set of locks chosen by the id of the node.
+STATS_LOCK_SHARDS: int = 256
+
+_STATS_LOCKS: list[threading.Lock] = [
+    threading.Lock() for _ in range(STATS_LOCK_SHARDS)
+]
+
+# Expansion is the only step that changes the children of a node, it is
+# serialized with its own set of shards so selection never takes a lock.
+_EXPANSION_LOCKS: list[threading.Lock] = [
+    threading.Lock() for _ in range(STATS_LOCK_SHARDS)
+]
+
+# next() on itertools.count is atomic under the GIL
+_NODE_IDS: itertools.count = itertools.count()
+
+
 class GameStateNode:
     """
     GameStateNode class representing a node in the Monte Carlo Search Tree.
 
     Attributes:
     -----------
-    fen : str
-        The FEN (Forsyth-Edwards Notation) string representing the game state.
+    state : bytes
+        The game state packed by `Game.pack_state`, the FEN
+        (Forsyth-Edwards Notation) string is available through `fen`.
 
     result : int
         The result of the game from this node's perspective
         (e.g., win, loss, draw).
 
-    board_hash : bytes
+    board_hash : int
         A hash representing the current board position.
 
     player_turn : PieceColor
@@ -33,22 +73,29 @@ class GameStateNode:
     is_game_terminated : bool
         A flag indicating whether the game has ended.
 
-    expandable_moves : set[str]
-        A set of legal moves that can be made from this position.
+    expandable_moves : tuple[str]
+        The legal moves that can be made from this position.
+
+    untried_moves : list[str]
+        The legal moves that have not been expanded into children yet.
 
     exploration_weight : float
         The weight used in the UCB calculation for balancing exploration and
         exploitation.
 
+    node_id : int
+        A unique id for the node, used to pick the lock shard guarding its
+        statistics.
+
     Methods:
     --------
     __init__(
         fen: str,
         result: int,
-        board_hash: bytes,
+        board_hash: int,
         player_turn: PieceColor,
         is_game_terminated: bool,
-        expandable_moves: set[str],
+        expandable_moves: Iterable[str],
         exploration_weight: float = 1.414
     ):
         Initialize the GameStateNode with the given game state parameters.
@@ -68,6 +115,10 @@ class GameStateNode:
     increment_visits() -> None:
         Increment the visit count for the node.
 
+    update_stats(visits: int, value: float) -> None:
+        Add to the visit count and total value of the node under its lock
+        shard.
+
     select() -> 'GameStateNode':
         Select the child node with the highest UCB value.
 
@@ -100,12 +151,13 @@ class GameStateNode:
         fen: str,
         move: str,
         result: int,
-        board_hash: bytes,
+        board_hash: int,
         player_turn: PieceColor,
         is_game_terminated: bool,
-        expandable_moves: set[str],
+        expandable_moves: Iterable[str],
         exploration_weight: float = 1.414,
         state_manager: 'StateManager' = None,
+        state: bytes = None,
         **kwargs
     ) -> None:
         """
@@ -115,13 +167,14 @@ class GameStateNode:
         -----------
         fen : str
             The FEN (Forsyth-Edwards Notation) string representing the game
-            state.
+            state, it is packed into `state`. It can be None if `state` is
+            given.
 
         result : int
             The result of the game from this node's perspective
             (e.g., win, loss, draw).
 
-        board_hash : bytes
+        board_hash : int
             A hash representing the current board position.
 
         player_turn : PieceColor
@@ -130,27 +183,42 @@ class GameStateNode:
         is_game_terminated : bool
             A flag indicating whether the game has ended.
 
-        expandable_moves : set[str]
-            A set of legal moves that can be made from this position.
+        expandable_moves : Iterable[str]
+            The legal moves that can be made from this position.
 
         exploration_weight : float, optional
             The weight used in the UCB calculation for balancing exploration
             and exploitation (default is 1.414).
+
+        state : bytes, optional
+            The game state packed by `Game.pack_state`, when given the fen is
+            not needed.
         """
+        self.node_id: int = next(_NODE_IDS)
         self.parent: GameStateNode = None
         self.children: dict[bytes, 'GameStateNode'] = {}
-        self.board_hash: bytes = board_hash
+        self.board_hash: int = board_hash
         self.is_game_terminated: bool = is_game_terminated
 
         self.result: int = result
-        self.fen: str = fen
+        # the position is kept packed (38 bytes) instead of as a FEN string,
+        # the FEN is built back from it when needed
+        self.state: bytes = (
+            state if state is not None else GameEncoder.pack_fen(fen)
+        )
 
         self.player_turn: PieceColor = player_turn
         self.num_visits: int = 0
         self.total_value: float = 0.0
 
-        self.expandable_moves: set['GameStateNode'] = expandable_moves
-        self.untried_moves: set['GameStateNode'] = expandable_moves.copy()
+        # expandable_moves is never mutated, so it is stored as a tuple, the
+        # untried moves are only sampled and popped, so a list is enough
+        self.expandable_moves: tuple[str] = tuple(expandable_moves)
+        self.untried_moves: list[str] = list(self.expandable_moves)
+
+        # set only once the last child has been added to children, so a
+        # selection reading it without a lock always sees every child
+        self._is_fully_expanded: bool = not self.untried_moves
 
         self.policy: dict[bytes, float] = {}
         self.exploration_weight: float = exploration_weight
@@ -165,6 +233,18 @@ class GameStateNode:
 
     #  ---------------------------- PROPERTIES ----------------------------
 
+    @property
+    def fen(self) -> str:
+        """
+        Get the FEN of the position of the node.
+
+        Returns:
+        --------
+        str
+            The FEN built from the packed state of the node.
+        """
+        return GameEncoder.unpack_fen(self.state)
+
     @property
     def move_number(self) -> int:
         """
@@ -187,7 +267,19 @@ class GameStateNode:
         bool
             True if the node is fully expanded, False otherwise.
         """
-        return len(self.expandable_moves) == len(self.children)
+        return self._is_fully_expanded
+
+    @property
+    def expansion_lock(self) -> threading.Lock:
+        """
+        Get the lock serializing the expansion of the node.
+
+        Returns:
+        --------
+        threading.Lock
+            The expansion lock shard of the node.
+        """
+        return _EXPANSION_LOCKS[self.node_id & (STATS_LOCK_SHARDS - 1)]
 
     #  ---------------------------- STATIC METHODS ----------------------------
 
@@ -220,8 +312,9 @@ class GameStateNode:
 
         return GameStateNode(
             move=move,
+            fen=None,
             result=game.result,
-            fen=game.current_fen,
+            state=game.pack_state(),
             state_manager=state_manager,
             player_turn=game.player_turn,
             expandable_moves=expandable_moves,
@@ -257,8 +350,25 @@ class GameStateNode:
         exploitation_term = node.total_value / node.num_visits
 
         # Calculate the exploration term (UCB)
-        exploration_term = node.exploration_weight * math.sqrt(
-            math.log(node.parent.num_visits) / node.num_visits
+        parent_visits = node.parent.num_visits
+        num_visits = node.num_visits
+
+        # an unvisited parent is left to math.log, which raises instead of
+        # reading LOG_TABLE[-1]
+        if 0 < parent_visits <= UCB_TABLE_SIZE:
+            log_parent_visits = LOG_TABLE[parent_visits - 1]
+        else:
+            log_parent_visits = math.log(parent_visits)
+
+        if num_visits <= UCB_TABLE_SIZE:
+            sqrt_inv_visits = SQRT_INV_TABLE[num_visits - 1]
+        else:
+            sqrt_inv_visits = 1 / math.sqrt(num_visits)
+
+        exploration_term = (
+            node.exploration_weight *
+            math.sqrt(log_parent_visits) *
+            sqrt_inv_visits
         )
 
         # Depth penalty term (penalize deeper nodes)
@@ -312,7 +422,26 @@ class GameStateNode:
         """
         Increment the visit count for the node.
         """
-        self.num_visits += 1
+        self.update_stats(visits=1)
+
+    def update_stats(self, visits: int = 0, value: float = 0.0) -> None:
+        """
+        Add to the visit count and total value of the node.
+
+        The read-modify-write of both attributes is done under the lock shard
+        of the node, so concurrent backpropagations don't lose updates.
+
+        Parameters:
+        -----------
+        visits : int
+            The number of visits to add (negative to revert a virtual loss).
+
+        value : float
+            The value to add to the total value.
+        """
+        with _STATS_LOCKS[self.node_id & (STATS_LOCK_SHARDS - 1)]:
+            self.num_visits += visits
+            self.total_value += value
 
     def get_best_child(self) -> 'GameStateNode':
         """
@@ -361,16 +490,20 @@ class GameStateNode:
     def retrieve_move_from_untried_moves(self) -> str:
         """
         Get a move that has not been tried yet and remove it from the
-        set of untried moves
+        list of untried moves
 
         Returns:
         --------
         str
             A move that has not been tried yet.
         """
-        # BUG: Sometimes the untried moves set is empty
-        random_move = np.random.choice(list(self.untried_moves))
-        self.untried_moves.remove(random_move)
+        # BUG: Sometimes the untried moves list is empty
+        # swap the sampled move with the last one so the pop is O(1)
+        untried_moves = self.untried_moves
+        index = random.randrange(len(untried_moves))
+        random_move = untried_moves[index]
+        untried_moves[index] = untried_moves[-1]
+        untried_moves.pop()
         return random_move
 
     def expand(
@@ -394,14 +527,15 @@ class GameStateNode:
             state_manager=self.state_manager,
             exploration_weight=self.exploration_weight,
         )
-        self.add_child(move, new_node)
         new_node.add_parent(self)
+        self.add_child(move, new_node)
+        self._is_fully_expanded = not self.untried_moves
 
         return new_node
 
     def simulate(self) -> tuple[float, int]:
 
-        game_instance = Game.parse_fen(self.fen)
+        game_instance = Game.unpack_state(self.state)
         value: float = game_instance.result
 
         value = game_instance.get_opponent_value(value=value)
@@ -451,9 +585,8 @@ class GameStateNode:
             The result of the simulation to be propagated.
         """
 
-        self.increment_visits()
         depth_penalty_term = depth_penalty * (simulation_depth - self.depth)
-        self.total_value += value - depth_penalty_term
+        self.update_stats(visits=1, value=value - depth_penalty_term)
 
         if self.parent:
             self.parent.backpropagate(
@@ -6,11 +6,11 @@ if TYPE_CHECKING:
 
 class StateManager:
     def __init__(self):
-        self.state_dict: dict[bytes, 'GameStateNode'] = {}
+        self.state_dict: dict[int, 'GameStateNode'] = {}
 
     def get_state(
         self,
-        board_hash: bytes,
+        board_hash: int,
         check_exists: bool = True,
     ) -> 'GameStateNode | False':
 
@@ -34,5 +34,5 @@ class StateManager:
         if game_state.board_hash not in self.state_dict:
             self.state_dict[game_state.board_hash] = game_state
 
-    def __contains__(self, board_hash: bytes) -> bool:
+    def __contains__(self, board_hash: int) -> bool:
         return self.get_state(board_hash)
@@ -23,7 +23,7 @@ class TestDeserializer(TestCase):
             key=lambda n: n.num_visits
         )
 
-        game = Game.parse_fen(best_move.fen)
+        game = Game.unpack_state(best_move.state)
         game.board.print_board(show_in_algebraic_notation=True)
 
         # checkpoint = Checkpoint()
@@ -1,46 +1,29 @@
 from unittest import TestCase
 
-from core.testing import print_starting, print_success
+from core.testing import (
+    print_starting, print_success, debug_board, mirror_colors,
+    CHECKMATE_FIXTURES, CheckmateTestMixin
+)
 
-from game.game import Game
-from pieces.utilites import PieceName, PieceColor, RookSide
+from pieces.utilites import PieceName, PieceColor
 
 from alpha_zero.mcst import MCST
 
 
-class TestCheckmateBlack(TestCase):
+class TestCheckmateBlack(CheckmateTestMixin, TestCase):
 
-    def setUp(self) -> None:
-        self.initialize_game()
-        return super().setUp()
-
-    def tearDown(self) -> None:
-        self.initialize_game()
-        return super().tearDown()
-
-    def initialize_game(self) -> None:
-        self.game = Game()
-        self.game.board.clean_board()
+    # the layouts of the white tests with the colors swapped, black mates
+    FIXTURES = {
+        name: mirror_colors(layout)
+        for name, layout in CHECKMATE_FIXTURES.items()
+    }
 
     def load_mcst(self):
         self.game.player_turn = PieceColor.BLACK
         self.game.create_current_fen()
         self.mcst = MCST(initial_fen=self.game.current_fen)
 
-    def run_all_tests(self):
-        """
-            Run all the tests
-        """
-        methods = [
-            getattr(self, method) for method in dir(self)
-            if callable(getattr(self, method)) and method.startswith('t_')
-        ]
-
-        for method in methods:
-            self.initialize_game()
-            method()
-
-    def t_checkmate_two_rooks(self):
+    def test_checkmate_two_rooks(self):
         """
             Situation:
             White King on d8
@@ -52,51 +35,19 @@ class TestCheckmateBlack(TestCase):
         """
         print_starting()
 
-        # setting up pieces
-        # White King on d8
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='d8'
-        )
-
-        # Rooks
-        # One rook on a7
-        self.game.board.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='a7',
-            additional_information={
-                'rook_side': RookSide.QUEEN
-            }
-        )
-
-        # One rook on h1
-        self.game.board.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='h2',
-            additional_information={
-                'rook_side': RookSide.KING
-            }
-        )
-
-        # BLACK king on e1
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='e1'
+        self.game.board.load_from_bitboards(
+            self.FIXTURES['two_rooks']
         )
 
         self.load_mcst()
         best_move = self.mcst.run(iterations=200)
         self.game.move_piece(best_move)
-        self.game.board.print_board(show_in_algebraic_notation=True)
+        debug_board(self.game.board, show_in_algebraic_notation=True)
         self.assertEqual(best_move, 'Rhh8')
 
         print_success()
 
-    def t_checkmate_king_and_queen(self):
+    def test_checkmate_king_and_queen(self):
         """
             Situation:
             Black King on d8
@@ -109,28 +60,11 @@ class TestCheckmateBlack(TestCase):
         """
 
         print_starting()
-        # add the white king
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='d8'
-        )
-
-        # add the black king
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='d6'
-        )
-
-        # add the black queen
-        self.game.board.add_piece(
-            piece=PieceName.QUEEN,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='h1'
+        self.game.board.load_from_bitboards(
+            self.FIXTURES['king_and_queen']
         )
 
-        self.game.board.print_board()
+        debug_board(self.game.board)
 
         self.load_mcst()
         best_move = self.mcst.run(iterations=200)
@@ -141,7 +75,7 @@ class TestCheckmateBlack(TestCase):
 
         print_success()
 
-    def t_checkmate_in_two(self):
+    def test_checkmate_in_two(self):
         """
             Situation:
             Black King on h1
@@ -179,20 +113,16 @@ class TestCheckmateBlack(TestCase):
         best_move = self.mcst.run(iterations=1000)
         self.game.move_piece(best_move)
         # Best moves are Kf2 or Kg3
-        self.game.board.print_board(show_in_algebraic_notation=True)
+        debug_board(self.game.board, show_in_algebraic_notation=True)
         print_success()
 
-    def t_real_position_mate_in_two(self):
+    def test_real_position_mate_in_two(self):
 
         fen = 'r1b1R3/2qn1p1k/p5p1/1p1p3p/7Q/P2B4/1bP2PPP/R5K1 w - - 1 2'
         mcst = MCST(initial_fen=fen)
-        mcst.run(iterations=5000)
+        best_move = mcst.run(iterations=5000)
 
-    def test_run_tests(self):
-        """
-            Since running all the test could take a significant amount of time,
-            this method is used to run a single test if needed.
-
-            If you want to run all the tests, use the `run_all_tests` method.
-        """
-        self.t_checkmate_king_and_queen()
+        # the search stops as soon as the mate is found, Qxh5+ gxh5 Rh8#
+        self.assertTrue(mcst.is_mate_found())
+        self.assertEqual(best_move, 'Qhxh5')
+        self.assertLess(mcst.root.num_visits, 5000)
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+from core.testing import debug_board
+
 from game.game import Game
 
 from alpha_zero.mcst import MCST
@@ -19,5 +21,18 @@ class TestMCST(TestCase):
             mcst.root.children.values(),
             key=lambda n: n.num_visits
         )
-        game = Game.parse_fen(best_move.fen)
-        game.board.print_board(show_in_algebraic_notation=True)
+        game = Game.unpack_state(best_move.state)
+        debug_board(game.board, show_in_algebraic_notation=True)
+
+    def test_checkmate_routes_en_passant(self):
+        # the same position, only the pawn that can be captured en passant
+        # changes, so the routes found for one can't be given to the other
+        c_mcst = MCST(initial_fen='4k3/8/8/8/1pPPp3/8/8/4K3 b - c4 0 1')
+        d_mcst = MCST(initial_fen='4k3/8/8/8/1pPPp3/8/8/4K3 b - d4 0 1')
+
+        table = MCST.transposition_table
+        table[c_mcst.root.board_hash] = [{'bxc3': [], 'best_depth': 1}]
+        self.addCleanup(table.pop, c_mcst.root.board_hash, None)
+        self.addCleanup(table.pop, d_mcst.root.board_hash, None)
+
+        self.assertIsNone(d_mcst._probe_checkmate_routes(d_mcst.root))
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from core.testing import print_starting, print_success
+
+from alpha_zero.alpha_zero import AlphaZero, _play_one_game
+
+
+class TestSelfPlay(TestCase):
+
+    def test_self_play(self):
+        print_starting()
+
+        alpha_zero = AlphaZero(depth_of_search=1)
+        experience = alpha_zero.self_play(n_games=2, n_workers=1, seed=0)
+
+        self.assertEqual(len(experience), 2)
+        self.assertEqual(alpha_zero.games_played, 2)
+
+        for moves, result in experience:
+            self.assertIsInstance(moves, dict)
+            self.assertTrue(moves)
+            self.assertIn(result, (-1, 0, 1))
+
+        # with a single worker the games come back in the order of the
+        # seeds, the second game was played with seed 1
+        replayed = _play_one_game((1, 1, alpha_zero.mcst_exploration_weight))
+        self.assertEqual(replayed, experience[1])
+
+        print_success()
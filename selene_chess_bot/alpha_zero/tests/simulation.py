@@ -1,7 +1,7 @@
-import json
-
 from django.test import TestCase
 
+from core.ndjson import read_ndjson
+
 from game.game import Game
 
 
@@ -15,10 +15,8 @@ class TestSimulation(TestCase):
         return super().tearDown()
 
     def test_game_from_simulation(self):
-        file_path = 'simulation_errors.json'
-
-        with open(file_path, 'r') as file:
-            data: dict = json.load(file)['data']
+        file_path = 'simulation_errors.ndjson'
+        data: list[dict] = read_ndjson(file_path)
 
         moves: dict[str[list]] = data[0]['moves']
         # where the number is the key and the value is the list of moves for
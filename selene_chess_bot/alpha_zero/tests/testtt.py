@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from core.testing import print_starting, print_success, parse_fen
+
+from alpha_zero import testtt
+
+
+# the same position, the only difference is the pawn that can be captured en
+# passant
+EN_PASSANT_C_FEN = '4k3/8/8/8/1pPPp3/8/8/4K3 b - c4 0 1'
+EN_PASSANT_D_FEN = '4k3/8/8/8/1pPPp3/8/8/4K3 b - d4 0 1'
+
+
+class TestTesttt(TestCase):
+
+    def setUp(self):
+        testtt.LEGAL_MOVES_CACHE.clear()
+        testtt.TRANSPOSITION_TABLE.clear()
+
+    def test_legal_moves_cache_en_passant(self):
+        print_starting()
+
+        c_game = parse_fen(EN_PASSANT_C_FEN)
+        d_game = parse_fen(EN_PASSANT_D_FEN)
+
+        self.assertNotEqual(
+            c_game.current_board_hash,
+            d_game.current_board_hash
+        )
+
+        c_moves = testtt.get_legal_moves(c_game)
+        d_moves = testtt.get_legal_moves(d_game)
+
+        self.assertIn('bxc3', c_moves)
+        self.assertNotIn('exd3', c_moves)
+
+        self.assertIn('exd3', d_moves)
+        self.assertNotIn('bxc3', d_moves)
+
+        print_success()
+
+    def test_transposition_table_en_passant(self):
+        print_starting()
+
+        c_node = testtt.GameStateNode.get_node(parse_fen(EN_PASSANT_C_FEN))
+        d_node = testtt.GameStateNode.get_node(parse_fen(EN_PASSANT_D_FEN))
+
+        self.assertIsNot(c_node, d_node)
+        self.assertEqual(len(testtt.TRANSPOSITION_TABLE), 2)
+
+        self.assertIn('bxc3', c_node.expandable_moves)
+        self.assertIn('exd3', d_node.expandable_moves)
+
+        print_success()
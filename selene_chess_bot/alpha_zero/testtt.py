@@ -1,21 +1,163 @@
 import math
-import json
-import os
+import random
 import numpy as np
 
-from typing import Any, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, TYPE_CHECKING
+
+try:
+    import numba
+except ImportError:
+    # numba is optional, without it select() uses the NumPy path
+    numba = None
+
+from core.ndjson import append_ndjson
 
 from pieces.utilites import PieceColor
 
+from game.encoder import GameEncoder
+
 
 if TYPE_CHECKING:
     from game.game import Game
 
 C_VALUE = 1.414
 
+# From this number of children select() computes the UCB of all of them at
+# once with NumPy, below it the fixed cost of NumPy is higher than the loop
+NUMPY_UCB_MIN_CHILDREN: int = 8
+
+# Maximum number of nodes kept in TRANSPOSITION_TABLE, once it is full the
+# oldest entries are replaced first
+TRANSPOSITION_TABLE_SIZE: int = 1 << 20
+
+# Node of every position created by the search, keyed by the Zobrist hash of
+# the position (it includes the side to move, castling and en passant), so
+# the same position reached by different move orders is a single node
+TRANSPOSITION_TABLE: dict[int, 'GameStateNode'] = {}
+
+# Maximum number of positions kept in LEGAL_MOVES_CACHE, once it is full the
+# oldest entries are replaced first
+LEGAL_MOVES_CACHE_SIZE: int = 1 << 20
+
+# Legal moves (in algebraic notation) of a color in a position, keyed by the
+# Zobrist hash of the position and the color, the rollouts go through the
+# same positions many times and the move generation is the slowest part
+LEGAL_MOVES_CACHE: dict[tuple[int, PieceColor], tuple[str, ...]] = {}
+
+
+# Every move (in algebraic notation) seen by the search gets a small int id,
+# the children and the explored moves are keyed by it since ints hash faster
+# than strings, _MOVES maps the ids back to the moves
+_MOVE_IDS: dict[str, int] = {}
+_MOVES: list[str] = []
+
+
+def move_id(move: str) -> int:
+    """
+    Returns the id of the move, a new one if the move wasn't seen before.
+    """
+    id_ = _MOVE_IDS.get(move)
+    if id_ is None:
+        id_ = _MOVE_IDS[move] = len(_MOVES)
+        _MOVES.append(move)
+    return id_
+
+
+def move_from_id(id_: int) -> str:
+    return _MOVES[id_]
+
+
+def _ucb_argmax_kernel(
+    child_visits: np.ndarray,
+    log_visits: float,
+    q_value: float,
+    c_value: float
+) -> int:
+    # index of the child with the highest UCB, written as a plain loop so
+    # numba can compile it, an unvisited child is returned right away
+    best_ucb = -np.inf
+    best_index = 0
+
+    for i in range(child_visits.shape[0]):
+        if child_visits[i] == 0:
+            return i
+
+        ucb = q_value + c_value * math.sqrt(log_visits / child_visits[i])
+        if ucb > best_ucb:
+            best_ucb = ucb
+            best_index = i
+
+    return best_index
+
+
+# the kernel is only worth calling when it is compiled to native code
+_ucb_argmax: Callable[[np.ndarray, float, float, float], int] | None = (
+    numba.njit(cache=True, fastmath=True)(_ucb_argmax_kernel)
+    if numba is not None else None
+)
+
+
+def _fast_choice(moves: tuple[str, ...], _random=random.random) -> str:
+    # random.choice goes through randbelow, flooring random() is faster and
+    # uniform enough for the rollouts
+    return moves[int(_random() * len(moves))]
+
+
+def get_legal_moves(game: 'Game', color: PieceColor = None) -> tuple[str, ...]:
+    """
+    Returns the legal moves of the color (the player to move by default) in
+    the current position of the game, from LEGAL_MOVES_CACHE if the position
+    was already seen.
+    """
+
+    if color is None:
+        color = game.player_turn
+
+    key = (game.current_board_hash, color)
+    moves = LEGAL_MOVES_CACHE.get(key)
+
+    if moves is None:
+        moves = tuple(game.get_legal_moves(
+            color=color,
+            show_in_algebraic=True,
+            show_as_list=True
+        ))
+
+        if len(LEGAL_MOVES_CACHE) >= LEGAL_MOVES_CACHE_SIZE:
+            # dicts keep the insertion order, so the first is the oldest
+            LEGAL_MOVES_CACHE.pop(next(iter(LEGAL_MOVES_CACHE)))
+
+        LEGAL_MOVES_CACHE[key] = moves
+
+    return moves
+
 
 class GameStateNode:
 
+    # nodes never get attributes outside __init__, so they don't need a
+    # __dict__, there can be millions of them in a search
+    __slots__ = (
+        'game',
+        'parents',
+        'children',
+        '_children_list',
+        'board_hash',
+        'is_game_terminated',
+        '_white_value',
+        '_black_value',
+        '_game_values',
+        'state',
+        'player_turn',
+        'num_visits',
+        'total_value',
+        'expandable_moves',
+        'untried_moves',
+        'explored_moves',
+        'policy',
+        'exploration_weight',
+    )
+
     def __init__(
         self,
         game: 'Game',
@@ -25,43 +167,128 @@ class GameStateNode:
         self.game: 'Game' = game
 
         self.parents: set['GameStateNode'] = set()
-        self.children: dict[bytes, 'GameStateNode'] = {}  # Using a dict to map moves to child nodes
-        self.board_hash: bytes = game.current_board_hash
+        self.children: dict[int, 'GameStateNode'] = {}  # Maps the move ids to child nodes
+        # same nodes as children.values(), kept as a list for select()
+        self._children_list: list['GameStateNode'] = []
+        self.board_hash: int = game.current_board_hash
         self.is_game_terminated: bool = False
 
-        self.white_value: float = 0.0
-        self.black_value: float = 0.0
-        self.fen: str = game.current_fen
+        self._white_value: float = 0.0
+        self._black_value: float = 0.0
+        # dict returned by game_values, built again only after the values
+        # change
+        self._game_values: Mapping[PieceColor, float] | None = None
+        # the position is only needed to start the simulations, so it's kept
+        # packed (38 bytes) instead of as a FEN string
+        self.state: bytes = game.pack_state()
 
         self.player_turn: PieceColor = game.player_turn
         self.num_visits: int = 0
         self.total_value: float = 0.0  # Cumulative value from simulations
 
-        self.expandable_moves: set['GameStateNode'] = set()  # List of moves that can be expanded
-        self.explored_moves: set['GameStateNode'] = set()  # List of moves that have been explored
+        # the legal moves are only written once, by set_expandable_moves, and
+        # then read on every random choice, so they are kept as a tuple, the
+        # moves left to expand are popped from a list
+        self.expandable_moves: tuple[str, ...] = ()
+        self.untried_moves: list[str] = []
+        self.explored_moves: set[int] = set()  # Ids of the explored moves
+        self.set_expandable_moves(get_legal_moves(game))
 
         self.policy: dict[bytes, float] = {}  # Prior probabilities from NN for each move
         self.exploration_weight: float = exploration_weight
 
+    @staticmethod
+    def get_node(
+        game: 'Game',
+        parent: 'GameStateNode' = None,
+        exploration_weight: float = 1.0
+    ) -> 'GameStateNode':
+        """
+        Returns the node of the current position of the game, from the
+        transposition table if the position was already reached.
+        """
+
+        board_hash = game.current_board_hash
+        node = TRANSPOSITION_TABLE.get(board_hash)
+
+        if node is None:
+            if len(TRANSPOSITION_TABLE) >= TRANSPOSITION_TABLE_SIZE:
+                # dicts keep the insertion order, so the first is the oldest
+                TRANSPOSITION_TABLE.pop(next(iter(TRANSPOSITION_TABLE)))
+
+            node = GameStateNode(game, exploration_weight)
+            TRANSPOSITION_TABLE[board_hash] = node
+
+        node.add_parent(parent)
+        return node
+
     @property
-    def game_values(self) -> dict[PieceColor, float]:
-        return {
-            PieceColor.WHITE: self.white_value,
-            PieceColor.BLACK: self.black_value
-        }
+    def fen(self) -> str:
+        return GameEncoder.unpack_fen(self.state)
+
+    @property
+    def white_value(self) -> float:
+        return self._white_value
+
+    @white_value.setter
+    def white_value(self, value: float) -> None:
+        self._white_value = value
+        self._game_values = None
+
+    @property
+    def black_value(self) -> float:
+        return self._black_value
+
+    @black_value.setter
+    def black_value(self, value: float) -> None:
+        self._black_value = value
+        self._game_values = None
+
+    @property
+    def game_values_arr(self) -> tuple[float, float]:
+        # indexed by PieceColor.value, nothing is allocated but the tuple
+        return (self._white_value, self._black_value)
+
+    @property
+    def game_values(self) -> Mapping[PieceColor, float]:
+        # a read-only view of the cached dict, so the values of the node
+        # can't be changed through it
+        if self._game_values is None:
+            self._game_values = MappingProxyType({
+                PieceColor.WHITE: self._white_value,
+                PieceColor.BLACK: self._black_value
+            })
+        return self._game_values
 
     @property
     def is_fully_expanded(self) -> bool:
-        return len(self.expandable_moves) == 0
+        return len(self.untried_moves) == 0
 
-    def add_explored_move(self, game_state: 'GameStateNode') -> None:
-        self.explored_moves.add(game_state)
+    def set_expandable_moves(self, moves: Iterable[str]) -> None:
+        self.expandable_moves = tuple(moves)
+        self.untried_moves = list(self.expandable_moves)
+
+    def add_explored_move(self, move: str) -> None:
+        self.explored_moves.add(move_id(move))
 
     def add_parent(self, parent: 'GameStateNode') -> None:
         if parent is None:
             return
         self.parents.add(parent)
 
+    def add_child(self, move: str, child: 'GameStateNode') -> None:
+        move = move_id(move)
+        old_child = self.children.get(move)
+        if old_child is None:
+            self._children_list.append(child)
+        else:
+            index = self._children_list.index(old_child)
+            self._children_list[index] = child
+        self.children[move] = child
+
+    def get_child(self, move: str) -> 'GameStateNode | None':
+        return self.children.get(_MOVE_IDS.get(move))
+
     def increment_visits(self):
         self.num_visits += 1
 
@@ -72,8 +299,41 @@ class GameStateNode:
         best_child = None
         best_ucb = float('-inf')
 
-        for child in self.children:
-            ucb = self.get_ucb(child, self.player_turn)
+        # the q value and the log of the visits only depend on this node, so
+        # they are computed once and the loop only does a sqrt per child
+        values = self.game_values_arr
+        q_value = ((values[self.player_turn.value] / self.num_visits) + 1) / 2
+        log_visits = math.log(self.num_visits)
+
+        children = self._children_list
+        if len(children) >= NUMPY_UCB_MIN_CHILDREN:
+            visits = np.fromiter(
+                (child.num_visits for child in children),
+                dtype=np.float64,
+                count=len(children)
+            )
+
+            if _ucb_argmax is not None:
+                return children[
+                    _ucb_argmax(visits, log_visits, q_value, C_VALUE)
+                ]
+
+            # unvisited children get an infinite UCB, so the first of them
+            # goes first (their division is x / 0, or 0 / 0 on the first
+            # visit of this node, so it is overwritten instead of used)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ucb = q_value + C_VALUE * np.sqrt(log_visits / visits)
+            ucb[visits == 0] = np.inf
+            return children[int(ucb.argmax())]
+
+        sqrt = math.sqrt
+
+        for child in children:
+            # an unvisited child has an infinite UCB, as in the kernels
+            if child.num_visits == 0:
+                return child
+
+            ucb = q_value + C_VALUE * sqrt(log_visits / child.num_visits)
             if ucb > best_ucb:
                 best_ucb = ucb
                 best_child = child
@@ -85,12 +345,7 @@ class GameStateNode:
         Calculates the UCB value for the node.
         """
 
-        values = {
-            PieceColor.WHITE: self.white_value,
-            PieceColor.BLACK: self.black_value
-        }
-
-        value = values[side]
+        value = self.game_values_arr[side.value]
 
         q_value = ((value / self.num_visits) + 1) / 2
         ucb = q_value + C_VALUE * math.sqrt(
@@ -104,8 +359,11 @@ class GameStateNode:
         Returns a move that has not been tried yet.
         """
 
-        move = np.random.choice(self.expandable_moves)
-        self.expandable_moves.remove(move)
+        # swap the chosen move with the last one so it's popped in O(1)
+        moves = self.untried_moves
+        index = random.randrange(len(moves))
+        moves[index], moves[-1] = moves[-1], moves[index]
+        move = moves.pop()
         self.add_explored_move(move)
 
         return move
@@ -114,7 +372,7 @@ class GameStateNode:
         """
         Returns a random move from the list of explored moves.
         """
-        return np.random.choice(self.expandable_moves)
+        return random.choice(self.expandable_moves)
 
     def expand(self, game_instance: 'Game') -> 'GameStateNode | bool':
         """
@@ -126,7 +384,12 @@ class GameStateNode:
 
         move: str = self.get_random_move()
         game_instance.move_piece(move)
-        return game_instance.current_game_state, move
+        node = GameStateNode.get_node(
+            game_instance,
+            parent=self,
+            exploration_weight=self.exploration_weight
+        )
+        return node, move
 
     def simulate(
         self,
@@ -140,76 +403,129 @@ class GameStateNode:
         """
         Game would be the pointer to the game object.
         """
-        game_instance = game.parse_fen(self.fen)
-        current_game_state: GameStateNode = game_instance.current_game_state
-
         if self.is_game_terminated:
             return self.game_values
 
-        while True:
+        game_instance = game.unpack_state(self.state)
 
-            try:
-                valid_moves = current_game_state.expandable_moves
-                move = np.random.choice(valid_moves)
+        # the prints are only checked here, so the rollout used by the search
+        # runs the loop without them
+        if print_helpers:
+            self._simulate_debug(game_instance, delete_json, first_move)
+            print('Game terminated successfully')
+            game_instance.print_game_state()
+        else:
+            self._simulate_fast(game_instance, delete_json, first_move)
 
-                if print_helpers:
-                    print('-' * 50)
-                    print('Current move:', game_instance.current_turn)
-                    print('Player turn:', game_instance.player_turn)
-                    print('Selected move:', move)
+        if save_data:
+            self.save_simulation_data(
+                'completed_simulations.ndjson',
+                game_instance,
+                first_move=first_move,
+            )
 
-                game_instance.move_piece(move)
+        return game_instance.game_values
 
-                if print_helpers:
-                    game_instance.board.print_board()
-                    print('-' * 50)
+    def _simulate_fast(
+        self,
+        game_instance: 'Game',
+        delete_json: bool,
+        first_move: str
+    ) -> None:
+        """
+        Plays random moves until the game is terminated.
+        """
 
-                if game_instance.is_game_terminated:
-                    if print_helpers:
-                        print('Game terminated successfully')
-                        game_instance.print_game_state()
-                    file_path = 'completed_simulations.json'
+        # the methods are bound to locals so the loop doesn't look them up
+        # on every move
+        move_piece = game_instance.move_piece
+        choice = _fast_choice
+        legal_moves = get_legal_moves
 
-                    if save_data:
-                        self.save_simulation_data(
-                            file_path,
-                            game_instance,
-                            first_move=first_move,
-                        )
+        move = None
+        try:
+            # the only termination check of the rollout, move_piece sets the
+            # flag and the loop reads it before generating the next moves,
+            # so a finished game never asks for its (empty) legal moves
+            while not game_instance.is_game_terminated:
+                move = choice(legal_moves(game_instance))
+                move_piece(move)
 
-                    return game_instance.game_values
+        except Exception as e:
+            self._manage_simulation_error(
+                game_instance, e, move, delete_json, False, first_move
+            )
 
-            except Exception as e:
+    def _simulate_debug(
+        self,
+        game_instance: 'Game',
+        delete_json: bool,
+        first_move: str
+    ) -> None:
+        """
+        Same as _simulate_fast, printing every move and board.
+        """
 
-                # Let's create a JSON file where we can store the data from
-                # the game.
+        move = None
+        try:
+            while not game_instance.is_game_terminated:
+                move = random.choice(get_legal_moves(game_instance))
 
                 print('-' * 50)
-                print('error occurred')
-                print('last move:', move)
-                print(e)
-                print('valid moves:', valid_moves)
-                print('hash:', current_game_state.board_hash)
-                print('Saving to file')
+                print('Current move:', game_instance.current_turn)
+                print('Player turn:', game_instance.player_turn)
+                print('Selected move:', move)
+
+                game_instance.move_piece(move)
+
+                game_instance.board.print_board()
                 print('-' * 50)
 
-                file_path = 'simulation_errors.json'
-                self.save_simulation_data(
-                    file_path=file_path,
-                    game_instance=game_instance,
-                    error=e,
-                    delete_json=delete_json,
-                    print_helpers=print_helpers,
-                    last_move=move,
-                    first_move=first_move
-                )
-                raise Exception('Error occurred during simulation')
+        except Exception as e:
+            self._manage_simulation_error(
+                game_instance, e, move, delete_json, True, first_move
+            )
 
-            current_game_state = game_instance.current_game_state
+    def _manage_simulation_error(
+        self,
+        game_instance: 'Game',
+        error: Exception,
+        move: str,
+        delete_json: bool,
+        print_helpers: bool,
+        first_move: str
+    ) -> None:
+        """
+        Saves the data of a failed simulation and raises an exception.
+        """
+
+        # Let's create a JSON file where we can store the data from
+        # the game.
+
+        print('-' * 50)
+        print('error occurred')
+        print('last move:', move)
+        print(error)
+        print('valid moves:', get_legal_moves(game_instance))
+        print('hash:', game_instance.current_board_hash)
+        print('Saving to file')
+        print('-' * 50)
+
+        file_path = 'simulation_errors.ndjson'
+        self.save_simulation_data(
+            file_path=file_path,
+            game_instance=game_instance,
+            error=error,
+            delete_json=delete_json,
+            print_helpers=print_helpers,
+            last_move=move,
+            first_move=first_move
+        )
+        raise Exception('Error occurred during simulation')
 
     def save_simulation_data(
         self,
-        file_path: dict,
+        file_path: str,
         game_instance: 'Game',
         delete_json: bool = False,
         error: Any = None,
@@ -218,17 +534,6 @@ class GameStateNode:
         first_move: str = None
     ) -> None:
 
-        if delete_json:
-            data = {'data': []}
-        else:
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                with open(file_path, 'r') as f:
-                    data: dict = json.load(f)
-            else:
-                data = {
-                    'data': []
-                }
-
         white_king_in_check = 'No data'
         black_king_in_check = 'No data'
 
@@ -242,8 +547,6 @@ class GameStateNode:
         except Exception as e:
             print('Error getting black king in check:', e)
 
-        black_king_in_check = game_instance.board.black_king.is_in_check
-
         moves = game_instance.moves
         moves[1] = [first_move, moves[1][0]]
 
@@ -265,10 +568,11 @@ class GameStateNode:
 
         values = game_instance.game_values
 
-        if values[PieceColor.WHITE] == 'inf':
+        # JSON has no infinity, it would be written as null
+        if values[PieceColor.WHITE] == float('inf'):
             values[PieceColor.WHITE] = 999999999
 
-        if values[PieceColor.BLACK] == 'inf':
+        if values[PieceColor.BLACK] == float('inf'):
             values[PieceColor.BLACK] = 999999999
 
         data_to_append['game_values'] = {
@@ -280,11 +584,7 @@ class GameStateNode:
 
         wlm = None
         try:
-            wlm = game_instance.get_legal_moves(
-                color=PieceColor.WHITE,
-                show_in_algebraic=True,
-                show_as_list=True
-            )
+            wlm = list(get_legal_moves(game_instance, PieceColor.WHITE))
         except Exception as e:
             print('Error getting white moves:', e)
             wlm = 'Error getting white moves: ' + str(e)
@@ -293,19 +593,14 @@ class GameStateNode:
 
         blm = None
         try:
-            blm = game_instance.get_legal_moves(
-                color=PieceColor.BLACK,
-                show_in_algebraic=True,
-                show_as_list=True
-            )
+            blm = list(get_legal_moves(game_instance, PieceColor.BLACK))
         except Exception as e:
             print('Error getting black moves:', e)
             blm = 'Error getting black moves: ' + str(e)
 
         data_to_append['blm'] = blm
-        data['data'].append(data_to_append)
 
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
-            if print_helpers:
-                print('Data saved to file')
+        # one record per line, only the new record is written
+        append_ndjson(file_path, data_to_append, truncate=delete_json)
+        if print_helpers:
+            print('Data saved to file')
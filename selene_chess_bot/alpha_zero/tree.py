@@ -1,5 +1,10 @@
+import os
+import tempfile
+
 import networkx as nx
 
+from typing import Any, Callable, Iterable
+
 from shiny import App, ui
 from pyvis.network import Network
 
@@ -36,11 +41,22 @@ class TreeRepresentation:
         ):
             Generates an HTML representation of the tree using pyvis.
 
+        write_html_representation_of_tree(
+            nx_diagraph,
+            file_path,
+            height="1200px",
+            width="100%"
+        ):
+            Writes the HTML representation of the tree to a file.
+
         create_app(network_html, title='Si el momento se dio, aprovechalo'):
             Creates a Shiny App to display the tree visualization.
 
         view_tree():
             Initiates the visualization process for the game state tree.
+
+        show_tree(nx_diagraph, title='Si el momento se dio, aprovechalo'):
+            Runs the Shiny App showing the given representation of the tree.
     """
 
     def __init__(
@@ -80,6 +96,7 @@ class TreeRepresentation:
         visited: set = None,
         nx_graph: nx.DiGraph = None,
         use_string_hash: bool = False,
+        get_children: Callable[[Any], Iterable[Any]] = None,
     ) -> nx.DiGraph:
         """
         Creates a NetworkX DiGraph representation of the game state tree using
@@ -98,8 +115,14 @@ class TreeRepresentation:
             The NetworkX DiGraph being constructed (default is None).
 
         use_string_hash : bool, optional
-            If True, uses string hashes of nodes for edge creation
-            (default is False).
+            If True, the vertices of the graph are the hashes of the nodes
+            (their `board_hash`, a Zobrist int) instead of the nodes
+            themselves (default is False).
+
+        get_children : Callable[[Any], Iterable[Any]], optional
+            Returns the children of a node, so trees of other node classes
+            (e.g. the GameState model) can be represented as well
+            (default is None, the values of `node.children`).
 
         Returns:
         -------
@@ -113,30 +136,36 @@ class TreeRepresentation:
         if visited is None:
             visited = set()
 
-        # Check if the current node has already been visited
-        if str(parent.board_hash) in visited:
-            return nx_graph
+        add_edge = nx_graph.add_edge
 
-        # Mark the current node as visited
-        visited.add(str(parent.board_hash))
+        # iterative DFS, deep trees would reach the recursion limit
+        stack: list[GameStateNode] = [parent]
 
-        if len(parent.children) == 0:
-            return nx_graph
+        while stack:
+            node = stack.pop()
 
-        for _, child in parent.children.items():
+            # Check if the current node has already been visited
+            if node.board_hash in visited:
+                continue
 
-            edg1 = str(parent.board_hash) if use_string_hash else parent
-            edg2 = str(child.board_hash) if use_string_hash else child
+            # Mark the current node as visited
+            visited.add(node.board_hash)
 
-            child: GameStateNode
-            nx_graph.add_edge(edg1, edg2)
-            TreeRepresentation.create_tree_representation(
-                parent=child,
-                visited=visited,
-                nx_graph=nx_graph,
-                use_string_hash=use_string_hash
+            children = (
+                node.children.values() if get_children is None
+                else get_children(node)
             )
 
+            for child in children:
+                child: GameStateNode
+
+                if use_string_hash:
+                    add_edge(node.board_hash, child.board_hash)
+                else:
+                    add_edge(node, child)
+
+                stack.append(child)
+
         return nx_graph
 
     def get_html_representation_of_tree(
@@ -169,57 +198,48 @@ class TreeRepresentation:
             The HTML string for visualizing the tree.
         """
 
-        net = Network(height=height, width=width, directed=True)
-        root_node = [n for n, d in nx_diagraph.in_degree() if d == 0][0]
+        net = self._create_network(nx_diagraph, height=height, width=width)
+        return net.generate_html()
 
-        net.from_nx(nx_graph=nx_diagraph)
+    def write_html_representation_of_tree(
+        self,
+        nx_diagraph,
+        file_path: str,
+        height="1200px",
+        width="100%"
+    ) -> str:
 
-        for node in net.nodes:
-            if node["id"] == root_node:
-                node["color"] = "red"
+        """
+        Writes the HTML representation of the tree to a file, so big trees
+        can be served from the file instead of being embedded in the page.
 
-        # Set hierarchical layout and add custom interaction with JavaScript
-        net.set_options(
-            """
-            {
-                "layout": {
-                    "hierarchical": {
-                    "enabled": true,
-                    "levelSeparation": 150,
-                    "nodeSpacing": 100,
-                    "treeSpacing": 200,
-                    "direction": "UD",
-                    "sortMethod": "directed"
-                    }
-                },
-                "physics": {
-                    "enabled": false
-                },
-                "interaction": { "hover": true },
-                "manipulation": {
-                    "enabled": true,
-                    "initiallyActive": true,
-                    "addNode": false,
-                    "addEdge": false,
-                    "editEdge": false,
-                    "deleteNode": false,
-                    "deleteEdge": false,
-                    "controlNodeStyle": {
-                        "borderWidth": 2,
-                        "borderWidthSelected": 2,
-                        "color": "red"
-                    }
-                },
-                "edges": {
-                    "smooth": {
-                    "type": "dynamic"
-                    }
-                }
-            }
-            """
-        )
+        Parameters:
+        ----------
 
-        return net.generate_html()
+        nx_diagraph : nx.DiGraph
+            The NetworkX DiGraph representing the game state tree.
+
+        file_path : str
+            The path of the HTML file.
+
+        height : str, optional
+            The height of the HTML canvas for the tree visualization
+            (default is "1200px").
+
+        width : str, optional
+            The width of the HTML canvas for the tree visualization
+            (default is "100%").
+
+        Returns:
+        -------
+        str
+            The path of the HTML file.
+        """
+
+        net = self._create_network(nx_diagraph, height=height, width=width)
+        net.write_html(file_path, notebook=False, open_browser=False)
+
+        return file_path
 
     def view_tree(
         self,
@@ -234,21 +254,42 @@ class TreeRepresentation:
             parent=self.root_node,
         )
 
-        html_representation = self.get_html_representation_of_tree(
-            nx_diagraph=nx_diagraph
-        )
+        self.show_tree(nx_diagraph=nx_diagraph, title=title)
 
-        app = self._create_app(
-            title=title,
-            network_html=html_representation,
-        )
+    def show_tree(
+        self,
+        nx_diagraph: nx.DiGraph,
+        title: str = 'Si el momento se dio, aprovechalo'
+    ):
+        """
+        Runs the Shiny App showing the given representation of the tree.
+        """
+
+        # the tree is written to a file served by the app, instead of
+        # putting the whole HTML of the tree inside the page
+        with tempfile.TemporaryDirectory() as static_dir:
+            file_name = 'tree.html'
+            self.write_html_representation_of_tree(
+                nx_diagraph=nx_diagraph,
+                file_path=os.path.join(static_dir, file_name),
+            )
+
+            app = self._create_app(
+                title=title,
+                network_html=ui.tags.iframe(
+                    src=file_name,
+                    style='width: 100%; height: 1200px; border: none;'
+                ),
+                static_assets=static_dir,
+            )
 
-        app.run()
+            app.run()
 
     def _create_app(
         self,
-        network_html: str,
-        title: str = 'Si el momento se dio, aprovechalo'
+        network_html: 'str | ui.Tag',
+        title: str = 'Si el momento se dio, aprovechalo',
+        static_assets: str = None,
     ) -> App:
 
         """
@@ -258,12 +299,16 @@ class TreeRepresentation:
         ----------
 
         network_html : str
-            The HTML string for visualizing the tree.
+            The HTML string (or Shiny tag) for visualizing the tree.
 
         title : str, optional
             The title of the Shiny App
             (default is 'Si el momento se dio, aprovechalo').
 
+        static_assets : str, optional
+            A directory served by the app, for the HTML files of the trees
+            (default is None).
+
         Returns:
         -------
         App
@@ -278,8 +323,74 @@ class TreeRepresentation:
             ui.panel_main(
                 ui.panel_well(
                     ui.HTML(network_html)
+                    if isinstance(network_html, str) else network_html
                 )
             )
         )
 
-        return App(app_ui, server)
+        return App(app_ui, server, static_assets=static_assets)
+
+    def _create_network(
+        self,
+        nx_diagraph: nx.DiGraph,
+        height: str,
+        width: str
+    ) -> Network:
+
+        """
+        Creates the pyvis Network of the tree, with the root in red.
+        """
+
+        net = Network(height=height, width=width, directed=True)
+        root_node = next(n for n, d in nx_diagraph.in_degree() if d == 0)
+
+        # the color is given to the pyvis node, the graph of the caller is
+        # left as it is
+        net.from_nx(nx_graph=nx_diagraph)
+        for node in net.nodes:
+            if node["id"] == root_node:
+                node["color"] = "red"
+                break
+
+        # Set hierarchical layout and add custom interaction with JavaScript
+        net.set_options(
+            """
+            {
+                "layout": {
+                    "hierarchical": {
+                    "enabled": true,
+                    "levelSeparation": 150,
+                    "nodeSpacing": 100,
+                    "treeSpacing": 200,
+                    "direction": "UD",
+                    "sortMethod": "directed"
+                    }
+                },
+                "physics": {
+                    "enabled": false
+                },
+                "interaction": { "hover": true },
+                "manipulation": {
+                    "enabled": true,
+                    "initiallyActive": true,
+                    "addNode": false,
+                    "addEdge": false,
+                    "editEdge": false,
+                    "deleteNode": false,
+                    "deleteEdge": false,
+                    "controlNodeStyle": {
+                        "borderWidth": 2,
+                        "borderWidthSelected": 2,
+                        "color": "red"
+                    }
+                },
+                "edges": {
+                    "smooth": {
+                    "type": "dynamic"
+                    }
+                }
+            }
+            """
+        )
+
+        return net
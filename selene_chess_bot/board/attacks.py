@@ -0,0 +1,108 @@
+from core.utils import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_MASKS, ROOK_ATTACKS,
+    BISHOP_MASKS, BISHOP_ATTACKS
+)
+
+from pieces.utilites import PieceName
+
+
+# The functions of this module only take and return integers (bitboards,
+# where the bit `row * 8 + column` stands for a square), so they don't need
+# the Piece objects of the board.
+
+
+def pawn_attacks(pawns: int, color_value: int) -> int:
+    """
+        Returns the squares attacked by the pawns of the color with the given
+        value.
+    """
+
+    table = PAWN_ATTACKS[color_value]
+    attacks = 0
+    while pawns:
+        lowest_bit = pawns & -pawns
+        attacks |= table[lowest_bit.bit_length() - 1]
+        pawns ^= lowest_bit
+
+    return attacks
+
+
+def knight_attacks(knights: int) -> int:
+    """
+        Returns the squares attacked by the knights.
+    """
+
+    attacks = 0
+    while knights:
+        lowest_bit = knights & -knights
+        attacks |= KNIGHT_ATTACKS[lowest_bit.bit_length() - 1]
+        knights ^= lowest_bit
+
+    return attacks
+
+
+def king_attacks(kings: int) -> int:
+    """
+        Returns the squares attacked by the kings.
+    """
+
+    attacks = 0
+    while kings:
+        lowest_bit = kings & -kings
+        attacks |= KING_ATTACKS[lowest_bit.bit_length() - 1]
+        kings ^= lowest_bit
+
+    return attacks
+
+
+def rook_attacks(rooks: int, occupied: int) -> int:
+    """
+        Returns the squares attacked along the rows and the columns by the
+        given pieces, each ray ends at the first occupied square.
+    """
+
+    attacks = 0
+    while rooks:
+        lowest_bit = rooks & -rooks
+        square = lowest_bit.bit_length() - 1
+        attacks |= ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+        rooks ^= lowest_bit
+
+    return attacks
+
+
+def bishop_attacks(bishops: int, occupied: int) -> int:
+    """
+        Returns the squares attacked along the diagonals by the given pieces,
+        each ray ends at the first occupied square.
+    """
+
+    attacks = 0
+    while bishops:
+        lowest_bit = bishops & -bishops
+        square = lowest_bit.bit_length() - 1
+        attacks |= BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+        bishops ^= lowest_bit
+
+    return attacks
+
+
+def all_attacks(
+    bitboards: dict[PieceName, int],
+    color_value: int,
+    occupied: int
+) -> int:
+    """
+        Returns the squares attacked by all the pieces of a color, given the
+        bitboard of each one of its piece names and the occupied squares.
+    """
+
+    queens = bitboards[PieceName.QUEEN]
+
+    return (
+        pawn_attacks(bitboards[PieceName.PAWN], color_value)
+        | knight_attacks(bitboards[PieceName.KNIGHT])
+        | king_attacks(bitboards[PieceName.KING])
+        | rook_attacks(bitboards[PieceName.ROOK] | queens, occupied)
+        | bishop_attacks(bitboards[PieceName.BISHOP] | queens, occupied)
+    )
@@ -1,16 +1,23 @@
+import random
+
 import numpy as np
 
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator
+
 from colorama import Fore, Style
 
 from core.utils import (
     convert_from_algebraic_notation, convert_to_algebraic_notation,
-    ALGEBRAIC_NOTATION
+    convert_bitboard_to_squares, ALGEBRAIC_SQUARES, PROMOTION_FLAGS
 )
 from core.types import PositionT
 
 from pieces import Piece, Pawn, Rook, Bishop, Knight, Queen, King
 from pieces.utilites import (
-    PieceColor, PieceName, RookSide, NO_TRASPASS_KING_PIECES
+    PieceColor, PieceName, RookSide, NO_TRASPASS_KING_PIECES, PIECE_NAMES,
+    PIECES_BY_CHAR
 )
 
 from board.exceptions import (
@@ -19,6 +26,58 @@ from board.exceptions import (
 )
 from board.types import BoardRepresentation
 from board.encoder import BoardEncoder
+from board.attacks import all_attacks
+
+# A random key for each piece on each square, XORed into Board.zobrist_key
+# when the piece is put on or taken from the square. A separate generator
+# is used, so the global random state is not reseeded.
+_zobrist_random = random.Random(42)
+ZOBRIST_PIECE_KEYS: dict[PieceColor, dict[PieceName, tuple[int, ...]]] = {
+    color: {
+        piece_name: tuple(_zobrist_random.getrandbits(64) for _ in range(64))
+        for piece_name in PIECE_NAMES
+    }
+    for color in PieceColor
+}
+
+# The class of the pieces of each name
+PIECE_CLASSES: dict[PieceName, type[Piece]] = {
+    PieceName.PAWN: Pawn,
+    PieceName.ROOK: Rook,
+    PieceName.KNIGHT: Knight,
+    PieceName.BISHOP: Bishop,
+    PieceName.QUEEN: Queen,
+    PieceName.KING: King
+}
+
+# The pieces of the standard starting position, in the order they are added
+# to the board: pawns, knights, bishops, rooks, queen and king, each one
+# for white and then for black
+INITIAL_SET_UP: tuple[
+    tuple[PieceName, PieceColor, int, int, dict | None], ...
+] = tuple(
+    (
+        piece_name,
+        color,
+        row if color is PieceColor.WHITE else 7 - row,
+        column,
+        {'rook_side': RookSide.QUEEN if column < 4 else RookSide.KING}
+        if piece_name is PieceName.ROOK else None
+    )
+    for piece_name, row, columns in (
+        (PieceName.PAWN, 1, range(8)),
+        (PieceName.KNIGHT, 0, (1, 6)),
+        (PieceName.BISHOP, 0, (2, 5)),
+        (PieceName.ROOK, 0, (0, 7)),
+        (PieceName.QUEEN, 0, (3,)),
+        (PieceName.KING, 0, (4,)),
+    )
+    for color in (PieceColor.WHITE, PieceColor.BLACK)
+    for column in columns
+)
+
+# A board in the starting position, copied by Board.new_start_position
+_start_position: 'Board | None' = None
 
 
 class Board:
@@ -50,13 +109,23 @@ class Board:
         castling_rights (dict[PieceColor, dict[RookSide, bool]]): Tracks
             the castling rights for each color and side.
 
-        _attacked_squares (dict[PieceColor, list]): Internal tracking of
-            squares attacked by each color.
+        piece_count (list[int]): The number of pieces of each color, indexed
+            by the value of the color. Also available as n_white_pieces and
+            n_black_pieces.
+
+        bitboards (dict[PieceColor, dict[PieceName, int]]): A 64 bits
+            integer for each color and piece name, where the bit
+            `row * 8 + column` is set if such a piece is on that square.
 
-        _attacked_squares_by_white_checked (bool): Flag to indicate if white's
-            attacked squares have been checked.
+        occupancy (dict[PieceColor, int]): The union of the bitboards of
+            each color.
 
-        _attacked_squares_by_black_checked (bool): Similar flag for black.
+        zobrist_key (int): The XOR of the keys of every piece on its square,
+            updated with every change of the squares.
+
+        _attacked_cache (dict[tuple, tuple[int, int]]): The bitboard of the
+            squares attacked by each color, stored with the zobrist_key it
+            was computed for.
 
         _is_initial_board_set_up (bool): Indicates if the initial board setup
             has been completed.
@@ -71,8 +140,23 @@ class Board:
             algebraic_notation=None, check_if_position_is_empty=True,
             additional_information=None): Adds a piece to the board.
 
+        add_new_piece(piece_name, piece_color, row, column,
+            additional_information=None, check_if_position_is_empty=True):
+            Creates a piece and adds it to the board.
+
+        add_piece_obj(piece, check_if_position_is_empty=False): Adds a Piece
+            object to the board on its own position.
+
+        load_from_bitboards(bitboards): Adds the pieces described by a set
+            of bitboards to the board.
+
         create_empty_board(): Creates an empty board.
 
+        clone(): Returns an independent copy of the board.
+
+        new_start_position(): Returns a new board in the standard starting
+            position, cloned from a board set up once.
+
         clean_board(): Clears the board of all pieces.
 
         create_initial_board_set_up(): Sets up the board in the standard
@@ -84,12 +168,20 @@ class Board:
         get_legal_moves(color, show_in_algebraic_notation=False): Returns
             a list of legal moves for a given color.
 
+        get_encoded_legal_moves(color): Returns the legal moves of a given
+            color encoded as 16 bits integers.
+
+        get_attacked_bitboard(color, traspass_king=False): Returns the
+            bitboard of the squares attacked by a given color.
+
         get_attacked_squares(color, show_in_algebraic_notation=False):
             Returns a list of squares attacked by a given color.
 
         get_piece(piece_name, color): Returns a list of pieces of a given
             name and color.
 
+        get_pieces(color): Iterates over all the pieces of a given color.
+
         is_position_empty(row, column): Checks if a given position is empty.
 
         remove_castling_rights(color): Removes castling rights for a given
@@ -121,25 +213,25 @@ class Board:
             Creates a Piece object of the specified type and color at a given
             position.
 
-        _create_initial_pawn_set_up(): Sets up the pawns on their initial
-            positions on the board.
-
-        _create_initial_knight_set_up(): Places the knights on their initial
-            positions on the board.
-
-        _create_initial_bishop_set_up(): Positions the bishops on their initial
-            squares on the board.
-
-        _create_initial_rook_set_up(): Arranges the rooks on their starting
-            squares on the board.
-
-        _create_initial_queen_set_up(): Places the queens on their initial
-            positions on the board.
-
-        _create_initial_king_set_up(): Sets the kings on their initial
-            positions on the board.
     """
 
+    # the attributes are all set in __init__, the slots make reading them
+    # (hundreds of times per move) faster than going through a __dict__
+    __slots__ = (
+        'board',
+        'white_pieces',
+        'black_pieces',
+        'pieces_on_board',
+        'castleling_rights',
+        'bitboards',
+        'occupancy',
+        'piece_count',
+        'zobrist_key',
+        '_attacked_cache',
+        'state_version',
+        '_is_initial_board_set_up',
+    )
+
     def __init__(
         self,
         board_setup: BoardRepresentation = None,
@@ -169,15 +261,20 @@ class Board:
             castling_rights (dict[PieceColor, dict[RookSide, bool]]): Tracks
                 castling rights for each color.
 
-            _attacked_squares (dict[PieceColor, list]): Stores squares attacked
-                by each color.
+            zobrist_key (int): The hash of the pieces on the board, updated
+                incrementally.
 
-            _attacked_squares_by_white_checked,
-            _attacked_squares_by_black_checked
-                (bool): Flags indicating if attacked squares have been checked.
+            _attacked_cache (dict): Stores the bitboard of the squares
+                attacked by each color with the zobrist_key of the position.
 
             _is_initial_board_set_up (bool): Indicates if initial board setup
                 is done.
+
+            state_version (int): Counter incremented every time a square of
+                the board changes.
+
+            bitboards, occupancy (dict): The squares of the pieces of each
+                color and name, and of each color, as 64 bits integers.
         """
 
         self.board: BoardRepresentation = []
@@ -191,15 +288,27 @@ class Board:
 
         self.castleling_rights: dict[PieceColor] = dict()
 
-        self.n_white_pieces: int = 0
-        self.n_black_pieces: int = 0
-
-        self._attacked_squares: dict[PieceColor] = {
-            PieceColor.WHITE: list(),
-            PieceColor.BLACK: list()
+        # kept in sync with self.board, the occupancy queries only need a
+        # shift and a mask instead of indexing the grid
+        self.bitboards: dict[PieceColor, dict[PieceName, int]] = {
+            color: {piece_name: 0 for piece_name in PIECE_NAMES}
+            for color in PieceColor
+        }
+        self.occupancy: dict[PieceColor, int] = {
+            PieceColor.WHITE: 0,
+            PieceColor.BLACK: 0
         }
-        self._attacked_squares_by_white_checked: bool = False
-        self._attacked_squares_by_black_checked: bool = False
+
+        self.piece_count: list[int] = [0, 0]
+
+        # the cached attacked squares are only used while the key is the
+        # same, so they never need to be reset by hand
+        self.zobrist_key: int = 0
+        self._attacked_cache: dict[tuple, tuple[int, int]] = dict()
+
+        # incremented on every change of the squares, so other objects can
+        # tell if something they computed from the board is still valid
+        self.state_version: int = 0
 
         self._is_initial_board_set_up: bool = False
 
@@ -235,6 +344,35 @@ class Board:
             color=PieceColor.BLACK
         )[0]
 
+    @property
+    def n_white_pieces(self) -> int:
+        """
+        Return the number of white pieces on the board.
+        """
+
+        return self.piece_count[PieceColor.WHITE.value]
+
+    @property
+    def n_black_pieces(self) -> int:
+        """
+        Return the number of black pieces on the board.
+        """
+
+        return self.piece_count[PieceColor.BLACK.value]
+
+    @property
+    def occupied(self) -> int:
+        """
+        Return the bitboard of all the occupied squares.
+
+        Returns:
+            int: A 64 bits integer where the bit `row * 8 + column` is set
+                if there is a piece on that square.
+        """
+
+        occupancy = self.occupancy
+        return occupancy[PieceColor.WHITE] | occupancy[PieceColor.BLACK]
+
     #  ---------------------------- STATIC METHODS ----------------------------
 
     @staticmethod
@@ -266,12 +404,9 @@ class Board:
         if row is None or column is None:
             return False
 
-        if row < 0 or row > 7:
-            return False
-        if column < 0 or column > 7:
-            return False
-
-        return True
+        # both are in 0..7 only if no bit above the third one is set, which
+        # also covers the negative numbers
+        return not (row | column) & ~7
 
     @staticmethod
     def create_empty_board() -> BoardRepresentation:
@@ -335,62 +470,168 @@ class Board:
             color is not specified when required.
         """
 
-        if self._is_initial_board_set_up:
-            # check for the double kings
-            is_king: bool = False
-            king_color: PieceColor = None
-
-            if isinstance(piece, PieceName):
-                if piece == PieceName.KING:
-                    is_king = True
-                    king_color = piece_color
-            elif isinstance(piece, Piece):
-                if piece.name == PieceName.KING:
-                    is_king = True
-                    king_color = piece.color
-
-            if is_king:
-                if self.pieces_on_board[king_color].get(PieceName.KING):
-                    raise KingAlreadyOnBoardError(king_color.name)
-
         if algebraic_notation:
             row, column = convert_from_algebraic_notation(algebraic_notation)
 
         if isinstance(piece, Piece):
-            row = piece.row
-            column = piece.column
+            return self.add_piece_obj(
+                piece,
+                check_if_position_is_empty=check_if_position_is_empty
+            )
+
+        return self.add_new_piece(
+            piece_name=piece,
+            piece_color=piece_color,
+            row=row,
+            column=column,
+            additional_information=additional_information,
+            check_if_position_is_empty=check_if_position_is_empty
+        )
+
+    def add_new_piece(
+        self,
+        piece_name: PieceName,
+        piece_color: PieceColor,
+        row: int,
+        column: int,
+        additional_information: dict = None,
+        check_if_position_is_empty: bool = True,
+    ) -> Piece:
+        """
+        Create a chess piece and add it to the board.
+
+        Parameters:
+            piece_name (PieceName): The name of the piece to create.
+
+            piece_color (PieceColor): The color of the piece.
+
+            row (int), column (int): The square to place the piece on.
+
+            additional_information (dict, optional): Additional data to pass
+            to the piece constructor, e.g. the side of a rook.
+
+            check_if_position_is_empty (bool, optional): Whether to check if
+            the position is empty before adding the piece (default is True).
+
+        Returns:
+            Piece: The piece that was added to the board.
+
+        Raises:
+            ValueError: If the color of the piece is not specified.
+        """
+
+        if not piece_color:
+            raise ValueError(
+                'You must specify the color of the piece to add.'
+            )
+
+        # the errors are raised before creating the piece
+        if self._is_initial_board_set_up and piece_name is PieceName.KING:
+            if self.bitboards[piece_color][PieceName.KING]:
+                raise KingAlreadyOnBoardError(piece_color.name)
 
         if check_if_position_is_empty:
             if not self.is_position_empty(row=row, column=column):
                 raise SpaceAlreadyOccupiedError()
 
-        if isinstance(piece, PieceName):
-            if not piece_color:
-                raise ValueError(
-                    'You must specify the color of the piece to add.'
-                )
-
-            piece = self._create_piece(
-                piece_name=piece,
+        return self.add_piece_obj(
+            self._create_piece(
+                piece_name=piece_name,
                 color=piece_color,
                 position=(row, column),
                 additional_information=additional_information
             )
+        )
+
+    def add_piece_obj(
+        self,
+        piece: Piece,
+        check_if_position_is_empty: bool = False,
+    ) -> Piece:
+        """
+        Add a Piece object to the board, on its own position.
+
+        This is the path every piece goes through, without dispatching on
+        the type of the arguments.
+
+        Parameters:
+            piece (Piece): The piece to add.
+
+            check_if_position_is_empty (bool, optional): Whether to check if
+            the position is empty before adding the piece (default is False).
+
+        Returns:
+            Piece: The piece that was added to the board.
+
+        Raises:
+            KingAlreadyOnBoardError: If the piece is a king and there is
+            already a king of its color, once the board is set up.
+
+            SpaceAlreadyOccupiedError: If the position is not empty and it
+            has to be checked.
+        """
+
+        row, column = piece.position
+        color = piece.color
+
+        # check for the double kings
+        if self._is_initial_board_set_up and piece.name is PieceName.KING:
+            if self.bitboards[color][PieceName.KING]:
+                raise KingAlreadyOnBoardError(color.name)
+
+        if check_if_position_is_empty:
+            if not self.is_position_empty(row=row, column=column):
+                raise SpaceAlreadyOccupiedError()
 
         # add piece to the board
         self.board[row][column] = piece
+        self._add_to_bitboards(piece, row, column)
+        self.state_version += 1
 
-        pieces_on_board = self.pieces_on_board[piece.color]
+        self.pieces_on_board[color].setdefault(piece.name, []).append(piece)
+        self.piece_count[color.value] += 1
 
-        if not pieces_on_board.get(piece.name):
-            pieces_on_board[piece.name] = []
+        return piece
 
-        # NOTE: could this be referencing to the piece.name instance of the
-        # object?
-        pieces_on_board[piece.name].append(piece)
-        self.increment_piece_count(piece.color)
+    def load_from_bitboards(
+        self,
+        bitboards: dict[tuple[PieceColor, PieceName], int],
+    ) -> None:
+        """
+        Add the pieces described by a set of bitboards to the board.
 
-        return piece
+        Each bitboard is a 64 bits integer where the bit `row * 8 + column`
+        is set if there is a piece of the given color and name on that
+        square. Rooks get their side from the half of the board they are on.
+
+        Parameters:
+            bitboards (dict[tuple[PieceColor, PieceName], int]): The
+                bitboards keyed by the color and the name of the pieces.
+        """
+
+        for (color, piece_name), bitboard in bitboards.items():
+            while bitboard:
+                # take the least significant bit and clear it
+                square = (bitboard & -bitboard).bit_length() - 1
+                bitboard &= bitboard - 1
+
+                row, column = square >> 3, square & 7
+
+                additional_information = None
+                if piece_name is PieceName.ROOK:
+                    additional_information = {
+                        'rook_side': (
+                            RookSide.QUEEN if column < 4 else RookSide.KING
+                        )
+                    }
+
+                self.add_new_piece(
+                    piece_name=piece_name,
+                    piece_color=color,
+                    row=row,
+                    column=column,
+                    additional_information=additional_information
+                )
 
     def clean_board(self):
         """
@@ -398,22 +639,101 @@ class Board:
 
         Resets the board to an empty state and clears the dictionaries tracking
         the pieces for both white and black.
+
+        The board and the dictionaries are cleared in place, so the same
+        instances are reused when a board is reset many times (e.g. tests).
         """
 
-        self.white_pieces = dict()
-        self.black_pieces = dict()
+        self.white_pieces.clear()
+        self.black_pieces.clear()
+
+        self.pieces_on_board[PieceColor.WHITE] = self.white_pieces
+        self.pieces_on_board[PieceColor.BLACK] = self.black_pieces
 
-        self.pieces_on_board = {
-            PieceColor.WHITE: dict(),
-            PieceColor.BLACK: dict()
-        }
         self.remove_castleling_rights(PieceColor.WHITE)
         self.remove_castleling_rights(PieceColor.BLACK)
 
-        self.n_white_pieces = 0
-        self.n_black_pieces = 0
+        self.piece_count[PieceColor.WHITE.value] = 0
+        self.piece_count[PieceColor.BLACK.value] = 0
 
-        self.board = self.create_empty_board()
+        for row in self.board:
+            row[:] = (None,) * 8
+
+        for bitboards in self.bitboards.values():
+            for piece_name in bitboards:
+                bitboards[piece_name] = 0
+        self.occupancy[PieceColor.WHITE] = 0
+        self.occupancy[PieceColor.BLACK] = 0
+        self.zobrist_key = 0
+        self.state_version += 1
+
+    def clone(self) -> 'Board':
+        """
+        Return an independent copy of the board.
+
+        The bitboards, the counters and the keys are ints, so only their
+        containers are copied. Each piece is copied once onto the new board
+        and the grid is filled from the copies, in the same order, so the
+        legal moves of the clone come in the same order as the original.
+
+        Returns:
+            Board: The copy of the board.
+        """
+
+        new = Board.__new__(Board)
+
+        new.bitboards = {
+            color: dict(bitboards)
+            for color, bitboards in self.bitboards.items()
+        }
+        new.occupancy = dict(self.occupancy)
+        new.piece_count = self.piece_count.copy()
+        new.zobrist_key = self.zobrist_key
+        # the cached values are keyed by the zobrist key, still valid
+        new._attacked_cache = dict(self._attacked_cache)
+        new.state_version = self.state_version
+        new._is_initial_board_set_up = self._is_initial_board_set_up
+        new.castleling_rights = {
+            color: dict(rights)
+            for color, rights in self.castleling_rights.items()
+        }
+
+        new.board = new.create_empty_board()
+        new.white_pieces = dict()
+        new.black_pieces = dict()
+        new.pieces_on_board = {
+            PieceColor.WHITE: new.white_pieces,
+            PieceColor.BLACK: new.black_pieces
+        }
+
+        for color, pieces in self.pieces_on_board.items():
+            new_pieces = new.pieces_on_board[color]
+            for piece_name, piece_list in pieces.items():
+                new_list = new_pieces[piece_name] = []
+                for piece in piece_list:
+                    piece = piece.copy_to_board(new)
+                    new.board[piece.row][piece.column] = piece
+                    new_list.append(piece)
+
+        return new
+
+    @classmethod
+    def new_start_position(cls) -> 'Board':
+        """
+        Return a board in the standard starting position.
+
+        The first board is set up piece by piece, the next ones are clones
+        of it, skipping the creation of the pieces one by one.
+
+        Returns:
+            Board: A new board in the starting position.
+        """
+
+        global _start_position
+        if _start_position is None:
+            _start_position = cls()
+
+        return _start_position.clone()
 
     def decrement_piece_count(self, color: PieceColor):
         """
@@ -423,10 +743,7 @@ class Board:
             color (PieceColor): The color for which to decrement the count.
         """
 
-        if color == PieceColor.WHITE:
-            self.n_white_pieces -= 1
-        elif color == PieceColor.BLACK:
-            self.n_black_pieces -= 1
+        self.piece_count[color.value] -= 1
 
     def increment_piece_count(self, color: PieceColor):
         """
@@ -436,16 +753,13 @@ class Board:
             color (PieceColor): The color for which to increment the count.
         """
 
-        if color == PieceColor.WHITE:
-            self.n_white_pieces += 1
-        elif color == PieceColor.BLACK:
-            self.n_black_pieces += 1
+        self.piece_count[color.value] += 1
 
     # ---------------------------- GETTER METHODS ----------------------------
 
-    def get_encoded_board(self) -> np.ndarray:
+    def get_encoded_board(self, out: np.ndarray | None = None) -> np.ndarray:
 
-        return BoardEncoder.encode_board(self)
+        return BoardEncoder.encode_board(self, out=out)
 
     def get_square_or_piece(
         self,
@@ -513,19 +827,56 @@ class Board:
             list[tuple[int, int]]: A list of tuples representing legal moves.
         """
 
-        pieces = self.pieces_on_board[color]
-
         legal_moves = dict()
 
-        for piece_key in pieces:
-            for piece in pieces[piece_key]:
-                piece: Piece
-                legal_moves[piece] = piece.calculate_legal_moves(
-                    show_in_algebraic_notation=show_in_algebraic_notation
-                )
+        for piece in self.get_pieces(color):
+            piece: Piece
+            legal_moves[piece] = piece.calculate_legal_moves(
+                show_in_algebraic_notation=show_in_algebraic_notation
+            )
 
         return legal_moves
 
+    def get_encoded_legal_moves(self, color: PieceColor) -> array:
+        """
+        Calculate all legal moves for a given color as 16 bits integers.
+
+        The moves of all the pieces are put in a single array, each one with
+        the squares it moves from and to as encoded by
+        `core.utils.encode_move`, so a move is a plain int instead of a
+        piece and a tuple. Use `core.utils.decode_move` to get the squares.
+
+        Parameters:
+            color (PieceColor): The color of the pieces to calculate moves for.
+
+        Returns:
+            array: The encoded legal moves, as an array of unsigned shorts.
+        """
+
+        # a new array on every call, so the moves of a board are never
+        # overwritten by another call (e.g. from another search thread)
+        encoded_moves = array('H')
+        append = encoded_moves.append
+
+        for piece in self.get_pieces(color):
+            piece: Piece
+            from_square = piece.row * 8 + piece.column
+            for move in piece.calculate_legal_moves():
+                if isinstance(move, str):
+                    # the promotions are given in algebraic notation, the
+                    # promoted piece goes in the flags, e.g. 'bxc1=Q'
+                    square, promotion = move.split('=')
+                    row, column = convert_from_algebraic_notation(square[-2:])
+                    append(
+                        from_square | (row * 8 + column) << 6
+                        | PROMOTION_FLAGS[promotion] << 12
+                    )
+                else:
+                    row, column = move
+                    append(from_square | (row * 8 + column) << 6)
+
+        return encoded_moves
+
     def get_attacked_squares(
         self,
         color: PieceColor,
@@ -546,47 +897,57 @@ class Board:
 
         Returns:
             list[tuple[int, int]]: A list of squares attacked by the specified
-            color.
+            color, each square appears only once.
         """
 
-        # TODO: we should update the variable self_attacked_squares to include
-        # the moves where the attacked squares where calculated, and then
-        # TODO: look a way to unify when show_in_algebraic_notation is True
+        attacked_squares = convert_bitboard_to_squares(
+            self.get_attacked_bitboard(color, traspass_king=traspass_king)
+        )
+        if show_in_algebraic_notation:
+            return [
+                convert_to_algebraic_notation(*square)
+                for square in attacked_squares
+            ]
 
-        if color == PieceColor.WHITE:
-            if self._attacked_squares_by_white_checked:
-                return self._attacked_squares[PieceColor.WHITE]
-            self._attacked_squares_by_white_checked = True
+        return attacked_squares
 
-        elif color == PieceColor.BLACK:
-            if self._attacked_squares_by_black_checked:
-                return self._attacked_squares[PieceColor.BLACK]
-            self._attacked_squares_by_black_checked = True
+    def get_attacked_bitboard(
+        self,
+        color: PieceColor,
+        traspass_king: bool = False
+    ) -> int:
+        """
+        Determine the bitboard of the squares attacked by a given color.
 
-        attacked_squares = []
+        Parameters:
+            color (PieceColor): The color of the attacking pieces.
+            traspass_king (bool, optional): Whether the sliding pieces attack
+                through the king of the other color. Default is False.
 
-        piece_names = PieceName.__members__.values()
+        Returns:
+            int: A 64 bits integer where the bit `row * 8 + column` is set if
+            the square is attacked. Testing a square is a shift and a mask,
+            instead of searching a list of squares.
+        """
 
-        for piece_name in piece_names:
-            pieces = self.get_piece(
-                piece_name=piece_name,
-                color=color
-            )
+        cache_key = (color, traspass_king)
+        cached = self._attacked_cache.get(cache_key)
+        if cached is not None and cached[0] == self.zobrist_key:
+            return cached[1]
 
-            for piece in pieces:
-                extra_var = dict()
-                if piece.name not in NO_TRASPASS_KING_PIECES:
-                    extra_var['traspass_king'] = traspass_king
-                    extra_var['king_color'] = color.opposite()
+        # the sliding pieces go through the king of the other color when
+        # traspass_king is True, as if it wasn't on the board
+        occupied = self.occupied
+        if traspass_king:
+            occupied &= ~self.bitboards[color.opposite()][PieceName.KING]
 
-                piece: Piece
-                attacked_squares += piece.get_attacked_squares(
-                    show_in_algebraic_notation=show_in_algebraic_notation,
-                    **extra_var
-                )
-        self._attacked_squares[color] = attacked_squares
+        attacked_bitboard = all_attacks(
+            self.bitboards[color], color.value, occupied
+        )
 
-        return attacked_squares
+        self._attacked_cache[cache_key] = (self.zobrist_key, attacked_bitboard)
+
+        return attacked_bitboard
 
     def get_piece(
         self,
@@ -606,6 +967,21 @@ class Board:
         """
         return self.pieces_on_board[color].get(piece_name, [])
 
+    def get_pieces(self, color: PieceColor) -> Iterator[Piece]:
+        """
+        Iterate over all the pieces of a specified color.
+
+        The lists of each piece name are chained in C, in the same order as
+        looping over pieces_on_board[color] and then over each list.
+
+        Parameters:
+            color (PieceColor): The color of the pieces to retrieve.
+
+        Returns:
+            Iterator[Piece]: The pieces of the specified color.
+        """
+        return chain.from_iterable(self.pieces_on_board[color].values())
+
     def get_board_representation(
         self,
         reverse: bool = False,
@@ -613,7 +989,8 @@ class Board:
         special_color: str = Fore.RED,
         upper_case_diff: bool = False,
         show_in_algebraic_notation: bool = False,
-        special_color_on: tuple[tuple[int, int]] | None = None,
+        special_color_on: Iterable[PositionT] | int | None = None,
+        perspective: PieceColor | None = None,
     ) -> list[list[str]]:
         """
         Generate a string representation of the chessboard.
@@ -625,9 +1002,9 @@ class Board:
         color.
 
         Parameters:
-            special_color_on (tuple[tuple[int, int]] | None): A tuple of
-                coordinate tuples (row, column) for squares to be highlighted.
-                Default is None, indicating no highlighting.
+            special_color_on (Iterable[PositionT] | int | None): The
+                squares (row, column) to be highlighted, or a bitboard with
+                their bits set. Default is None, indicating no highlighting.
 
             special_color (str): The color code (ANSI escape code) to use for
                 highlighting. Default is Fore.RED.
@@ -637,6 +1014,11 @@ class Board:
             upper_case_diff (bool): Whether to use uppercase for white pieces
             and lowercase for black pieces.
 
+            perspective (PieceColor | None): With PieceColor.WHITE the rows
+                are given from the eighth to the first one, so the white
+                pieces are at the bottom when printed. Default is None, from
+                the first to the eighth row.
+
         Returns:
             list[list[str]]: A 2D list representing the board, where each
             element is a string representing a square.
@@ -646,55 +1028,69 @@ class Board:
 
         board = self.board
 
-        if reverse:
-            board = self.board.copy()
-            board.reverse()
-
-        for row_index, row in enumerate(board):
-            current_row: list[str] = []
-            for column_index, p in enumerate(row):
-
-                char = str()
-                color = Fore.WHITE
-
-                algebraic_char = str()
-                if show_in_algebraic_notation:
-                    algebraic_char = (
-                        ALGEBRAIC_NOTATION['column'][column_index] +
-                        ALGEBRAIC_NOTATION['row'][row_index]
-                    )
-
+        # XORing a square with 56 flips its row, so the rows are read (with
+        # reverse) or given (with the white perspective) from the last one
+        # without copying and reversing any list
+        grid_flip = 56 if reverse else 0
+        output_flip = 56 if perspective is PieceColor.WHITE else 0
+
+        # looked up once instead of for every square
+        reset = Style.RESET_ALL
+        empty_color = Fore.WHITE
+        white_color = Fore.LIGHTCYAN_EX
+        black_color = Fore.LIGHTBLUE_EX
+        # the empty squares are the same string, built once
+        empty_square = empty_color + '.' + reset if use_colors else '.'
+        special_squares = 0
+        if use_colors and isinstance(special_color_on, int):
+            special_squares = special_color_on
+        elif use_colors and special_color_on:
+            # a single bitboard instead of searching the squares every time
+            for row, column in special_color_on:
+                if 0 <= row < 8 and 0 <= column < 8:
+                    special_squares |= 1 << (row * 8 + column)
+
+        current_row: list[str] = []
+        for index in range(64):
+            square = index ^ output_flip
+            grid_square = square ^ grid_flip
+            p = board[grid_square >> 3][grid_square & 7]
+
+            if p is None and not (
+                show_in_algebraic_notation or (special_squares >> square) & 1
+            ):
+                # already colored
+                char = empty_square
+            else:
                 if p is None:
-                    if show_in_algebraic_notation:
-                        char = algebraic_char
-                    else:
-                        char = '.'
+                    color = empty_color
+                    char = (
+                        ALGEBRAIC_SQUARES[square]
+                        if show_in_algebraic_notation else '.'
+                    )
                 else:
                     char = p.sing_char
 
                     if show_in_algebraic_notation:
-                        char += f'{algebraic_char[-1]}'
+                        char += ALGEBRAIC_SQUARES[square][-1]
 
-                    if p.color == PieceColor.BLACK:
-                        if use_colors:
-                            color = Fore.LIGHTBLUE_EX
+                    if p.color is PieceColor.BLACK:
+                        color = black_color
                         if upper_case_diff:
                             char = char.lower()
+                    else:
+                        color = white_color
 
-                    if use_colors:
-                        if p.color == PieceColor.WHITE:
-                            color = Fore.LIGHTCYAN_EX
-
-                if use_colors and special_color_on:
-                    if (row_index, column_index) in special_color_on:
-                        color = special_color
                 if use_colors:
-                    str_rep = f'{color}{char}{Style.RESET_ALL}'
-                else:
-                    str_rep = char
-                current_row.append(str_rep)
+                    if (special_squares >> square) & 1:
+                        color = special_color
+                    char = color + char + reset
+
+            current_row.append(char)
 
-            get_board_representation.append(current_row)
+            if index & 7 == 7:
+                get_board_representation.append(current_row)
+                current_row = []
 
         return get_board_representation
 
@@ -719,7 +1115,11 @@ class Board:
         if row > 7 or column > 7:
             return False
 
-        return self.board[row][column] is None
+        if row < 0 or column < 0:
+            # the grid used to wrap around on negative indexes
+            return self.board[row][column] is None
+
+        return not (self.occupied >> (row * 8 + column)) & 1
 
     def remove_castleling_rights(self, color: PieceColor):
         """
@@ -728,23 +1128,25 @@ class Board:
         Parameters:
             color (PieceColor): The color for which to remove castling rights.
         """
-        self.castleling_rights[color][RookSide.KING] = False
-        self.castleling_rights[color][RookSide.QUEEN] = False
+        rights = self.castleling_rights[color]
+        rights[RookSide.KING] = rights[RookSide.QUEEN] = False
 
     def remove_piece(self, piece: Piece):
         """
         Remove a piece from the board.
 
         This method removes a piece from the board, updating the internal
-        representation and the tracking dictionaries. It also removes the
-        piece from the list of attacked squares for its color.
+        representation, the tracking dictionaries and the count of pieces of
+        its color.
 
         Parameters:
             piece (Piece): The piece to remove.
         """
 
-        self.board[piece.row][piece.column] = None
-        self.pieces_on_board[piece.color][piece.name].remove(piece)
+        row, column = piece.position
+        self.board[row][column] = None
+        self._discard_piece(piece, row * 8 + column)
+        self.state_version += 1
 
     def update_board(
         self,
@@ -776,15 +1178,38 @@ class Board:
             check the legality of the move.
         """
 
-        self._manage_capture(
-            row=new_row,
-            column=new_column,
-            is_en_passant=is_en_passant,
-            piece_color=piece.color
-        )
+        grid = self.board
+        bitboards = self.bitboards
+        occupancy = self.occupancy
+        color = piece.color
+
+        # the pawn captured en passant is behind the square the pawn moves to
+        captured_row = new_row
+        if is_en_passant:
+            captured_row += -1 if color is PieceColor.WHITE else 1
 
-        self.board[old_row][old_column] = None
-        self.board[new_row][new_column] = piece
+        captured = grid[captured_row][new_column]
+        if captured is not None:
+            if is_en_passant:
+                grid[captured_row][new_column] = None
+            else:
+                captured.capture(captured_by=captured)
+
+            self._discard_piece(captured, captured_row * 8 + new_column)
+
+        # the bits of both squares are flipped at once, the cached attacked
+        # squares become invalid with the new zobrist_key
+        from_square = old_row * 8 + old_column
+        to_square = new_row * 8 + new_column
+        move_mask = (1 << from_square) | (1 << to_square)
+        bitboards[color][piece.name] ^= move_mask
+        occupancy[color] ^= move_mask
+        keys = ZOBRIST_PIECE_KEYS[color][piece.name]
+        self.zobrist_key ^= keys[from_square] ^ keys[to_square]
+
+        grid[old_row][old_column] = None
+        grid[new_row][new_column] = piece
+        self.state_version += 1
 
     # ---------------------------- PRINT METHODS ----------------------------
 
@@ -793,7 +1218,7 @@ class Board:
         special_color: str = Fore.RED,
         show_in_algebraic_notation: bool = False,
         perspective: PieceColor = PieceColor.WHITE,
-        special_color_on: tuple[tuple[int, int]] | None = None,
+        special_color_on: Iterable[PositionT] | int | None = None,
     ):
         """
         Print the chessboard from a specified perspective.
@@ -805,8 +1230,9 @@ class Board:
         Parameters:
             perspective (PieceColor): The perspective from which to view
                 the board. Defaults to PieceColor.WHITE.
-            special_color_on (tuple[tuple[int, int]] | None): Tuples of
-                coordinates to highlight on the board. Defaults to None.
+            special_color_on (Iterable[PositionT] | int | None): The
+                squares to highlight on the board, or a bitboard with their
+                bits set. Defaults to None.
             special_color (str): The color code (ANSI escape code) used for
                 highlighting. Defaults to Fore.RED.
 
@@ -819,12 +1245,10 @@ class Board:
         board_representation = self.get_board_representation(
             special_color=special_color,
             special_color_on=special_color_on,
-            show_in_algebraic_notation=show_in_algebraic_notation
+            show_in_algebraic_notation=show_in_algebraic_notation,
+            perspective=perspective
         )
 
-        if perspective == PieceColor.WHITE:
-            board_representation.reverse()
-
         print('-' * 50)
         for row in board_representation:
             print(' '.join(row))
@@ -854,7 +1278,7 @@ class Board:
 
         # there is somethign wrong is we call the function like this
         if not piece_name:
-            attacked_squares = self.get_attacked_squares(
+            attacked_squares = self.get_attacked_bitboard(
                 color=perspective,
                 traspass_king=traspass_king,
             )
@@ -945,12 +1369,15 @@ class Board:
             ValueError: If the initial setup has already been created.
         """
 
-        self._create_initial_pawn_set_up()
-        self._create_initial_knight_set_up()
-        self._create_initial_bishop_set_up()
-        self._create_initial_rook_set_up()
-        self._create_initial_queen_set_up()
-        self._create_initial_king_set_up()
+        for piece_name, color, row, column, additional_information in (
+            INITIAL_SET_UP
+        ):
+            self.add_piece_obj(self._create_piece(
+                piece_name=piece_name,
+                color=color,
+                position=(row, column),
+                additional_information=additional_information
+            ))
 
     def _set_personalized_board_set_up(self, board_setup: BoardRepresentation):
 
@@ -960,19 +1387,21 @@ class Board:
 
         self.board = self.create_empty_board()
         for row_index, row in enumerate(board_setup):
-            for column_index, piece in enumerate(row):
-                if piece != '.':
-                    piece_color = (
-                        PieceColor.WHITE if piece.isupper()
-                        else PieceColor.BLACK
-                    )
-                    piece = piece.upper()
-                    self.add_piece(
-                        piece=PieceName.get_piece_from_string(piece),
-                        piece_color=piece_color,
-                        row=row_index,
-                        column=column_index
-                    )
+            for column_index, char in enumerate(row):
+                if char == '.':
+                    continue
+
+                try:
+                    piece_color, piece_name = PIECES_BY_CHAR[char]
+                except KeyError:
+                    raise ValueError(f"Invalid piece string: {char}")
+
+                # the board was just emptied, so the squares are not checked
+                self.add_piece_obj(self._create_piece(
+                    piece_name=piece_name,
+                    color=piece_color,
+                    position=(row_index, column_index)
+                ))
 
     # ----------------------------- HELPER METHODS ----------------------------
     # ---------------------------- BOARD OPERATIONS ---------------------------
@@ -1009,242 +1438,38 @@ class Board:
         """
 
         if additional_information is None:
-            additional_information = dict()
-
-        piece_clases = {
-            PieceName.PAWN: Pawn,
-            PieceName.ROOK: Rook,
-            PieceName.KNIGHT: Knight,
-            PieceName.BISHOP: Bishop,
-            PieceName.QUEEN: Queen,
-            PieceName.KING: King
-        }
+            return PIECE_CLASSES[piece_name](
+                color=color,
+                board=self,
+                position=position
+            )
 
-        return piece_clases[piece_name](
+        return PIECE_CLASSES[piece_name](
             color=color,
             board=self,
             position=position,
             **additional_information
         )
 
-    def _create_initial_pawn_set_up(self):
-        """
-        Set up the pawns on their initial positions on the chessboard.
-
-        This method places all the pawns for both white and black on their
-        respective starting rows (second row for white, seventh row for black).
-        It updates the white_pieces and black_pieces dictionaries accordingly.
-        """
-
-        for i in range(8):
-
-            self.add_piece(
-                piece=PieceName.PAWN,
-                piece_color=PieceColor.WHITE,
-                row=1,
-                column=i
-            )
-            self.add_piece(
-                piece=PieceName.PAWN,
-                piece_color=PieceColor.BLACK,
-                row=6,
-                column=i
-            )
-
-    def _create_initial_knight_set_up(self):
-        """
-        Place the knights on their initial positions on the chessboard.
-
-        This method positions the knights for both white and black. Each color
-        gets two knights, placed on their standard starting squares (b1, g1 for
-        white and b8, g8 for black). The white_pieces and black_pieces
-        dictionaries are updated with these knights.
-        """
-
-        self.add_piece(
-            piece=PieceName.KNIGHT,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=1
-        )
-
-        self.add_piece(
-            piece=PieceName.KNIGHT,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=6
-        )
-        self.add_piece(
-            piece=PieceName.KNIGHT,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=1
-        )
-        self.add_piece(
-            piece=PieceName.KNIGHT,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=6
-        )
-
-    def _create_initial_bishop_set_up(self):
-        """
-        Position the bishops on their initial squares on the chessboard.
-
-        This method sets up the bishops for both white and black. Each color
-        has two bishops, placed on their designated starting squares (c1, f1
-        for white and c8, f8 for black). The white_pieces and black_pieces
-        dictionaries are updated with these bishops.
-        """
-
-        self.add_piece(
-            piece=PieceName.BISHOP,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=2
-        )
-        self.add_piece(
-            piece=PieceName.BISHOP,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=5
-        )
-
-        self.add_piece(
-            piece=PieceName.BISHOP,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=2
-        )
-        self.add_piece(
-            piece=PieceName.BISHOP,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=5
-        )
-
-    def _create_initial_rook_set_up(self):
-        """
-        Arrange the rooks on their starting squares on the chessboard.
-
-        This method places the rooks for both white and black on their
-        respective corners of the board. Each color has two rooks, placed on
-        a1, h1 for white and a8, h8 for black. The white_pieces and
-        black_pieces dictionaries are updated accordingly. Additional
-        information specifying the rook's side (QUEEN or KING) is also
-        recorded.
-        """
-
-        self.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=0,
-            additional_information={'rook_side': RookSide.QUEEN}
-        )
-        self.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=7,
-            additional_information={'rook_side': RookSide.KING}
-        )
-
-        self.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=0,
-            additional_information={'rook_side': RookSide.QUEEN}
-        )
-        self.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=7,
-            additional_information={'rook_side': RookSide.KING}
-        )
-
-    def _create_initial_queen_set_up(self):
-        """
-        Place the queens on their initial positions on the chessboard.
-
-        This method sets up the queens for both white and black on their
-        standard starting squares (d1 for white and d8 for black). The
-        white_pieces and black_pieces dictionaries are updated with these
-        queens.
-        """
-
-        self.add_piece(
-            piece=PieceName.QUEEN,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=3
-        )
-
-        self.add_piece(
-            piece=PieceName.QUEEN,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=3
-        )
-
-    def _create_initial_king_set_up(self):
-        """
-        Set the kings on their initial positions on the chessboard.
-
-        This method places the kings for both white and black on their
-        designated starting squares (e1 for white and e8 for black). The
-        white_pieces and black_pieces dictionaries are updated with these
-        kings.
-        """
-
-        self.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.WHITE,
-            row=0,
-            column=4
-        )
-
-        self.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.BLACK,
-            row=7,
-            column=4
-        )
-
-    # ----------------------------- MANAGERS ----------------------------------
-
-    def _manage_capture(
-        self,
-        row: int,
-        column: int,
-        is_en_passant: bool,
-        piece_color: PieceColor = None,
-    ):
-
-        if is_en_passant:
-            # delete the pawn that was captured
-            direction = -1 if piece_color == PieceColor.WHITE else 1
-            piece = self.get_square_or_piece(
-                row=row + direction,
-                column=column,
-            )
-            self.board[row + direction][column] = None
-        else:
-
-            piece = self.get_square_or_piece(
-                row=row,
-                column=column,
-            )
-            if not isinstance(piece, Piece):
-                return
-
-            piece.capture(captured_by=piece)
-
-        # delete the piece from the pieces_on_board dictionary
-        self.decrement_piece_count(piece.color)
-        self.pieces_on_board[piece.color][piece.name].remove(piece)
+    # ----------------------------- BITBOARDS ---------------------------------
+
+    def _add_to_bitboards(self, piece: Piece, row: int, column: int):
+        square = row * 8 + column
+        self.bitboards[piece.color][piece.name] |= 1 << square
+        self.occupancy[piece.color] |= 1 << square
+        self.zobrist_key ^= ZOBRIST_PIECE_KEYS[piece.color][piece.name][square]
+
+    def _discard_piece(self, piece: Piece, square: int):
+        # everything but the grid forgets a piece that is on the square: its
+        # bits, its zobrist key, the count and the list of its color
+        color = piece.color
+        self.bitboards[color][piece.name] ^= 1 << square
+        self.occupancy[color] ^= 1 << square
+        self.zobrist_key ^= ZOBRIST_PIECE_KEYS[color][piece.name][square]
+        self.piece_count[color.value] -= 1
+        # the lists have a few pieces and Piece has no __eq__, so remove
+        # only compares identities
+        self.pieces_on_board[color][piece.name].remove(piece)
 
     # ---------------------------- DUNDER METHODS -----------------------------
     # -------------------------------------------------------------------------
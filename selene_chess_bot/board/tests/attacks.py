@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from core.testing import print_starting, print_success
+from core.utils import convert_squares_to_bitboard
+
+from board.attacks import (
+    pawn_attacks, knight_attacks, king_attacks, rook_attacks,
+    bishop_attacks
+)
+
+
+class TestAttacks(TestCase):
+
+    def test_leaping_pieces(self):
+        print_starting()
+
+        self.assertEqual(
+            knight_attacks(convert_squares_to_bitboard('a1')),
+            convert_squares_to_bitboard('b3', 'c2')
+        )
+        self.assertEqual(
+            king_attacks(convert_squares_to_bitboard('h8')),
+            convert_squares_to_bitboard('g8', 'g7', 'h7')
+        )
+        self.assertEqual(
+            pawn_attacks(convert_squares_to_bitboard('a2', 'e2'), 0),
+            convert_squares_to_bitboard('b3', 'd3', 'f3')
+        )
+        self.assertEqual(
+            pawn_attacks(convert_squares_to_bitboard('e7'), 1),
+            convert_squares_to_bitboard('d6', 'f6')
+        )
+
+        print_success()
+
+    def test_sliding_pieces_stop_at_the_first_piece(self):
+        print_starting()
+
+        occupied = convert_squares_to_bitboard('a1', 'a4', 'c1', 'c3')
+
+        self.assertEqual(
+            rook_attacks(convert_squares_to_bitboard('a1'), occupied),
+            convert_squares_to_bitboard('a2', 'a3', 'a4', 'b1', 'c1')
+        )
+        self.assertEqual(
+            bishop_attacks(convert_squares_to_bitboard('a1'), occupied),
+            convert_squares_to_bitboard('b2', 'c3')
+        )
+
+        print_success()
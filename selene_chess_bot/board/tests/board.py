@@ -1,6 +1,7 @@
 import unittest
 
-from core.testing import print_starting, print_success
+from core.testing import print_starting, print_success, parse_fen
+from core.utils import encode_move, decode_move
 
 from board.board import Board
 from board.exceptions import KingAlreadyOnBoardError
@@ -100,6 +101,247 @@ class TestBoard(unittest.TestCase):
             )
         print_success()
 
+    def test_bitboards_follow_the_pieces(self):
+
+        print_starting()
+
+        board = Board()
+        white, black = PieceColor.WHITE, PieceColor.BLACK
+
+        self.assertEqual(board.bitboards[white][PieceName.PAWN], 0xFF00)
+        self.assertEqual(board.occupancy[black], 0xFFFF << 48)
+        self.assertEqual(board.occupied, 0xFFFF << 48 | 0xFFFF)
+
+        # e2 to e4, then the d7 pawn is captured on e4
+        pawn = board.get_square_or_piece(row=1, column=4)
+        board.update_board(1, 4, 3, 4, pawn)
+        self.assertTrue(board.is_position_empty(1, 4))
+        self.assertFalse(board.is_position_empty(3, 4))
+
+        black_pawn = board.get_square_or_piece(row=6, column=3)
+        board.update_board(6, 3, 3, 4, black_pawn)
+        self.assertEqual(
+            board.bitboards[white][PieceName.PAWN], 0xFF00 & ~(1 << 12)
+        )
+        self.assertEqual(
+            board.bitboards[black][PieceName.PAWN],
+            (0xFF << 48) & ~(1 << 51) | 1 << 28
+        )
+
+        board.clean_board()
+        self.assertEqual(board.occupied, 0)
+
+        print_success()
+
+    def test_attacked_squares_of_the_initial_position(self):
+
+        print_starting()
+
+        board = Board()
+        attacked_squares = set(board.get_attacked_squares(PieceColor.WHITE))
+
+        # every square of the third rank, none of the fourth rank
+        for column in range(8):
+            self.assertIn((2, column), attacked_squares)
+            self.assertNotIn((3, column), attacked_squares)
+
+        black_attacked_squares = board.get_attacked_squares(
+            PieceColor.BLACK, show_in_algebraic_notation=True
+        )
+        self.assertIn('f6', black_attacked_squares)
+        self.assertNotIn('f5', black_attacked_squares)
+
+        print_success()
+
+    def test_sliding_attacks_traspass_the_king(self):
+
+        print_starting()
+
+        for traspass_king in (False, True):
+            board = Board(board_setup='empty')
+            board.add_piece(
+                PieceName.QUEEN, piece_color=PieceColor.WHITE,
+                algebraic_notation='a1'
+            )
+            board.add_piece(
+                PieceName.KING, piece_color=PieceColor.BLACK,
+                algebraic_notation='d1'
+            )
+            attacked_squares = board.get_attacked_squares(
+                PieceColor.WHITE,
+                traspass_king=traspass_king,
+                show_in_algebraic_notation=True
+            )
+
+            self.assertIn('d1', attacked_squares)
+            self.assertIn('h8', attacked_squares)
+            self.assertEqual('e1' in attacked_squares, traspass_king)
+
+        print_success()
+
+    def test_encoded_legal_moves(self):
+
+        print_starting()
+
+        board = Board()
+        moves = board.get_encoded_legal_moves(PieceColor.WHITE)
+
+        self.assertEqual(len(moves), 20)
+        self.assertEqual(moves.typecode, 'H')
+        self.assertIn(encode_move(12, 28), moves)  # e2 to e4
+        self.assertIn(encode_move(6, 21), moves)  # g1 to f3
+        self.assertEqual(decode_move(encode_move(52, 60, 1)), (52, 60, 1))
+
+        # the moves of a later call don't overwrite the returned ones
+        black_moves = board.get_encoded_legal_moves(PieceColor.BLACK)
+        self.assertIn(encode_move(12, 28), moves)
+        self.assertNotIn(encode_move(12, 28), black_moves)
+
+        print_success()
+
+    def test_personalized_set_up(self):
+
+        print_starting()
+
+        board = Board(board_setup=[
+            ['.', '.', '.', '.', 'K', '.', '.', '.'],
+            ['P', '.', '.', '.', '.', '.', '.', '.'],
+            ['.', '.', '.', '.', '.', '.', '.', '.'],
+            ['.', '.', '.', '.', '.', '.', '.', '.'],
+            ['.', '.', '.', '.', '.', '.', '.', '.'],
+            ['.', '.', '.', '.', '.', '.', '.', '.'],
+            ['.', '.', '.', '.', '.', '.', 'p', '.'],
+            ['.', '.', '.', 'q', 'k', '.', '.', '.'],
+        ])
+
+        self.assertEqual(board.board[1][0].name, PieceName.PAWN)
+        self.assertEqual(board.board[6][6].color, PieceColor.BLACK)
+        self.assertEqual(board.board[7][3].name, PieceName.QUEEN)
+        self.assertEqual(board.n_white_pieces, 2)
+        self.assertEqual(board.n_black_pieces, 3)
+        self.assertEqual(
+            board.occupied,
+            1 << 4 | 1 << 8 | 1 << 54 | 1 << 59 | 1 << 60
+        )
+
+        with self.assertRaises(ValueError):
+            Board(board_setup=[['x']])
+
+        print_success()
+
+    def test_special_color_on_squares_or_bitboard(self):
+
+        print_starting()
+
+        board = Board()
+        squares = [(2, 2), (0, 1), (5, 7)]
+
+        self.assertEqual(
+            board.get_board_representation(special_color_on=squares),
+            board.get_board_representation(
+                special_color_on=1 << 18 | 1 << 1 | 1 << 47
+            )
+        )
+        self.assertNotEqual(
+            board.get_board_representation(special_color_on=squares),
+            board.get_board_representation()
+        )
+
+        print_success()
+
+    def test_attacked_squares_follow_the_moves(self):
+
+        print_starting()
+
+        board = Board()
+        initial_key = board.zobrist_key
+        self.assertNotIn((5, 4), board.get_attacked_squares(PieceColor.WHITE))
+
+        # nothing has to be reset after the queen leaves d1 for d4
+        queen = board.get_square_or_piece(row=0, column=3)
+        board.update_board(0, 3, 3, 3, queen)
+        queen.position = (3, 3)
+        self.assertIn((5, 5), board.get_attacked_squares(PieceColor.WHITE))
+
+        board.update_board(3, 3, 0, 3, queen)
+        queen.position = (0, 3)
+        self.assertEqual(board.zobrist_key, initial_key)
+        self.assertNotIn((5, 5), board.get_attacked_squares(PieceColor.WHITE))
+
+        print_success()
+
+    def test_clone_is_independent(self):
+
+        print_starting()
+
+        board = Board()
+        clone = board.clone()
+
+        self.assertEqual(clone.zobrist_key, board.zobrist_key)
+        self.assertEqual(
+            clone.get_board_representation(),
+            board.get_board_representation()
+        )
+        self.assertEqual(
+            clone.get_encoded_legal_moves(PieceColor.WHITE),
+            board.get_encoded_legal_moves(PieceColor.WHITE)
+        )
+
+        pawn = clone.get_square_or_piece(row=1, column=4)
+        self.assertIs(pawn.board, clone)
+        self.assertIsNot(pawn, board.get_square_or_piece(row=1, column=4))
+
+        clone.update_board(1, 4, 3, 4, pawn)
+        pawn.position = (3, 4)
+        self.assertNotEqual(clone.zobrist_key, board.zobrist_key)
+        self.assertEqual(board.get_square_or_piece(row=1, column=4).row, 1)
+        self.assertTrue(board.is_position_empty(row=3, column=4))
+
+        print_success()
+
+    def test_new_start_position(self):
+
+        print_starting()
+
+        board = Board.new_start_position()
+        other = Board.new_start_position()
+
+        self.assertIsNot(board, other)
+        self.assertEqual(board.zobrist_key, Board().zobrist_key)
+        self.assertEqual(
+            board.get_board_representation(),
+            Board().get_board_representation()
+        )
+
+        board.remove_piece(board.get_square_or_piece(row=0, column=3))
+        self.assertEqual(board.n_white_pieces, 15)
+        self.assertEqual(board.bitboards[PieceColor.WHITE][PieceName.QUEEN], 0)
+        self.assertFalse(other.is_position_empty(row=0, column=3))
+        self.assertFalse(
+            Board.new_start_position().is_position_empty(row=0, column=3)
+        )
+
+        print_success()
+
+    def test_no_castling_out_of_check(self):
+        print_starting()
+
+        # the black queen on d1 checks the white king on e1
+        game = parse_fen(
+            'r4knr/1p1np2p/p1P1b2b/P2p2p1/2NNp1P1/B1P2P1B/7P/R2qK2R '
+            'w KQ - 6 26'
+        )
+
+        self.assertEqual(
+            sorted(game.get_legal_moves(
+                show_as_list=True,
+                show_in_algebraic=True
+            )),
+            ['Kf2', 'Kxd1', 'Raxd1']
+        )
+
+        print_success()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,11 @@
+import numpy as np
+
 from unittest import TestCase
 
 from core.testing import print_starting, print_success
 
 from board import Board
-from board.encoder import BoardEncoder
+from board.encoder import BoardEncoder, _expand_into_kernel
 
 
 class TestBoardEncoder(TestCase):
@@ -16,3 +18,84 @@ class TestBoardEncoder(TestCase):
         BoardEncoder.visualize_encoded_board(encoded_board)
 
         print_success()
+
+    def test_bitboards_expand_to_the_pieces(self):
+        print_starting()
+
+        board = Board()
+        bitboards = BoardEncoder.encode_bitboards(board)
+        encoded_board = BoardEncoder.encode_board(board)
+
+        self.assertEqual(bitboards.shape, (12,))
+        self.assertEqual(bitboards[0], 0xff00)  # white pawns
+        self.assertEqual(encoded_board.shape, (8, 8, 12))
+        self.assertEqual(encoded_board.sum(), 32)
+        self.assertEqual(encoded_board[0, 4, 5], 1)  # white king on e1
+        self.assertEqual(encoded_board[7, 3, 10], 1)  # black queen on d8
+        self.assertEqual(encoded_board[6, :, 6].sum(), 8)  # black pawns
+
+        print_success()
+
+    def test_encode_many_boards_at_once(self):
+        print_starting()
+
+        boards = [Board(), Board(board_setup='empty'), Board()]
+        encoded_boards = BoardEncoder.encode_boards(boards)
+
+        self.assertEqual(encoded_boards.shape, (3, 8, 8, 12))
+        self.assertTrue(encoded_boards.flags['C_CONTIGUOUS'])
+        for board, encoded_board in zip(boards, encoded_boards):
+            self.assertTrue(
+                (encoded_board == BoardEncoder.encode_board(board)).all()
+            )
+        self.assertEqual(encoded_boards[1].sum(), 0)
+
+        packed_boards = BoardEncoder.encode_boards_packed(boards)
+        self.assertEqual(packed_boards.shape, (3, 12))
+        self.assertTrue(
+            (BoardEncoder.expand_to_tensor(packed_boards) == encoded_boards)
+            .all()
+        )
+
+        print_success()
+
+    def test_encode_boards_into_a_buffer(self):
+        print_starting()
+
+        boards = [Board(), Board(board_setup='empty')]
+        expected = BoardEncoder.encode_boards(boards)
+        buffer = np.ones((4, 8, 8, 12), dtype=np.float32)
+
+        batch = BoardEncoder.encode_boards_into(boards, buffer)
+        self.assertEqual(batch.shape, (2, 8, 8, 12))
+        self.assertTrue((batch == expected).all())
+        self.assertTrue((buffer[2:] == 1).all())
+
+        # the kernel compiled by numba, run by the interpreter
+        buffer[:] = 1
+        _expand_into_kernel(
+            np.array(
+                [BoardEncoder.encode_bitboards(board) for board in boards]
+            ),
+            buffer[:2]
+        )
+        self.assertTrue((buffer[:2] == expected).all())
+
+        print_success()
+
+    def test_encode_board_into_the_scratch_array(self):
+        print_starting()
+
+        scratch = BoardEncoder.get_scratch()
+        self.assertIs(BoardEncoder.get_scratch(), scratch)
+
+        scratch.fill(1)
+        board = Board()
+        encoded_board = BoardEncoder.encode_board(board, out=scratch)
+
+        self.assertIs(encoded_board, scratch)
+        self.assertTrue(
+            (encoded_board == BoardEncoder.encode_board(board)).all()
+        )
+
+        print_success()
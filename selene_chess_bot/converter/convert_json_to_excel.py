@@ -1,10 +1,22 @@
-import json
-
-import pandas as pd
+import orjson
 
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+
+
+# The lines are written in pairs, the first one from the column A and the
+# second one from the column E (as numbers, for ws.cell)
+LINE_COLUMNS: tuple[int, int] = (1, 5)
+
+# The styles are shared by all the cells that use them
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+TITLE_FONT = Font(size=9)
+BOLD_FONT = Font(bold=True)
 
 
 class Converter():
@@ -21,8 +33,8 @@ class Converter():
 
     @staticmethod
     def convert_json_to_dict(file_path: str):
-        with open(file_path, 'r') as json_file:
-            data = json.load(json_file)
+        with open(file_path, 'rb') as json_file:
+            data = orjson.loads(json_file.read())
         return data
 
     def calculate_rows_per_line(self):
@@ -45,34 +57,25 @@ class Converter():
         starting_row = 1
         max_rows_in_line = 0
 
+        blank_move = ('', '', '')
+
         for main_line in self.json_data:
             title = main_line['title']
 
             for line_index, line in enumerate(main_line['lines']):
                 line_name = line['name']
-                chess_moves = []
-                current_line_depth = 0
-                for move in line['moves']:
-                    current_line_depth += 1
-                    chess_moves.append(
-                        [
-                            move['move_number'],
-                            move['white'],
-                            move['black']
-                        ]
-                    )
-
-                if self.rows_per_line > current_line_depth:
-                    for _ in range(self.rows_per_line - current_line_depth):
-                        chess_moves.append(['', '', ''])
-
-                df = pd.DataFrame(
-                    chess_moves,
-                    columns=['Move Number', 'White', 'Black']
+                chess_moves = [
+                    (move['move_number'], move['white'], move['black'])
+                    for move in line['moves']
+                ]
+
+                # blank rows up to rows_per_line, so the lines are aligned
+                chess_moves.extend(
+                    [blank_move] * (self.rows_per_line - len(chess_moves))
                 )
 
-                # Calculate the starting column (A or E) based on the line index
-                starting_col = 'A' if line_index % 2 == 0 else 'E'
+                # The starting column (A or E) based on the line index
+                starting_col = LINE_COLUMNS[line_index % 2]
 
                 # Calculate the starting row for new lines
                 if line_index % 2 == 0:
@@ -80,37 +83,29 @@ class Converter():
                     max_rows_in_line = 0  # Reset for the new pair of lines
 
                 # Set title and line name with formatting
-                title_cell = ws[f'{starting_col}{starting_row + 1}']
+                title_cell = ws.cell(row=starting_row + 1, column=starting_col)
                 title_cell.value = title
-                title_cell.font = Font(size=9)
+                title_cell.font = TITLE_FONT
 
-                line_name_cell = ws[f'{starting_col}{starting_row + 2}']
-                line_name_cell.value = line_name
-                line_name_cell.font = Font(bold=True)
-
-                # Define a border style
-                thin_border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
+                line_name_cell = ws.cell(
+                    row=starting_row + 2, column=starting_col
                 )
+                line_name_cell.value = line_name
+                line_name_cell.font = BOLD_FONT
 
-                # Add rows to the worksheet from the DataFrame
-                for r_idx, row in enumerate(
-                    dataframe_to_rows(
-                        df,
-                        index=False,
-                        header=True
-                    ), starting_row + 3
+                # Add the header and the moves straight to the cells
+                header_row = starting_row + 3
+                for c_idx, value in enumerate(
+                    ('Move Number', 'White', 'Black'), starting_col
                 ):
-                    for c_idx, value in enumerate(row, 1):
-                        col = chr(ord(starting_col) + c_idx - 1)
-                        cell = ws[f'{col}{r_idx}']
-                        cell.value = value
-                        if r_idx == starting_row + 3:  # This is the header row
-                            cell.font = Font(bold=True)
-                        cell.border = thin_border
+                    cell = ws.cell(row=header_row, column=c_idx, value=value)
+                    cell.font = BOLD_FONT
+                    cell.border = THIN_BORDER
+
+                for r_idx, row in enumerate(chess_moves, header_row + 1):
+                    for c_idx, value in enumerate(row, starting_col):
+                        cell = ws.cell(row=r_idx, column=c_idx, value=value)
+                        cell.border = THIN_BORDER
 
                 # Keep track of the number of rows used in the longest line
                 max_rows_in_line = max(max_rows_in_line, len(chess_moves) + 2)
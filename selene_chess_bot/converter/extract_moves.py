@@ -1,4 +1,4 @@
-import json
+import orjson
 from docx import Document
 
 
@@ -8,38 +8,48 @@ def extract_chessly_lines(doc_path):
     current_section = None
     current_line = None
 
-    for para in doc.paragraphs:
-        if para.text.strip() and not para.text.startswith('Chessly Line'):
-            # Starting a new section
-            if current_section is not None:
-                data.append(current_section)
-            current_section = {"title": para.text.strip(), "lines": []}
-            current_line = None
-        elif para.text.startswith('Chessly Line'):
-            # Starting a new line within the current section
-            current_line = {"name": para.text.strip(), "moves": []}
-            current_section["lines"].append(current_line)
-
-            # Find the next table after this paragraph for move data
-            element_index = doc.element.body.index(para._element)
-            for next_elem in doc.element.body[element_index + 1:]:
-                if next_elem.tag.endswith('tbl'):
-                    table = [
-                        tbl for tbl in doc.tables if tbl._element is next_elem
-                    ][0]
-                    for row in table.rows:
-                        cells = row.cells
-                        # avoid the header row
-                        if cells[0].text == 'Move Number':
-                            continue
-                        if len(cells) >= 3:
-                            move = {
-                                "Move Number": cells[0].text,
-                                "White": cells[1].text.strip(),
-                                "Black": cells[2].text.strip()
-                            }
-                            current_line["moves"].append(move)
-                    break
+    # The body is walked once, the paragraphs and the tables are found by
+    # their element instead of searching them for every line
+    paragraphs_by_element = {para._element: para for para in doc.paragraphs}
+    tables_by_element = {table._element: table for table in doc.tables}
+
+    # the lines still waiting for the first table after them
+    lines_without_moves = []
+
+    for element in doc.element.body:
+        para = paragraphs_by_element.get(element)
+        if para is not None:
+            if para.text.strip() and not para.text.startswith('Chessly Line'):
+                # Starting a new section
+                if current_section is not None:
+                    data.append(current_section)
+                current_section = {"title": para.text.strip(), "lines": []}
+                current_line = None
+            elif para.text.startswith('Chessly Line'):
+                # Starting a new line within the current section
+                current_line = {"name": para.text.strip(), "moves": []}
+                current_section["lines"].append(current_line)
+                lines_without_moves.append(current_line)
+            continue
+
+        table = tables_by_element.get(element)
+        if table is None or not lines_without_moves:
+            continue
+
+        # The move data of the lines is in the next table after them
+        for row in table.rows:
+            cells = row.cells
+            # avoid the header row
+            if cells[0].text == 'Move Number':
+                continue
+            if len(cells) >= 3:
+                for line in lines_without_moves:
+                    line["moves"].append({
+                        "Move Number": cells[0].text,
+                        "White": cells[1].text.strip(),
+                        "Black": cells[2].text.strip()
+                    })
+        lines_without_moves.clear()
 
     if current_section is not None:
         data.append(current_section)
@@ -47,9 +57,12 @@ def extract_chessly_lines(doc_path):
     return data
 
 
-def save_to_json(data, filename):
-    with open(filename, 'w') as json_file:
-        json.dump(data, json_file, indent=4)
+def save_to_json(data, filename, pretty=False):
+    # orjson gives the UTF-8 bytes straight away, the file is only indented
+    # when it's meant to be read by a person
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    with open(filename, 'wb') as json_file:
+        json_file.write(orjson.dumps(data, option=option))
 
 
 doc_path = 'files/advance_caro.docx'  # Replace with the word document to use
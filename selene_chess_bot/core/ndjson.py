@@ -0,0 +1,41 @@
+import os
+import orjson
+
+from typing import Any
+
+
+def append_ndjson(
+    file_path: str,
+    record: dict[str, Any],
+    truncate: bool = False
+) -> None:
+    """
+    Append a record to a newline delimited JSON file, one record per line.
+
+    Only the new record is serialized and written, instead of reading the
+    whole file and writing it back.
+
+    :param file_path: The path of the file, it's created if it doesn't exist.
+    :param record: The record to append.
+    :param truncate: If True, the file is emptied before writing the record.
+    """
+
+    with open(file_path, 'wb' if truncate else 'ab') as f:
+        f.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS))
+        f.write(b'\n')
+
+
+def read_ndjson(file_path: str) -> list[dict[str, Any]]:
+    """
+    Read all the records of a newline delimited JSON file.
+
+    :param file_path: The path of the file.
+    :return: The records in the order they were appended, an empty list if
+        the file doesn't exist.
+    """
+
+    if not os.path.exists(file_path):
+        return []
+
+    with open(file_path, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
@@ -38,6 +38,12 @@ class CustomPrint(metaclass=SingletonMeta):
         self.int_color: str = int_color
         self.dict_list_color: str = dict_list_color
 
+        # the color of each type of argument, filled the first time an
+        # argument of the type is printed, None for the ones not colored
+        self._type_colors: dict[type, str | None] = {}
+        # the debug line of each length
+        self._lines: dict[int, str] = {}
+
     def __call__(
         self,
         *args: Any,
@@ -52,34 +58,49 @@ class CustomPrint(metaclass=SingletonMeta):
         :param print_lines: Whether to print the debug lines. Default is True.
         :param line_length: Length of the debug lines. Default is 50.
         """
-        if self.debug and print_lines:
-            print(self.line_color + '-' * line_length + Style.RESET_ALL)
+        print_debug_lines = self.debug and print_lines
+        if print_debug_lines:
+            line = self._lines.get(line_length)
+            if line is None:
+                line = self._lines[line_length] = (
+                    f'{self.line_color}{"-" * line_length}{Style.RESET_ALL}'
+                )
+            print(line)
 
+        type_colors = self._type_colors
         colored_args = []
         for arg in args:
+            arg_type = type(arg)
+            if arg_type in type_colors:
+                color = type_colors[arg_type]
+            else:
+                color = type_colors[arg_type] = self._get_color(arg)
 
-            if isinstance(arg, str):
-                colored_args.append(
-                    self.string_color + str(arg) + Style.RESET_ALL
-                )
+            if color is None:
+                colored_args.append(str(arg))
+            else:
+                colored_args.append(f'{color}{arg!s}{Style.RESET_ALL}')
 
-            elif isinstance(arg, int):
-                colored_args.append(
-                    self.int_color + str(arg) + Style.RESET_ALL
-                )
+        print(*colored_args, **kwargs)
 
-            elif isinstance(arg, (dict, list)):
-                colored_args.append(
-                    self.dict_list_color + str(arg) + Style.RESET_ALL
-                )
+        if print_debug_lines:
+            print(line)
 
-            else:
-                colored_args.append(str(arg))
+    def _get_color(self, arg: Any) -> str | None:
+        """
+        Returns the color of the type of the argument, None if the type is
+        printed without color.
+        """
+        if isinstance(arg, str):
+            return self.string_color
 
-        print(*colored_args, **kwargs)
+        if isinstance(arg, int):
+            return self.int_color
+
+        if isinstance(arg, (dict, list)):
+            return self.dict_list_color
 
-        if self.debug and print_lines:
-            print(self.line_color + '-' * line_length + Style.RESET_ALL)
+        return None
 
     def set_debug(self, debug: bool) -> None:
         """
@@ -96,6 +117,7 @@ class CustomPrint(metaclass=SingletonMeta):
         :param line_color: Color for the debug lines, from colorama.Fore.
         """
         self.line_color = line_color
+        self._lines.clear()
 
     def set_string_color(self, string_color: str) -> None:
         """
@@ -104,6 +126,7 @@ class CustomPrint(metaclass=SingletonMeta):
         :param string_color: Color for string arguments, from colorama.Fore.
         """
         self.string_color = string_color
+        self._type_colors.clear()
 
     def set_int_color(self, int_color: str) -> None:
         """
@@ -112,6 +135,7 @@ class CustomPrint(metaclass=SingletonMeta):
         :param int_color: Color for integer arguments, from colorama.Fore.
         """
         self.int_color = int_color
+        self._type_colors.clear()
 
     def set_dict_list_color(self, dict_list_color: str) -> None:
         """
@@ -121,6 +145,7 @@ class CustomPrint(metaclass=SingletonMeta):
         from colorama.Fore.
         """
         self.dict_list_color = dict_list_color
+        self._type_colors.clear()
 
 
 __print__ = CustomPrint()
@@ -1,4 +1,14 @@
+import os
 import sys
+import pickle
+
+from functools import lru_cache
+
+from core.utils import convert_squares_to_bitboard
+
+from board import Board
+from game.game import Game
+from pieces.utilites import PieceName, PieceColor
 
 
 class BColors:
@@ -34,3 +44,92 @@ def print_warning(text):
 
 def print_error(text):
     print(f'{BColors.FAIL}{text}{BColors.ENDC}')
+
+
+def debug_board(board: Board, **kwargs) -> None:
+    """
+    Print the board only when the SELENE_VERBOSE environment variable is
+    set, so the tests don't spend their time writing boards to stdout.
+    The keyword arguments are passed to Board.print_board.
+    """
+    if os.environ.get('SELENE_VERBOSE'):
+        board.print_board(**kwargs)
+
+
+@lru_cache(maxsize=64)
+def _parse_fen_template(fen: str) -> bytes:
+    return pickle.dumps(Game.parse_fen(fen))
+
+
+def parse_fen(fen: str) -> Game:
+    """
+    Same as Game.parse_fen, but the parsed game is cached as a pickled
+    template, so tests that load the same FEN over and over only pay for
+    unpickling a fresh copy instead of rebuilding the board piece by piece.
+    """
+    return pickle.loads(_parse_fen_template(fen))
+
+
+
+def mirror_colors(
+    layout: dict[tuple[PieceColor, PieceName], int]
+) -> dict[tuple[PieceColor, PieceName], int]:
+    """
+    Return the piece layout with the colors of the pieces swapped, the
+    squares are kept as they are.
+    """
+    return {
+        (color.opposite(), name): bitboard
+        for (color, name), bitboard in layout.items()
+    }
+
+
+# Piece layouts shared by the checkmate tests, white mates the black king in
+# all of them (mirror_colors gives the layouts for black). They are stored as
+# bitboards so they are built once and loaded with Board.load_from_bitboards
+CHECKMATE_FIXTURES: dict[str, dict[tuple[PieceColor, PieceName], int]] = {
+    'two_rooks': {
+        (PieceColor.BLACK, PieceName.KING): (
+            convert_squares_to_bitboard('d8')
+        ),
+        (PieceColor.WHITE, PieceName.ROOK): (
+            convert_squares_to_bitboard('a7', 'h2')
+        ),
+        (PieceColor.WHITE, PieceName.KING): (
+            convert_squares_to_bitboard('e1')
+        ),
+    },
+    'king_and_queen': {
+        (PieceColor.BLACK, PieceName.KING): (
+            convert_squares_to_bitboard('d8')
+        ),
+        (PieceColor.WHITE, PieceName.KING): (
+            convert_squares_to_bitboard('d6')
+        ),
+        (PieceColor.WHITE, PieceName.QUEEN): (
+            convert_squares_to_bitboard('h1')
+        ),
+    },
+}
+
+
+class CheckmateTestMixin:
+    """
+    Setup of the checkmate tests, one empty game for the test class where
+    the layouts of FIXTURES are loaded.
+    """
+
+    FIXTURES: dict[str, dict[tuple[PieceColor, PieceName], int]] = (
+        CHECKMATE_FIXTURES
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # unittest creates a new instance for every test method, so the game
+        # is kept on the class and emptied in place in setUp
+        cls.game = Game()
+        return super().setUpClass()
+
+    def setUp(self) -> None:
+        self.game.reset_empty()
+        return super().setUp()
@@ -10,12 +10,12 @@ PositionT = tuple[int, int]
 # ----------------- Dataclasses -----------------
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
 
     """
         A dataclass to represent a position in a 2D list
-        with a row and a column
+        with a row and a column, hashable so it can be used as a dict key
 
         row: int
         column: int
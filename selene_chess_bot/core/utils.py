@@ -26,6 +26,180 @@ ALGEBRAIC_NOTATION = {
     }
 }
 
+
+def _create_step_table(
+    offsets: tuple[tuple[int, int], ...]
+) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """
+        Creates, for every square `row * 8 + column`, the squares reached by
+        each one of the offsets that fall inside the board, keeping the order
+        of the offsets.
+    """
+
+    return tuple(
+        tuple(
+            (row + row_offset, column + column_offset)
+            for row_offset, column_offset in offsets
+            if 0 <= row + row_offset < 8 and 0 <= column + column_offset < 8
+        )
+        for row in range(8)
+        for column in range(8)
+    )
+
+
+# The squares a knight and a king can step to never change, so they are
+# computed once instead of being generated and bound checked on every call
+KNIGHT_MOVES = _create_step_table((
+    (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)
+))
+
+KING_MOVES = _create_step_table((
+    (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1)
+))
+
+
+def _create_attack_table(
+    step_table: tuple[tuple[tuple[int, int], ...], ...]
+) -> tuple[int, ...]:
+    """
+        Creates, for every square `row * 8 + column`, the bitboard of the
+        squares of the step table.
+    """
+
+    return tuple(
+        sum(1 << (row * 8 + column) for row, column in squares)
+        for squares in step_table
+    )
+
+
+# The squares attacked from each square as bitboards, the pawn attacks are
+# indexed by the value of the color of the pawn
+KNIGHT_ATTACKS = _create_attack_table(KNIGHT_MOVES)
+KING_ATTACKS = _create_attack_table(KING_MOVES)
+PAWN_ATTACKS = (
+    _create_attack_table(_create_step_table(((1, -1), (1, 1)))),
+    _create_attack_table(_create_step_table(((-1, -1), (-1, 1)))),
+)
+
+# The (row, column) of each square `row * 8 + column`
+SQUARES = tuple((row, column) for row in range(8) for column in range(8))
+
+# The algebraic notation of each square `row * 8 + column`
+ALGEBRAIC_SQUARES = tuple(
+    ALGEBRAIC_NOTATION['column'][column] + ALGEBRAIC_NOTATION['row'][row]
+    for row, column in SQUARES
+)
+
+# The (row, column) of each square in algebraic notation
+ALGEBRAIC_POSITIONS: dict[str, tuple[int, int]] = dict(
+    zip(ALGEBRAIC_SQUARES, SQUARES)
+)
+
+# The squares the king castles to, and the castling of each one of them
+CASTLING_NOTATION: dict[tuple[int, int], str] = {
+    (0, 2): 'O-O-O',
+    (7, 2): 'O-O-O',
+    (0, 6): 'O-O',
+    (7, 6): 'O-O',
+}
+# keyed by the castling and the value of the color of the king
+CASTLING_POSITIONS: dict[tuple[str, int], tuple[int, int]] = {
+    ('O-O-O', 0): (0, 2),
+    ('O-O-O', 1): (7, 2),
+    ('O-O', 0): (0, 6),
+    ('O-O', 1): (7, 6),
+}
+
+
+def _create_sliding_attack_tables(
+    directions: tuple[tuple[int, int], ...]
+) -> tuple[tuple[int, ...], tuple[dict[int, int], ...]]:
+    """
+        Creates, for every square `row * 8 + column`, the mask of the squares
+        that can block a sliding piece (the last square of each ray never
+        blocks anything) and a table with the attacks of the piece for every
+        subset of that mask, so the attacks for an occupancy are found with
+        `table[square][occupied & mask[square]]`.
+    """
+
+    masks = []
+    tables = []
+    for row, column in SQUARES:
+        rays = []
+        for row_step, column_step in directions:
+            ray = []
+            r, c = row + row_step, column + column_step
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append(1 << (r * 8 + c))
+                r, c = r + row_step, c + column_step
+            rays.append(ray)
+
+        mask = 0
+        for ray in rays:
+            for bit in ray[:-1]:
+                mask |= bit
+
+        # every subset of the mask, enumerated with the carry rippler trick
+        table = {}
+        blockers = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for bit in ray:
+                    attacks |= bit
+                    if blockers & bit:
+                        break
+            table[blockers] = attacks
+
+            blockers = (blockers - mask) & mask
+            if not blockers:
+                break
+
+        masks.append(mask)
+        tables.append(table)
+
+    return tuple(masks), tuple(tables)
+
+
+# The attacks of the rooks and the bishops include the first piece found on
+# each ray, the queen attacks are the union of both
+ROOK_MASKS, ROOK_ATTACKS = _create_sliding_attack_tables(
+    ((1, 0), (-1, 0), (0, 1), (0, -1))
+)
+BISHOP_MASKS, BISHOP_ATTACKS = _create_sliding_attack_tables(
+    ((1, 1), (1, -1), (-1, 1), (-1, -1))
+)
+
+
+def _create_ray_table(
+    directions: tuple[tuple[int, int], ...]
+) -> tuple[tuple[tuple[tuple[int, int], ...], ...], ...]:
+    """
+        Creates, for every square `row * 8 + column`, one ray per direction
+        with the squares from the one next to the square to the edge of the
+        board.
+    """
+
+    table = []
+    for row in range(8):
+        for column in range(8):
+            rays = []
+            for row_step, column_step in directions:
+                ray = []
+                r, c = row + row_step, column + column_step
+                while 0 <= r < 8 and 0 <= c < 8:
+                    ray.append((r, c))
+                    r, c = r + row_step, c + column_step
+                rays.append(tuple(ray))
+            table.append(tuple(rays))
+
+    return tuple(table)
+
+
+# The diagonals of a square, in the order of the directions d0 to d3 used by
+# Piece.scan_diagonals
+DIAGONAL_RAYS = _create_ray_table(((-1, -1), (-1, 1), (1, -1), (1, 1)))
+
 INITIAL_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
 INITIAL_BOARD_HASH = 1317592813748421116  # for a random seed of 42
 
@@ -42,15 +216,14 @@ def convert_to_algebraic_notation(
     """
 
     if king_color and can_castle:
-        if row == 0 and column == 2:
-            return 'O-O-O'
-        elif row == 7 and column == 2:
-            return 'O-O-O'
-        elif row == 0 and column == 6:
-            return 'O-O'
-        elif row == 7 and column == 6:
-            return 'O-O'
+        castling = CASTLING_NOTATION.get((row, column))
+        if castling:
+            return castling
+
+    if not (row | column) & ~7:
+        return ALGEBRAIC_SQUARES[row * 8 + column]
 
+    # outside of the board, the lookups raise the KeyError
     row = ALGEBRAIC_NOTATION['row'][row]
     column = ALGEBRAIC_NOTATION['column'][column]
 
@@ -65,21 +238,71 @@ def convert_from_algebraic_notation(
         Converts a position in algebraic notation to a tuple of integers.
     """
 
-    if king_color:
-
-        if position == 'O-O-O':
-            if king_color == PieceColor.WHITE:
-                return (0, 2)
-            else:
-                return (7, 2)
+    # the squares of the board are the common case, and no castling is
+    # written as one of them, so they are looked up first
+    square = ALGEBRAIC_POSITIONS.get(position)
+    if square:
+        return square
 
-        elif position == 'O-O':
-            if king_color == PieceColor.WHITE:
-                return (0, 6)
-            else:
-                return (7, 6)
+    if king_color:
+        square = CASTLING_POSITIONS.get((position, king_color.value))
+        if square:
+            return square
 
+    # anything else (e.g. a square outside of the board) is parsed by hand
     row = int(position[1]) - 1
     column = ord(position[0]) - 97
 
     return (row, column)
+
+
+def convert_squares_to_bitboard(*squares: str) -> int:
+    """
+        Converts positions in algebraic notation to a 64 bits integer where
+        the bit `row * 8 + column` is set for each one of the squares.
+    """
+
+    bitboard = 0
+    for square in squares:
+        row, column = convert_from_algebraic_notation(square)
+        bitboard |= 1 << (row * 8 + column)
+
+    return bitboard
+
+
+def convert_bitboard_to_squares(bitboard: int) -> list[tuple[int, int]]:
+    """
+        Converts a 64 bits integer to the list of the (row, column) of the
+        squares whose bit is set.
+    """
+
+    squares = []
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        squares.append(SQUARES[lowest_bit.bit_length() - 1])
+        bitboard ^= lowest_bit
+
+    return squares
+
+
+# The flags of the encoded moves of the pawns promoted to each piece
+PROMOTION_FLAGS = {'Q': 1, 'R': 2, 'B': 3, 'N': 4}
+
+
+def encode_move(from_square: int, to_square: int, flags: int = 0) -> int:
+    """
+        Encodes a move in 16 bits: the square `row * 8 + column` the piece
+        moves from in the lowest 6 bits, the square it moves to in the next
+        6 bits and 4 bits of flags on top.
+    """
+
+    return from_square | (to_square << 6) | (flags << 12)
+
+
+def decode_move(move: int) -> tuple[int, int, int]:
+    """
+        Decodes a move encoded by `encode_move` into the squares it moves
+        from and to, and its flags.
+    """
+
+    return move & 63, (move >> 6) & 63, move >> 12
@@ -62,7 +62,7 @@ class CheckDetector:
 
         for move in legal_moves:
 
-            game = Game.parse_fen(self.initial_fen)
+            game = self.__initial_game.clone()
             game.move_piece(move)
 
             # check for checks on the position after the move
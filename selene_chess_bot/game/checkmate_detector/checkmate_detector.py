@@ -12,7 +12,9 @@ class CheckmateDetector:
         self,
         fen: str,
         detecting_mate_for: PieceColor,
-        maximum_depth: int = 5
+        maximum_depth: int = 5,
+        k_best_moves: int = None,
+        all_checkmates: bool = True
     ):
 
         """
@@ -26,6 +28,17 @@ class CheckmateDetector:
             position, the given position must have a check on it, so the
             CheckDetecor can detect it.
 
+        k_best_moves limits the checks searched on every move of the
+        detecting player to the k with the highest priority (captures and
+        promotions first). The replies of the defending side are never
+        limited, so a checkmate found is always forced, but with a limit some
+        checkmates can be missed. None searches every check.
+
+        all_checkmates=False stops the search of a position of the detecting
+        player at the first check that forces the checkmate (like the cutoff
+        on the replies of the defending side), so only one route to the
+        checkmate is found instead of all the shortest ones.
+
         """
         self.initial_fen: str = fen
         self.detecting_mate_for: str = detecting_mate_for
@@ -35,6 +48,20 @@ class CheckmateDetector:
         self.check_mates: list[MoveNode] = []
 
         self.maximum_depth: int = maximum_depth
+        self.k_best_moves: int = k_best_moves
+        self.all_checkmates: bool = all_checkmates
+
+        # depth limit of the current iteration of find_force_checkmate
+        self._depth_limit: int = maximum_depth
+
+        # the reply that escaped the checkmate in each position (fen) on the
+        # previous iterations, it is searched first on the next ones
+        self._refutations: dict[str, str] = {}
+
+        # the checks (or the legal moves of the defending side) of each
+        # position, keyed by the FEN without the move counters, the same
+        # positions are reached on every iteration and by transpositions
+        self._moves_for_simulation: dict[str, tuple[str, ...]] = {}
 
         self._routes_to_checkmates: list[dict] = []
 
@@ -124,37 +151,25 @@ class CheckmateDetector:
         ```
         """
 
-        list_of_routes = []
-
-        best_depth = float('inf')
-        for move in self.check_mates:
-            route = move.get_route_to_checkmate()
-            route_depth = route['best_depth']
-            list_of_routes.append(route)
-
-            if get_shortest_mate:
-                # If we are looking for the shortest route, update best_depth
-                # and remove longer routes
-                if best_depth >= route_depth:
-                    best_depth = route_depth
-                else:
-                    # Remove the longer route
-                    list_of_routes.remove(route)
-
-        # traverse the parent nodes to find the
-        # best route to the checkmate
-        if get_shortest_mate:
-            # Traverse the list of routes to keep only the best routes
-            # to checkmate
-            best_lines = []
-            for route in list_of_routes:
-                if route['best_depth'] == best_depth:
-                    best_lines.append(route)
-        else:
+        list_of_routes = [
+            move.get_route_to_checkmate() for move in self.check_mates
+        ]
+
+        if not get_shortest_mate:
             # If not filtering, all routes are considered best
-            best_lines = list_of_routes
+            return list_of_routes
 
-        return best_lines
+        # keep only the routes with the shortest depth to the checkmate, in
+        # the order the checkmates were found
+        best_depth = min(
+            (route['best_depth'] for route in list_of_routes),
+            default=float('inf')
+        )
+
+        return [
+            route for route in list_of_routes
+            if route['best_depth'] == best_depth
+        ]
 
     def find_force_checkmate(self) -> bool:
 
@@ -184,9 +199,11 @@ class CheckmateDetector:
         Steps:
         ------
         1. Initialize a `CheckDetector` with the initial FEN position.
-        2. Iterate over all checks found by the `CheckDetector`.
+        2. Search with a depth limit of 1, 3, ... up to `self.maximum_depth`
+            (iterative deepening), stopping at the first limit where a forced
+            checkmate is found, so only the shortest mates are searched.
         3. For each check:
-        a. Parse the FEN and create a `Game` object.
+        a. Copy the `Game` of the initial FEN.
         b. Initialize a `MoveNode` for the check.
         c. Add the node to the roots.
         d. Make the move in the game.
@@ -195,12 +212,37 @@ class CheckmateDetector:
         """
 
         check_detector = CheckDetector(fen=self.initial_fen)
+
+        # a checkmate always happens after a move of the detecting player,
+        # so only odd depth limits are tried
+        for depth_limit in range(1, self.maximum_depth + 1, 2):
+            self._depth_limit = depth_limit
+            self.roots = []
+            self.check_mates = []
+
+            if self._find_force_checkmate_from_checks(check_detector):
+                return True
+
+        return False
+
+    def _find_force_checkmate_from_checks(
+        self,
+        check_detector: CheckDetector
+    ) -> bool:
+
+        """
+        Searches for a forced checkmate starting with every check of the
+        initial position, up to the current depth limit.
+        """
+
         found_forced_mate = False
 
+        checks = self._get_k_best_moves(check_detector.checks_on_position)
+
         # Iterate over all checks found by the CheckDetector
-        for check in check_detector.checks_on_position:
-            # Parse the FEN and create a Game object
-            game: Game = Game.parse_fen(self.initial_fen)
+        for check in checks:
+            # Every check is made on a copy of the game of the initial FEN
+            game: Game = self.game.clone()
 
             # Initialize a MoveNode for the checks
             current_node = MoveNode(
@@ -223,6 +265,9 @@ class CheckmateDetector:
                 found_forced_mate = True
                 self.check_mates.append(current_node)
 
+                if not self.all_checkmates:
+                    break
+
         return found_forced_mate
 
     def _find_force_checkmate(
@@ -265,8 +310,15 @@ class CheckmateDetector:
         - It recursively simulates moves and builds the move tree, marking
             nodes that lead to checkmate.
 
-        - If the depth exceeds `self.maximum_depth`, the search terminates and
-            returns False.
+        - If the depth exceeds the depth limit of the current iteration, the
+            search terminates and returns False.
+
+        - Once a reply of the defending side escapes the checkmate the rest
+            of the replies are not searched.
+
+        - If `self.all_checkmates` is False, once a check of the detecting
+            player forces the checkmate the rest of the checks are not
+            searched.
 
         Example:
         --------
@@ -277,7 +329,7 @@ class CheckmateDetector:
         ```
         """
 
-        if depth > self.maximum_depth:
+        if depth > self._depth_limit:
             return False
 
         # Check if the game is terminated and not drawn, indicating a checkmate
@@ -292,8 +344,28 @@ class CheckmateDetector:
         if not moves and game.player_turn == self.detecting_mate_for:
             return False
 
+        # When the defending side is to move, every reply has to lead to a
+        # checkmate, so the search stops at the first reply that escapes
+        # (a beta cutoff). Captures are tried first since they are the most
+        # likely replies to escape.
+        is_defending = game.player_turn != self.detecting_mate_for
+        if is_defending:
+            moves = sorted(moves, key=lambda move: 'x' not in move)
+
+            # The reply that escaped on a shallower iteration most likely
+            # escapes again, so it is searched first (like the principal
+            # variation of a PVS search) and the rest are usually skipped
+            refutation = self._refutations.get(fen)
+            if refutation in moves:
+                moves.remove(refutation)
+                moves.insert(0, refutation)
+
+        # every move is made on a copy of the game of this position, instead
+        # of parsing its FEN once per move
+        position: Game = game
+
         for move in moves:
-            game: Game = Game.parse_fen(fen)
+            game: Game = position.clone()
             current_node = MoveNode(
                 move=move,
                 depth=depth,
@@ -308,13 +380,22 @@ class CheckmateDetector:
                 parent.add_child(current_node)
 
             # Recursively search for forced checkmate from the new game state
-            self._find_force_checkmate(
+            is_mate = self._find_force_checkmate(
                 game=game,
                 depth=depth + 1,
                 parent=current_node,
                 fen=game.create_current_fen(),
             )
 
+            if is_defending and not is_mate:
+                self._refutations[fen] = move
+                break
+
+            # a single check that forces the checkmate is enough to know the
+            # position is a forced checkmate
+            if not is_defending and is_mate and not self.all_checkmates:
+                break
+
         # Return whether all children nodes lead to a forced checkmate
         return parent.children_forced_checkmate()
 
@@ -345,6 +426,8 @@ class CheckmateDetector:
         - If it is the detecting player's turn, the method returns moves that
             put the opponent in check.
         - Otherwise, it returns all legal moves for the current player.
+        - The moves are generated once for each position and then taken from
+            `self._moves_for_simulation`.
 
         Example:
         --------
@@ -355,13 +438,18 @@ class CheckmateDetector:
         ```
         """
 
-        moves: list[str] = []
+        # the halfmove clock and the fullmove number don't change the moves
+        position_key = fen.rsplit(' ', 2)[0]
+
+        moves = self._moves_for_simulation.get(position_key)
+        if moves is not None:
+            return list(moves)
 
         # If it is the detecting player's turn, get moves that put the
         # opponent in check
         if game.player_turn == self.detecting_mate_for:
             check_detector = CheckDetector(fen=fen)
-            moves = check_detector.checks_on_position
+            moves = self._get_k_best_moves(check_detector.checks_on_position)
         else:
             # Otherwise, get all legal moves for the current player
             moves = game.get_legal_moves(
@@ -369,4 +457,50 @@ class CheckmateDetector:
                 show_in_algebraic=True,
             )
 
+        self._moves_for_simulation[position_key] = tuple(moves)
         return moves
+
+    def _get_k_best_moves(self, moves: list[str]) -> list[str]:
+        """
+        Keeps the `self.k_best_moves` moves with the highest priority, in
+        their original order for equal priorities.
+
+        Parameters:
+        -----------
+        moves : list[str]
+            The checks of the detecting player in algebraic notation.
+
+        Returns:
+        --------
+        list[str]
+            The moves to search, all of them if `self.k_best_moves` is None.
+        """
+
+        if self.k_best_moves is None or len(moves) <= self.k_best_moves:
+            return moves
+
+        return sorted(
+            moves,
+            key=self.get_move_priority,
+            reverse=True
+        )[:self.k_best_moves]
+
+    @staticmethod
+    def get_move_priority(move: str) -> int:
+        """
+        Scores a move by how forcing it is. The moves searched by the
+        detector are all checks already, so only captures and promotions
+        are ranked between them.
+
+        Parameters:
+        -----------
+        move : str
+            The move in algebraic notation.
+
+        Returns:
+        --------
+        int
+            2 * is_capture + is_promotion
+        """
+
+        return 2 * ('x' in move) + ('=' in move)
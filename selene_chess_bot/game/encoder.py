@@ -1,10 +1,36 @@
+import struct
+
 from pieces import Piece
 from pieces.utilites import PieceColor, RookSide
 
 from board import Board
 
 from game.types import FENInfo
-from game.zobriest_hash import ZOBRIEST_KEYS
+from game.zobriest_hash import ZOBRIEST_KEYS, ZOBRIEST_PIECE_KEYS
+
+
+# Pieces of a packed state, two squares per byte (4 bits each), the code of
+# a piece is its index in this string and 0 is an empty square
+PACKED_PIECES: str = '.PNBRQK..pnbrqk.'
+PACKED_PIECE_CODES: dict[str, int] = {
+    piece: code for code, piece in enumerate(PACKED_PIECES) if piece != '.'
+}
+
+# board (32 bytes), flags, en passant square, halfmove clock, fullmove number
+PACKED_STATE_FORMAT: str = '<32sBBHH'
+NO_EN_PASSANT: int = 0xFF
+
+# Expands the digits of a FEN row into its empty squares, so a row is
+# turned into its 8 squares by str.translate instead of char by char
+FEN_EMPTY_SQUARES: dict[int, str] = str.maketrans(
+    {str(n_squares): '.' * n_squares for n_squares in range(1, 9)}
+)
+
+# The runs of empty squares and their digit, the longest first, so the
+# piece placement of a FEN is written with a str.replace for each of them
+FEN_EMPTY_RUNS: tuple[tuple[str, str], ...] = tuple(
+    ('.' * n_squares, str(n_squares)) for n_squares in range(8, 0, -1)
+)
 
 
 class GameEncoder:
@@ -28,28 +54,107 @@ class GameEncoder:
 
         active_color: str = color[active_color]
 
+        # Join all rows with '/' to form the piece placement part of the FEN,
+        # the rows are separated so a run of empty squares never spans two
+        piece_placement = "/".join("".join(row) for row in board)
+        for empty_squares, digit in FEN_EMPTY_RUNS:
+            piece_placement = piece_placement.replace(empty_squares, digit)
+
+        # Forming the complete FEN string
+        fen = f" {piece_placement} {active_color} {castling_rights} {en_passant_target} {halfmove_clock} {fullmove_number}"
+        return fen.strip()
+
+    @staticmethod
+    def pack_fen(fen: str) -> bytes:
+        """
+        Packs a FEN into 38 bytes: the 64 squares at 4 bits each, a byte of
+        flags (side to move and the four castling rights), the en passant
+        square, and the two move counters as unsigned 16 bits integers.
+        """
+
+        piece_placement, active_color, castling_fen, en_passant_target, \
+            halfmove_clock, fullmove_number = fen.split()
+
+        codes: list[int] = []
+        for char in piece_placement:
+            if char == '/':
+                continue
+            if char.isdigit():
+                codes.extend([0] * int(char))
+            else:
+                codes.append(PACKED_PIECE_CODES[char])
+
+        board = bytes(
+            codes[i] << 4 | codes[i + 1] for i in range(0, 64, 2)
+        )
+
+        flags = (
+            (active_color == 'b') |
+            ('K' in castling_fen) << 1 |
+            ('Q' in castling_fen) << 2 |
+            ('k' in castling_fen) << 3 |
+            ('q' in castling_fen) << 4
+        )
+
+        en_passant = NO_EN_PASSANT
+        if en_passant_target != '-':
+            en_passant = (
+                (int(en_passant_target[1]) - 1) * 8 +
+                ord(en_passant_target[0]) - 97
+            )
+
+        return struct.pack(
+            PACKED_STATE_FORMAT,
+            board,
+            flags,
+            en_passant,
+            int(halfmove_clock),
+            int(fullmove_number)
+        )
+
+    @staticmethod
+    def unpack_fen(state: bytes) -> str:
+        """
+        Builds back the FEN of a state packed by `pack_fen`.
+        """
+
+        board, flags, en_passant, halfmove_clock, fullmove_number = (
+            struct.unpack(PACKED_STATE_FORMAT, state)
+        )
+
         fen_rows = []
-        for row in board:
+        for row in range(8):
             empty_count = 0
             fen_row = ""
-            for cell in row:
-                if cell == ".":  # Empty square
-                    empty_count += 1
-                else:
+            for byte in board[row * 4:row * 4 + 4]:
+                for code in (byte >> 4, byte & 0x0F):
+                    if not code:
+                        empty_count += 1
+                        continue
                     if empty_count > 0:
                         fen_row += str(empty_count)
                         empty_count = 0
-                    fen_row += cell
+                    fen_row += PACKED_PIECES[code]
             if empty_count > 0:
                 fen_row += str(empty_count)
             fen_rows.append(fen_row)
 
-        # Join all rows with '/' to form the piece placement part of the FEN
-        piece_placement = "/".join(fen_rows)
-
-        # Forming the complete FEN string
-        fen = f" {piece_placement} {active_color} {castling_rights} {en_passant_target} {halfmove_clock} {fullmove_number}"
-        return fen.strip()
+        active_color = 'b' if flags & 1 else 'w'
+        castling_fen = ''.join(
+            right for bit, right in zip((2, 4, 8, 16), 'KQkq')
+            if flags & bit
+        ) or '-'
+
+        en_passant_target = '-'
+        if en_passant != NO_EN_PASSANT:
+            en_passant_target = (
+                chr(en_passant % 8 + 97) + str(en_passant // 8 + 1)
+            )
+
+        return (
+            f"{'/'.join(fen_rows)} {active_color} {castling_fen} "
+            f"{en_passant_target} {halfmove_clock} {fullmove_number}"
+        )
 
     @staticmethod
     def parse_fen(fen: str, reverse_piece_placement: bool = True) -> FENInfo:
@@ -62,18 +167,10 @@ class GameEncoder:
         fullmove_number = int(parts[5])
 
         # Create the board array
-        board = []
-        rows = piece_placement.split('/')
-        for row in rows:
-            board_row = []
-            for char in row:
-                if char.isdigit():
-                    # Add empty squares
-                    board_row.extend(['.'] * int(char))
-                else:
-                    # Add a piece
-                    board_row.append(char)
-            board.append(board_row)
+        board = [
+            list(row.translate(FEN_EMPTY_SQUARES))
+            for row in piece_placement.split('/')
+        ]
 
         if reverse_piece_placement:
             board.reverse()
@@ -115,19 +212,21 @@ class GameEncoder:
         en_passant_pos: str,
         castling_rights: dict,
         current_side: PieceColor,
-    ):
+    ) -> int:
         board_hash = 0
 
-        # Iterate through each piece on the board and XOR its key
-        for row in range(8):
-            for column in range(8):
-                piece = board.get_square_or_piece(row, column)
-                if isinstance(piece, Piece):
+        # Iterate through each piece on the board and XOR its key, the
+        # squares are read from the grid without going through
+        # get_square_or_piece
+        square = 0
+        for pieces in board.board:
+            for piece in pieces:
+                if piece is not None:
                     piece: Piece
-                    piece_key = ZOBRIEST_KEYS[piece.name.value[1]][piece.color][
-                        (row, column)
+                    board_hash ^= ZOBRIEST_PIECE_KEYS[piece.name, piece.color][
+                        square
                     ]
-                    board_hash ^= piece_key
+                square += 1
 
         # Include castling rights
         for side, rights in castling_rights.items():
@@ -135,13 +234,16 @@ class GameEncoder:
                 if enabled:
                     board_hash ^= ZOBRIEST_KEYS['castling'][(side, right)]
 
-        # Include en passant possibility
+        # Include en passant possibility, the keys are indexed by the column
+        # of the square, the row is always the same for the side to move
         if en_passant_pos is not None:
             board_hash ^= ZOBRIEST_KEYS['en_passant'][current_side][
-                int(en_passant_pos[1])
+                ord(en_passant_pos[0]) - 97
             ]
 
         # Include the side to move
         board_hash ^= ZOBRIEST_KEYS['side'][current_side]
 
-        return board_hash.to_bytes(8, byteorder='big', signed=False)
+        # the 64 bit int is kept as is, it hashes faster than bytes when it's
+        # used as a dict key
+        return board_hash
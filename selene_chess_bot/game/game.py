@@ -102,50 +102,18 @@ class Game:
         self.debug: bool = False
 
         # Board
-        self.board_states: BoardStates = dict()
         self.board: Board = Board(
             board_setup=board_setup,
             castling_rights=castling_rights
         )
-        self.initial_board_setup: bool = lambda: False if board_setup else True
-
-        # Moves ---------------------------------------------------
-        self.moves: MoveDict = {}
-        self.moves_for_f_rule: int = 0
-
-        self.current_turn: int = current_turn
-        self.player_turn: PieceColor = player_turn
-
-        # En passant ----------------------------------------------
-        self.white_possible_pawn_enp: Pawn | None = None
-        self.black_possible_pawn_enp: Pawn | None = None
-
-        self._initialize_en_passant_pawns(en_passant_target)
-
-        # Game state ----------------------------------------------
-        self.is_game_terminated: bool = False
-        self.game_drawn_reason: str = str()
-        self.is_game_drawn: bool = False
+        self.initial_board_setup: bool = not board_setup
 
-        self.current_board_hash: bytes = self.compute_game_state_hash(
-            board=self.board,
-            current_side=self.player_turn,
-            en_passant_pos=en_passant_target,
-            castling_rights=self.board.castleling_rights,
+        self._initialize_game_state(
+            current_turn=current_turn,
+            player_turn=player_turn,
+            en_passant_target=en_passant_target,
         )
 
-        self.current_fen: str = str()
-
-        self.game_values: dict = {
-            PieceColor.WHITE: 0,
-            PieceColor.BLACK: 0
-        }
-
-        self.sufficient_material: dict = {
-            PieceColor.WHITE: True,
-            PieceColor.BLACK: True
-        }
-
     #  ---------------------------- PROPERTIES ----------------------------
 
     @property
@@ -178,7 +146,7 @@ class Game:
 
     @property
     def possible_pawn_enp(self) -> Pawn | None:
-        if self.player_turn == PieceColor.WHITE:
+        if self.player_turn is PieceColor.WHITE:
             return self.white_possible_pawn_enp
         return self.black_possible_pawn_enp
 
@@ -280,6 +248,20 @@ class Game:
             fullmove_number=fullmove_number
         )
 
+    @staticmethod
+    def unpack_state(state: bytes) -> 'Game':
+        """
+        Creates a game from a state packed by `Game.pack_state`.
+
+        Args:
+            state (bytes): The packed state of the game.
+
+        Returns:
+            Game: An initialized game state corresponding to the state.
+        """
+
+        return Game.parse_fen(GameEncoder.unpack_fen(state))
+
     @staticmethod
     def parse_fen(fen: str, reverse_piece_placement: bool = True) -> 'Game':
 
@@ -355,7 +337,7 @@ class Game:
         current_side: PieceColor,
         castling_rights: dict,
         en_passant_pos: str
-    ) -> bytes:
+    ) -> int:
 
         """
         Computes a unique hash value for a given chess board configuration
@@ -381,8 +363,7 @@ class Game:
                 capture, or None if no such capture is possible.
 
         Returns:
-            int: An integer hash of the board state. This integer is
-                represented in 8 bytes using big-endian byte order.
+            int: A 64 bit integer hash of the board state.
 
         NOTE:
             The hash does not take in mind the state of the position in terms
@@ -401,10 +382,26 @@ class Game:
 
     # ---------------------------- PUBLIC METHODS ----------------------------
 
+    def reset_empty(self) -> None:
+        """
+        Reset the game in place to an empty board with white to move,
+        reusing the same Board instance instead of creating a new Game and
+        cleaning its board.
+        """
+
+        self.board.clean_board()
+        self.initial_board_setup = False
+
+        self._initialize_game_state()
+
     def create_current_fen(self) -> str:
         """
         Take the current board state to generate the FEN representation of the
         board.
+
+        The FEN is cached and only generated again when the board, the turn,
+        the castling rights, the en passant target or the move counters
+        change.
         """
 
         en_passant_column = (
@@ -416,12 +413,26 @@ class Game:
         if en_passant_column:
             en_passant_target = en_passant_column.algebraic_pos
 
+        # the FEN is only generated again if the board or any of the other
+        # fields changed since the last call
+        fen_key = (
+            self.board.state_version,
+            self.player_turn,
+            self.castling_fen,
+            en_passant_target,
+            self.moves_for_f_rule,
+            self.current_turn,
+        )
+        if fen_key == self._fen_key:
+            return self.current_fen
+
         board_representation = self.board.get_board_representation(
             use_colors=False,
             upper_case_diff=True,
             reverse=True
         )
 
+        self._fen_key = fen_key
         self.current_fen = self.create_fen(
             board=board_representation,
             active_color=self.player_turn,
@@ -432,6 +443,47 @@ class Game:
         )
         return self.current_fen
 
+    def clone(self) -> 'Game':
+        """
+        Return an independent copy of the game, made from a copy of the
+        board instead of parsing the FEN again. Moving pieces on the copy
+        doesn't change this game, so a search can try every move of a
+        position on a copy of the same game.
+
+        Returns:
+            Game: The copy of the game.
+        """
+
+        new = Game.__new__(Game)
+        new.__dict__.update(self.__dict__)
+
+        new.board = board = self.board.clone()
+
+        new.board_states = self.board_states.copy()
+        new.moves = {turn: moves.copy() for turn, moves in self.moves.items()}
+        new.game_values = self.game_values.copy()
+        new.sufficient_material = self.sufficient_material.copy()
+
+        # the pawns that can be captured en passant are the ones of the copy
+        for attribute in (
+            'white_possible_pawn_enp',
+            'black_possible_pawn_enp'
+        ):
+            pawn: Pawn | None = getattr(self, attribute)
+            if pawn is not None:
+                setattr(new, attribute, board.board[pawn.row][pawn.column])
+
+        return new
+
+    def pack_state(self) -> bytes:
+        """
+        Pack the current game state into 38 bytes, a much smaller
+        representation than the FEN to keep in memory (e.g. on every node of
+        the search tree). Use `Game.unpack_state` to build the game back.
+        """
+
+        return GameEncoder.pack_fen(self.create_current_fen())
+
     def get_next_states(self) -> 'dict[str, Game]':
         """
             Get the possible next states (board_hash) in the position
@@ -596,6 +648,56 @@ class Game:
 
     # ---------------------------- PRIVATE METHODS ----------------------------
 
+    def _initialize_game_state(
+        self,
+        current_turn: int = 1,
+        player_turn: PieceColor = PieceColor.WHITE,
+        en_passant_target: str | None = None,
+    ) -> None:
+        """
+        Initialize everything of the game that is not the board: the moves,
+        the turn, the en passant pawns and the state of the game.
+        """
+
+        # Moves ---------------------------------------------------
+        self.board_states: BoardStates = dict()
+        self.moves: MoveDict = {}
+        self.moves_for_f_rule: int = 0
+
+        self.current_turn: int = current_turn
+        self.player_turn: PieceColor = player_turn
+
+        # En passant ----------------------------------------------
+        self.white_possible_pawn_enp: Pawn | None = None
+        self.black_possible_pawn_enp: Pawn | None = None
+
+        self._initialize_en_passant_pawns(en_passant_target)
+
+        # Game state ----------------------------------------------
+        self.is_game_terminated: bool = False
+        self.game_drawn_reason: str = str()
+        self.is_game_drawn: bool = False
+
+        self.current_board_hash: int = self.compute_game_state_hash(
+            board=self.board,
+            current_side=self.player_turn,
+            en_passant_pos=en_passant_target,
+            castling_rights=self.board.castleling_rights,
+        )
+
+        self.current_fen: str = str()
+        self._fen_key: tuple = None
+
+        self.game_values: dict = {
+            PieceColor.WHITE: 0,
+            PieceColor.BLACK: 0
+        }
+
+        self.sufficient_material: dict = {
+            PieceColor.WHITE: True,
+            PieceColor.BLACK: True
+        }
+
     # -------------------------------- HELPERS --------------------------------
 
     def _get_legal_moves_as_list(self, legal_moves: dict) -> list[str]:
@@ -620,7 +722,7 @@ class Game:
                     move=move
                 )
 
-                if piece.name != PieceName.PAWN:
+                if piece.name is not PieceName.PAWN:
 
                     piece_name = piece.name.value[1]
 
@@ -637,7 +739,7 @@ class Game:
                     else:
                         moves.append(f'{piece_name}x{move}')
 
-                elif piece.name == PieceName.PAWN:
+                elif piece.name is PieceName.PAWN:
                     if isinstance(square_or_piece, Piece):
                         moves.append(f'{piece.algebraic_pos[0]}x{move}')
                         continue
@@ -649,7 +751,7 @@ class Game:
 
                         # add one or subtract one to the row based on the
                         # color of the pawn
-                        if self.possible_pawn_enp.color == PieceColor.WHITE:
+                        if self.possible_pawn_enp.color is PieceColor.WHITE:
                             row -= 1
                         else:
                             row += 1
@@ -708,9 +810,9 @@ class Game:
 
         en_passant_pawn: Pawn = None
 
-        if self.player_turn == PieceColor.WHITE:
+        if self.player_turn is PieceColor.WHITE:
             en_passant_pawn = self.black_possible_pawn_enp
-        elif self.player_turn == PieceColor.BLACK:
+        elif self.player_turn is PieceColor.BLACK:
             en_passant_pawn = self.white_possible_pawn_enp
 
         # set the last pawn moved two squares to not be able to be captured
@@ -718,9 +820,9 @@ class Game:
         if en_passant_pawn:
             en_passant_pawn.can_be_captured_en_passant = False
 
-            if self.player_turn == PieceColor.WHITE:
+            if self.player_turn is PieceColor.WHITE:
                 self.black_possible_pawn_enp = None
-            elif self.player_turn == PieceColor.BLACK:
+            elif self.player_turn is PieceColor.BLACK:
                 self.white_possible_pawn_enp = None
 
     def _get_movable_piece(
@@ -848,11 +950,10 @@ class Game:
         color: PieceColor
     ) -> bool:
         # TODO: Create docstring
-        for piece_key in self.board.pieces_on_board[color]:
-            for piece in self.board.pieces_on_board[color][piece_key]:
-                piece: Piece
-                if piece.calculate_legal_moves():
-                    return True
+        for piece in self.board.get_pieces(color):
+            piece: Piece
+            if piece.calculate_legal_moves():
+                return True
 
         return False
 
@@ -927,13 +1028,10 @@ class Game:
 
         # TODO: Create docstring
 
-        pieces = self.board.pieces_on_board[king.color]
-
-        for piece_key in pieces:
-            for piece in pieces[piece_key]:
-                piece: Piece
-                if attacking_piece in piece.get_pieces_under_attack():
-                    return True
+        for piece in self.board.get_pieces(king.color):
+            piece: Piece
+            if attacking_piece in piece.get_pieces_under_attack():
+                return True
 
         return False
 
@@ -951,8 +1049,6 @@ class Game:
         if len(king.pieces_attacking_me['pieces']) > 1:
             return False
 
-        pieces = self.board.pieces_on_board[king.color]
-
         # first identify where is the piece that is attacking the king
         # this means if a row, column or diagonal
 
@@ -1006,12 +1102,11 @@ class Game:
                         possible_blocking_squares = diagonal[dir]
                         break
 
-        for piece_key in pieces:
-            for piece in pieces[piece_key]:
-                piece: Piece
-                for possible_square in possible_blocking_squares:
-                    if possible_square in piece.calculate_legal_moves():
-                        return True
+        for piece in self.board.get_pieces(king.color):
+            piece: Piece
+            for possible_square in possible_blocking_squares:
+                if possible_square in piece.calculate_legal_moves():
+                    return True
 
         return False
 
@@ -1059,7 +1154,7 @@ class Game:
 
             if not m:
                 # check who won
-                if king.color == PieceColor.WHITE:
+                if king.color is PieceColor.WHITE:
                     self.game_values[PieceColor.BLACK] = float('inf')
                     self.game_values[PieceColor.WHITE] = float('-inf')
                 else:
@@ -1103,14 +1198,14 @@ class Game:
         self._clean_en_passant_state()
 
         # if the piece is a pawn, track for en passant
-        if piece_move.piece_name == PieceName.PAWN:
+        if piece_move.piece_name is PieceName.PAWN:
             piece: Pawn
             # if the move is a double move, track the pawn
             if piece_move.square[-1] in '45' and piece.first_move:
 
-                if self.player_turn == PieceColor.WHITE:
+                if self.player_turn is PieceColor.WHITE:
                     self.black_possible_pawn_enp = piece
-                elif self.player_turn == PieceColor.BLACK:
+                elif self.player_turn is PieceColor.BLACK:
                     self.white_possible_pawn_enp = piece
 
                 piece.can_be_captured_en_passant = True
@@ -1147,7 +1242,7 @@ class Game:
             piece_move (PieceMove): The move that has just been executed.
         """
 
-        if piece_move.piece_name == PieceName.PAWN or piece_move.is_capture:
+        if piece_move.piece_name is PieceName.PAWN or piece_move.is_capture:
             self.moves_for_f_rule = 0
         else:
             self.moves_for_f_rule += 1
@@ -1170,9 +1265,6 @@ class Game:
             piece_move (PieceMove): The move that has just been executed.
         """
 
-        self.board._attacked_squares_by_white_checked = False
-        self.board._attacked_squares_by_black_checked = False
-
         if self.current_turn not in self.moves:
             self.moves[self.current_turn] = []
 
@@ -1181,7 +1273,7 @@ class Game:
 
         self._manage_game_termination(piece_move=piece_move)
 
-        if self.player_turn == PieceColor.WHITE:
+        if self.player_turn is PieceColor.WHITE:
             self.current_turn += 1
 
         self._set_current_game_state_hash()
@@ -1224,12 +1316,7 @@ class Game:
         return self._manage_stalemate(king=king)
 
     def _manage_stalemate(self, king: King) -> bool:
-        n_pieces = [
-            self.board.n_white_pieces,
-            self.board.n_black_pieces
-        ]
-
-        n_pieces = n_pieces[king.color.value]
+        n_pieces = self.board.piece_count[king.color.value]
 
         if not king.is_in_check and n_pieces <= 8:
             if not self._color_has_legal_moves(
@@ -1257,12 +1344,7 @@ class Game:
         if self.sufficient_material[color] is False:
             return False
 
-        piece_num = {
-            PieceColor.WHITE: self.board.n_white_pieces,
-            PieceColor.BLACK: self.board.n_black_pieces
-        }
-
-        piece_num = piece_num[color]
+        piece_num = self.board.piece_count[color.value]
 
         if piece_num == 1:
             # There is only the King left
@@ -1359,7 +1441,7 @@ class Game:
 
         piece.can_be_captured_en_passant = True
 
-        if piece.color == PieceColor.WHITE:
+        if piece.color is PieceColor.WHITE:
             self.black_possible_pawn_enp = piece
         else:
             self.white_possible_pawn_enp = piece
@@ -2,6 +2,8 @@ from django.core.management.base import BaseCommand
 
 from django.contrib.auth.models import User
 
+from core.ndjson import read_ndjson
+
 from game.game import Game
 
 
@@ -14,8 +16,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--file_name',
             type=str,
-            help='Name of the JSON file.',
-            default='completed_simulations.json'
+            help='Name of the NDJSON file.',
+            default='completed_simulations.ndjson'
         )
 
     def create_users(self):
@@ -30,13 +32,8 @@ class Command(BaseCommand):
         except Exception as e:
             print(e)
 
-    def get_data_from_file(self, file_name: str) -> dict:
-        import json
-
-        with open(file_name, 'r') as file:
-            data: list[dict] = json.load(file)['data']
-
-        return data
+    def get_data_from_file(self, file_name: str) -> list[dict]:
+        return read_ndjson(file_name)
 
     def add_game(self, data: dict):
         game = Game()
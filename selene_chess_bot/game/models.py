@@ -1,11 +1,11 @@
 import math
 import numpy as np
-import json
-import os
 import networkx as nx
 
 from typing import Any, TYPE_CHECKING
 
+from core.ndjson import append_ndjson
+
 from pieces.utilites import PieceColor
 
 
@@ -33,7 +33,7 @@ class GameState():
     parents = None
 
     id: str = ''
-    board_hash: bytes = b''
+    board_hash: int = 0
 
     is_game_terminated: bool = None
 
@@ -65,7 +65,6 @@ class GameState():
     def create_tree_representation(
         parent: 'GameState',
         visited: set = None,
-        count_nodes: bool = False,
         nx_graph: nx.DiGraph = None,
         order_by: str = '-num_visits',
     ) -> nx.DiGraph:
@@ -73,36 +72,16 @@ class GameState():
         Create the nx.Diagraph tree code representation with a DFS on the tree.
         """
 
-        if nx_graph is None:
-            nx_graph = nx.DiGraph()
-
-        if visited is None:
-            visited = set()
-
-        # Check if the current node has already been visited
-        if str(parent.board_hash) in visited:
-            return nx_graph
-
-        # Mark the current node as visited
-        visited.add(str(parent.board_hash))
-
-        if parent.children.all().count() == 0:
-            return nx_graph
-
-        children = parent.children.all().order_by(order_by)
+        # the visualization dependencies are only needed here
+        from alpha_zero.tree import TreeRepresentation
 
-        for child in children:
-            child: GameState
-            nx_graph.add_edge(str(parent.board_hash), str(child.board_hash))
-            GameState.create_tree_representation(
-                parent=child,
-                visited=visited,
-                nx_graph=nx_graph,
-                order_by=order_by,
-                count_nodes=count_nodes,
-            )
-
-        return nx_graph
+        return TreeRepresentation.create_tree_representation(
+            parent=parent,
+            visited=visited,
+            nx_graph=nx_graph,
+            use_string_hash=True,
+            get_children=lambda node: node.children.all().order_by(order_by),
+        )
 
     def add_explored_move(self, move: str) -> None:
         self.explored_moves.append(move)
@@ -224,7 +203,7 @@ class GameState():
                     if print_helpers:
                         print('Game terminated successfully')
                         game_instance.print_game_state()
-                    file_path = 'completed_simulations.json'
+                    file_path = 'completed_simulations.ndjson'
 
                     if save_data:
                         self.save_simulation_data(
@@ -249,7 +228,7 @@ class GameState():
                 print('Saving to file')
                 print('-' * 50)
 
-                file_path = 'simulation_errors.json'
+                file_path = 'simulation_errors.ndjson'
                 self.save_simulation_data(
                     file_path=file_path,
                     game_instance=game_instance,
@@ -265,7 +244,7 @@ class GameState():
 
     def save_simulation_data(
         self,
-        file_path: dict,
+        file_path: str,
         game_instance: 'Game',
         delete_json: bool = False,
         error: Any = None,
@@ -274,17 +253,6 @@ class GameState():
         first_move: str = None
     ) -> None:
 
-        if delete_json:
-            data = {'data': []}
-        else:
-            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                with open(file_path, 'r') as f:
-                    data: dict = json.load(f)
-            else:
-                data = {
-                    'data': []
-                }
-
         white_king_in_check = 'No data'
         black_king_in_check = 'No data'
 
@@ -298,8 +266,6 @@ class GameState():
         except Exception as e:
             print('Error getting black king in check:', e)
 
-        black_king_in_check = game_instance.board.black_king.is_in_check
-
         moves = game_instance.moves
         moves[1] = [first_move, moves[1][0]]
 
@@ -321,10 +287,11 @@ class GameState():
 
         values = game_instance.game_values
 
-        if values[PieceColor.WHITE] == 'inf':
+        # JSON has no infinity, it would be written as null
+        if values[PieceColor.WHITE] == float('inf'):
             values[PieceColor.WHITE] = 999999999
 
-        if values[PieceColor.BLACK] == 'inf':
+        if values[PieceColor.BLACK] == float('inf'):
             values[PieceColor.BLACK] = 999999999
 
         data_to_append['game_values'] = {
@@ -359,12 +326,11 @@ class GameState():
             blm = 'Error getting black moves: ' + str(e)
 
         data_to_append['blm'] = blm
-        data['data'].append(data_to_append)
 
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
-            if print_helpers:
-                print('Data saved to file')
+        # one record per line, only the new record is written
+        append_ndjson(file_path, data_to_append, truncate=delete_json)
+        if print_helpers:
+            print('Data saved to file')
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         super().save(*args, **kwargs)
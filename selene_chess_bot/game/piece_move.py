@@ -1,6 +1,8 @@
 from core.utils import convert_from_algebraic_notation
 
-from pieces.utilites import PieceColor, PieceName, RookSide
+from pieces.utilites import (
+    PieceColor, PieceName, RookSide, PIECE_NAMES_BY_STRING
+)
 from pieces import Piece
 
 from board import Board
@@ -120,7 +122,7 @@ class PieceMove:
 
     @property
     def move_to_compare(self) -> str:
-        if self.piece_name == PieceName.PAWN:
+        if self.piece_name is PieceName.PAWN:
             if self.coronation_into:
                 # NOTE: Be careful because in the future we may have
                 # to change this
@@ -187,14 +189,12 @@ class PieceMove:
             self.piece_abbreviation = PieceName.KING.value[1]
             self.piece_name = PieceName.KING
         else:
-            abr = self._abr_move[0]
-            for piece in PieceName:
-                if piece.value[1] == abr:
-                    self.piece_abbreviation = piece.value[1]
-                    self.piece_name = piece
-                    break
-            else:
+            # a single character can only be the abbreviation of a piece
+            piece = PIECE_NAMES_BY_STRING.get(self._abr_move[0])
+            if piece is None:
                 raise InvalidMoveError('_set_piece')
+            self.piece_abbreviation = piece.value[1]
+            self.piece_name = piece
 
     def _set_square_and_pos(self):
         """
@@ -221,7 +221,7 @@ class PieceMove:
 
         if (
             self._abr_move[1] in '12345678'
-            and self.piece_name != PieceName.PAWN
+            and self.piece_name is not PieceName.PAWN
         ):
             self.row = int(self._abr_move[1]) - 1
 
@@ -233,7 +233,7 @@ class PieceMove:
             if self._abr_move[1] in 'abcdefgh':
                 self.piece_file = self._abr_move[1]
 
-        if self.piece_name == PieceName.PAWN:
+        if self.piece_name is PieceName.PAWN:
             # TODO: Check this, it may be wrong
             # We cannot put the file here because this can be an
             # en passant move, so the file should be put later
@@ -254,13 +254,12 @@ class PieceMove:
         Determines if the move involves a pawn coronation and sets the
         corresponding piece.
         """
-        if self.piece_name == PieceName.PAWN:
+        if self.piece_name is PieceName.PAWN:
             if self.square[1] == '8' or self.square[1] == '1':
                 piece_to = self._abr_move[-1]
-                for piece_name in PieceName:
-                    if piece_name.value[1] == piece_to:
-                        self.coronation_into = piece_name
-                        return
+                piece_name = PIECE_NAMES_BY_STRING.get(piece_to)
+                if piece_name is not None:
+                    self.coronation_into = piece_name
 
     def _set_is_capture(self):
         """
@@ -310,11 +309,11 @@ class PieceMove:
 
         if self.move == 'O-O':
             self.castleling_side = RookSide.KING
-            return 'g1' if self.player_turn == PieceColor.WHITE else 'g8'
+            return 'g1' if self.player_turn is PieceColor.WHITE else 'g8'
 
         if self.move == 'O-O-O':
             self.castleling_side = RookSide.QUEEN
-            return 'c1' if self.player_turn == PieceColor.WHITE else 'c8'
+            return 'c1' if self.player_turn is PieceColor.WHITE else 'c8'
 
     def __str__(self):
         print('-' * 50)
@@ -326,6 +325,6 @@ class PieceMove:
         print(f'Move: {self.move}')
         print(f'Move to compare: {self.move_to_compare}')
         print(f'abr move: {self._abr_move}')
-        if self.piece_name == PieceName.PAWN:
+        if self.piece_name is PieceName.PAWN:
             print(f'Coronation into: {self.coronation_into}')
         return '-' * 50
@@ -1,52 +1,28 @@
 from unittest import TestCase
 
-from core.testing import print_starting, print_success
+from core.testing import (
+    print_starting, print_success, parse_fen, CheckmateTestMixin
+)
 
-from pieces.utilites import PieceName, PieceColor, RookSide
+from pieces.utilites import PieceName, PieceColor
 
-from game.game import Game
 from game.checkmate_detector import CheckmateDetector
 
 
-class TestCheckmateWhite(TestCase):
-
-    def setUp(self) -> None:
-        self.initialize_game()
-        return super().setUp()
-
-    def tearDown(self) -> None:
-        self.initialize_game()
-        return super().tearDown()
-
-    def initialize_game(self) -> None:
-        self.game = Game()
-        self.game.board.clean_board()
+class TestCheckmateWhite(CheckmateTestMixin, TestCase):
 
     def load_checkmate_detector(self, fen: str = None):
         if not fen:
             fen = self.game.create_current_fen()
         else:
-            self.game = Game.parse_fen(fen)
+            self.game = parse_fen(fen)
 
         self.checkmate_detector = CheckmateDetector(
             fen=fen,
             detecting_mate_for=PieceColor.WHITE
         )
 
-    def run_all_tests(self):
-        """
-            Run all the tests
-        """
-        methods = [
-            getattr(self, method) for method in dir(self)
-            if callable(getattr(self, method)) and method.startswith('t_')
-        ]
-
-        for method in methods:
-            self.initialize_game()
-            method()
-
-    def t_checkmate_two_rooks(self):
+    def test_checkmate_two_rooks(self):
         """
             Situation:
             Black King on d8
@@ -58,40 +34,8 @@ class TestCheckmateWhite(TestCase):
         """
         print_starting()
 
-        # setting up pieces
-        # Black King on d8
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='d8'
-        )
-
-        # Rooks
-        # One rook on a7
-        self.game.board.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='a7',
-            additional_information={
-                'rook_side': RookSide.QUEEN
-            }
-        )
-
-        # One rook on h1
-        self.game.board.add_piece(
-            piece=PieceName.ROOK,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='h2',
-            additional_information={
-                'rook_side': RookSide.KING
-            }
-        )
-
-        # white king on e1
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='e1'
+        self.game.board.load_from_bitboards(
+            self.FIXTURES['two_rooks']
         )
 
         self.load_checkmate_detector()
@@ -115,7 +59,7 @@ class TestCheckmateWhite(TestCase):
 
         print_success()
 
-    def t_checkmate_king_and_queen(self):
+    def test_checkmate_king_and_queen(self):
         """
             Situation:
             Black King on d8
@@ -128,25 +72,8 @@ class TestCheckmateWhite(TestCase):
         """
 
         print_starting()
-        # add the black king
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.BLACK,
-            algebraic_notation='d8'
-        )
-
-        # add the white king
-        self.game.board.add_piece(
-            piece=PieceName.KING,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='d6'
-        )
-
-        # add the white queen
-        self.game.board.add_piece(
-            piece=PieceName.QUEEN,
-            piece_color=PieceColor.WHITE,
-            algebraic_notation='h1'
+        self.game.board.load_from_bitboards(
+            self.FIXTURES['king_and_queen']
         )
 
         self.load_checkmate_detector()
@@ -177,7 +104,7 @@ class TestCheckmateWhite(TestCase):
         )
         print_success()
 
-    def t_checkmate_in_two(self):
+    def test_checkmate_in_two(self):
         """
             Situation:
             Black King on h1
@@ -266,7 +193,29 @@ class TestCheckmateWhite(TestCase):
 
         print_success()
 
-    def t_real_position_mate_in_two(self):
+    def test_first_checkmate_only(self):
+        """
+            Same position as test_checkmate_in_two, but the search stops at
+            the first check that forces the checkmate.
+        """
+
+        print_starting()
+
+        checkmate_detector = CheckmateDetector(
+            fen='Q7/8/8/8/8/5K2/8/7k w - - 0 1',
+            detecting_mate_for=PieceColor.WHITE,
+            all_checkmates=False
+        )
+
+        self.assertTrue(checkmate_detector.find_force_checkmate())
+
+        routes = checkmate_detector.get_routes_to_checkmates()
+        self.assertEqual(len(routes), 1)
+        self.assertEqual(routes[0]['best_depth'], 3)
+
+        print_success()
+
+    def test_real_position_mate_in_two(self):
 
         print_starting()
 
@@ -304,19 +253,3 @@ class TestCheckmateWhite(TestCase):
         # and the line looks like this:
         # Qxh5 Kg7
         # Qh8#
-
-    def test_run_tests(self):
-        """
-            Since running all the test could take a significant amount of time,
-            this method is used to run a single test if needed.
-
-            If you want to run all the tests, use the `run_all_tests` method.
-
-            NOTE:
-                Yes, in fact you can write on the terminal:
-                >>> python -m unittest
-                    alpha_zero.tests.mcst.checkmate_white.TestCheckmateWhite.__method_name__
-
-                But, do you really want to type all that?
-        """
-        self.run_all_tests()
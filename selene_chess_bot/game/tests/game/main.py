@@ -294,3 +294,24 @@ class TestGame(TestCase):
             print('-' * 50)
 
         print_success()
+
+    def test_clone_is_independent(self):
+
+        print_starting()
+
+        self.game.move_piece('Pe4')
+        self.game.move_piece('Pd5')
+        fen = self.game.create_current_fen()
+
+        game: Game = self.game.clone()
+        game.move_piece('Pexd5')
+
+        # the original game is still on the position before the capture
+        self.assertEqual(self.game.create_current_fen(), fen)
+        self.assertEqual(self.game.player_turn, PieceColor.WHITE)
+        self.assertEqual(self.game.board.piece_count[1], 16)
+
+        self.assertEqual(game.player_turn, PieceColor.BLACK)
+        self.assertEqual(game.board.piece_count[1], 15)
+
+        print_success()
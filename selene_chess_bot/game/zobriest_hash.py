@@ -2,7 +2,7 @@ import random
 
 from core.singleton import SingletonMeta
 
-from pieces.utilites import PieceColor, RookSide
+from pieces.utilites import PieceColor, PieceName, RookSide
 
 
 class ZobristHash(metaclass=SingletonMeta):
@@ -53,3 +53,16 @@ class ZobristHash(metaclass=SingletonMeta):
 # Initialize the ZobristHash singleton
 __zobrist_hash__ = ZobristHash()
 ZOBRIEST_KEYS = __zobrist_hash__.keys
+
+# The keys of ZOBRIEST_KEYS by the name and the color of the piece, in a
+# list indexed by `row * 8 + column`, so hashing a piece doesn't go through
+# the char of its name and a (row, column) tuple
+ZOBRIEST_PIECE_KEYS: dict[tuple[PieceName, PieceColor], list[int]] = {
+    (piece_name, color): [
+        ZOBRIEST_KEYS[piece_name.value[1]][color][(row, column)]
+        for row in range(8)
+        for column in range(8)
+    ]
+    for piece_name in PieceName
+    for color in PieceColor
+}
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from core.utils import convert_to_algebraic_notation
+from core.utils import convert_to_algebraic_notation, KING_MOVES
 from core.types import PositionT
 
 from pieces.piece import Piece
@@ -119,40 +119,31 @@ class King(Piece):
         # attacking the square it wants to move to. So, we need to check
         # if the square is under attack by the opposite color.
 
-        positions_to_check = [
-            (self.position[0] + 1, self.position[1] + 1),
-            (self.position[0] + 1, self.position[1]),
-            (self.position[0] + 1, self.position[1] - 1),
-            (self.position[0], self.position[1] - 1),
-            (self.position[0] - 1, self.position[1] - 1),
-            (self.position[0] - 1, self.position[1]),
-            (self.position[0] - 1, self.position[1] + 1),
-            (self.position[0], self.position[1] + 1),
-        ]
-
+        row, column = self.position
         legal_moves = []
-        attacked_squares = self.board.get_attacked_squares(
-            self.color.opposite(),
-            traspass_king=True,
-            show_in_algebraic_notation=False
-        )
 
-        for position in positions_to_check:
-            if self.board.is_position_on_board(position):
-                if not check_for_attacked_squares:
+        attacked_squares = 0
+        if check_for_attacked_squares:
+            attacked_squares = self.board.get_attacked_bitboard(
+                self.color.opposite(),
+                traspass_king=True
+            )
+
+        for position in KING_MOVES[row * 8 + column]:
+            if not check_for_attacked_squares:
+                legal_moves.append(position)
+                continue
+            if not (attacked_squares >> (position[0] * 8 + position[1])) & 1:
+                if check_capturable_moves:
+                    square = [
+                        self.board.get_square_or_piece(
+                            row=position[0],
+                            column=position[1]
+                        )
+                    ]
+                    legal_moves += self._check_capturable_moves(square)
+                else:
                     legal_moves.append(position)
-                    continue
-                if position not in attacked_squares:
-                    if check_capturable_moves:
-                        square = [
-                            self.board.get_square_or_piece(
-                                row=position[0],
-                                column=position[1]
-                            )
-                        ]
-                        legal_moves += self._check_capturable_moves(square)
-                    else:
-                        legal_moves.append(position)
 
         # check if possible to castle
         kingside_cas_pos = (self.position[0], self.position[1] + 2)
@@ -227,14 +218,17 @@ class King(Piece):
                 return False
 
         # check if the square the king is moving to is under attack
-        attacked_squares = self.board.get_attacked_squares(
-            self.color.opposite(),
-            show_in_algebraic_notation=False
+        attacked_squares = self.board.get_attacked_bitboard(
+            self.color.opposite()
         )
 
+        # the king can't castle out of check
+        row, column = self.position
+        if (attacked_squares >> (row * 8 + column)) & 1:
+            return False
+
         for i in range(len(squares_to_check), 0, -1):
-            pos = (self.position[0], self.position[1] + (i * multiplier))
-            if pos in attacked_squares:
+            if (attacked_squares >> (row * 8 + column + i * multiplier)) & 1:
                 return False
 
         return True
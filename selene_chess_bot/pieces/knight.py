@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from core.utils import convert_to_algebraic_notation
+from core.utils import convert_to_algebraic_notation, KNIGHT_MOVES
 from pieces.piece import Piece
 
 from .utilites import PieceColor, PieceValue, PieceName
@@ -41,31 +41,20 @@ class Knight(Piece):
         **kwargs,
     ) -> list[str | list[int, int]]:
 
-        positions_to_check = [
-            (self.position[0] + 1, self.position[1] + 2),
-            (self.position[0] + 2, self.position[1] + 1),
-            (self.position[0] + 2, self.position[1] - 1),
-            (self.position[0] + 1, self.position[1] - 2),
-            (self.position[0] - 1, self.position[1] - 2),
-            (self.position[0] - 2, self.position[1] - 1),
-            (self.position[0] - 2, self.position[1] + 1),
-            (self.position[0] - 1, self.position[1] + 2)
-        ]
-
+        row, column = self.position
         legal_moves = []
 
-        for position in positions_to_check:
-            if self.board.is_position_on_board(position):
-                if check_capturable_moves:
-                    square = [
-                        self.board.get_square_or_piece(
-                            row=position[0],
-                            column=position[1]
-                        )
-                    ]
-                    legal_moves += self._check_capturable_moves(square)
-                else:
-                    legal_moves.append(position)
+        for position in KNIGHT_MOVES[row * 8 + column]:
+            if check_capturable_moves:
+                square = [
+                    self.board.get_square_or_piece(
+                        row=position[0],
+                        column=position[1]
+                    )
+                ]
+                legal_moves += self._check_capturable_moves(square)
+            else:
+                legal_moves.append(position)
 
         if show_in_algebraic_notation:
             return [
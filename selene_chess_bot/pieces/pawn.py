@@ -44,7 +44,7 @@ class Pawn(Piece):
         can be created in any position on the board with the Game.ParseFEN
         """
 
-        if self.color == PieceColor.WHITE:
+        if self.color is PieceColor.WHITE:
             if self.position not in STARTING_POSITIONS_FOR_W_PAWNS:
                 self.first_move = False
         else:
@@ -66,7 +66,7 @@ class Pawn(Piece):
         show_in_algebraic_notation: bool = False
     ) -> list[tuple[int, int]]:
         # get the squares that are being under attacked by the pawn
-        direction = 1 if self.color == PieceColor.WHITE else -1
+        direction = 1 if self.color is PieceColor.WHITE else -1
         squares_being_attacked: list[tuple[int, int]] = []
 
         # get the left squared attacked by the pawn
@@ -96,7 +96,7 @@ class Pawn(Piece):
         **kwargs
     ) -> list[tuple[int, int]] | list[str]:
 
-        direction = 1 if self.color == PieceColor.WHITE else -1
+        direction = 1 if self.color is PieceColor.WHITE else -1
         self._legal_moves: list[PositionT] = []
 
         # Check if the pawn can move forward
@@ -121,7 +121,7 @@ class Pawn(Piece):
         # next to the left or to the right of this pawn
 
         # check if there is a pawn in direction 0
-        direction = 1 if self.color == PieceColor.WHITE else -1
+        direction = 1 if self.color is PieceColor.WHITE else -1
         if self.position[1] - 1 >= 0:
             piece: Piece | tuple = self.board.get_square_or_piece(
                 row=self.position[0],
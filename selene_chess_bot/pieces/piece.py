@@ -3,7 +3,8 @@ from typing import TYPE_CHECKING, Iterable
 
 from core.types import PositionT
 from core.utils import (
-    convert_from_algebraic_notation, convert_to_algebraic_notation
+    convert_from_algebraic_notation, convert_to_algebraic_notation,
+    DIAGONAL_RAYS
 )
 
 from pieces.utilites import (
@@ -232,6 +233,25 @@ class Piece(ABC):
     def capture(self, captured_by: 'Piece'):
         self.captured_by = captured_by
 
+    def copy_to_board(self, board: 'Board') -> 'Piece':
+        """
+        Return a shallow copy of the piece that belongs to another board.
+
+        The lists and dicts the piece changes are copied, the reference to
+        the king is reset so the copy finds the king of its own board.
+        """
+
+        # copying the __dict__ by hand skips the __reduce_ex__ protocol that
+        # copy.copy goes through, a board clone copies every piece
+        piece = object.__new__(self.__class__)
+        piece.__dict__.update(self.__dict__)
+        piece.board = board
+        piece.move_story = self.move_story.copy()
+        piece.pieces_attacking_me = dict()
+        piece.my_king = None
+
+        return piece
+
     def move_to(
         self,
         new_position: PositionT | str,
@@ -276,7 +296,7 @@ class Piece(ABC):
         )
 
         is_on_passant = False
-        if self.name == PieceName.PAWN:
+        if self.name is PieceName.PAWN:
             if position_to == self._get_on_passant_square():
                 is_on_passant = True
 
@@ -575,43 +595,21 @@ class Piece(ABC):
 
         """
 
-        direction_0: list[Piece | None] = self._check_row_and_columns(
-            start_range=range(self.row - 1, -1, -1),
-            end_range=range(self.column - 1, -1, -1),
-            end_at_piece_found=end_at_piece_found,
-            traspass_king=traspass_king,
-            king_color=king_color,
-            get_only_squares=get_only_squares,
-            get_in_algebraic_notation=get_in_algebraic_notation
-        )
-
-        direction_1: list[Piece | None] = self._check_row_and_columns(
-            start_range=range(self.row - 1, -1, -1),
-            end_range=range(self.column + 1, 8),
-            end_at_piece_found=end_at_piece_found,
-            traspass_king=traspass_king,
-            king_color=king_color,
-            get_only_squares=get_only_squares,
-            get_in_algebraic_notation=get_in_algebraic_notation
-        )
-        direction_2: list[Piece | None] = self._check_row_and_columns(
-            start_range=range(self.row + 1, 8),
-            end_range=range(self.column - 1, -1, -1),
-            end_at_piece_found=end_at_piece_found,
-            traspass_king=traspass_king,
-            king_color=king_color,
-            get_only_squares=get_only_squares,
-            get_in_algebraic_notation=get_in_algebraic_notation
-        )
-        direction_3: list[Piece | None] = self._check_row_and_columns(
-            start_range=range(self.row + 1, 8),
-            end_range=range(self.column + 1, 8),
-            end_at_piece_found=end_at_piece_found,
-            traspass_king=traspass_king,
-            king_color=king_color,
-            get_only_squares=get_only_squares,
-            get_in_algebraic_notation=get_in_algebraic_notation
-        )
+        # the squares of each diagonal are precomputed, so only the
+        # squares until the first piece are visited
+        rays = DIAGONAL_RAYS[self.row * 8 + self.column]
+
+        direction_0, direction_1, direction_2, direction_3 = [
+            self._check_row_and_columns(
+                squares=ray,
+                end_at_piece_found=end_at_piece_found,
+                traspass_king=traspass_king,
+                king_color=king_color,
+                get_only_squares=get_only_squares,
+                get_in_algebraic_notation=get_in_algebraic_notation
+            )
+            for ray in rays
+        ]
 
         return {
             'd0': direction_0,
@@ -715,7 +713,7 @@ class Piece(ABC):
             show_in_algebraic_notation=show_in_algebraic_notation,
         )
 
-        if self.name == PieceName.KING:
+        if self.name is PieceName.KING:
             return piece_legal_moves
 
         # check if the king is under attack
@@ -848,7 +846,7 @@ class Piece(ABC):
                 # Check if the last square contains a friendly king
                 if (
                     isinstance(last_square, Piece) and
-                    last_square.name == PieceName.KING and
+                    last_square.name is PieceName.KING and
                     last_square.color == self.color
                 ):
                     # Return the scan result and direction index for columns
@@ -1021,8 +1019,7 @@ class Piece(ABC):
 
     def _check_row_and_columns(
         self,
-        start_range: list[int],
-        end_range: list[int],
+        squares: Iterable[PositionT],
         end_at_piece_found: bool = True,
         traspass_king: bool = False,
         king_color: PieceColor = None,
@@ -1031,20 +1028,18 @@ class Piece(ABC):
     ) -> list[tuple[int, int]]:
 
         """
-        Check and process a series of positions on the board defined by the
-        given ranges for rows and columns.
+        Check and process a series of positions on the board.
 
-        This method scans through positions on the board specified by the
-        start and end ranges for rows and columns, collecting either pieces or
+        This method scans through the given positions on the board in order,
+        collecting either pieces or
         their positions into a list. The scanning stops based on various
         conditions, such as encountering a piece, finding a king of a specific
         color, or reaching the end of the range.
 
         Parameters:
 
-        start_range (list[int]): The starting range of values for the rows.
-
-        end_range (list[int]): The ending range of values for the columns.
+        squares (Iterable[PositionT]): The positions to scan, usually one of
+        the precomputed rays of core.utils.DIAGONAL_RAYS.
 
         end_at_piece_found (bool, optional): If True, stops scanning upon
         finding a piece. Default is True.
@@ -1077,27 +1072,31 @@ class Piece(ABC):
         """
 
         list_to_output: list[Piece | None] = []
+        grid = self.board.board
+
+        for row, column in squares:
+            last_square = grid[row][column]
+
+            if last_square is None:
+                if get_in_algebraic_notation:
+                    list_to_output.append(
+                        convert_to_algebraic_notation(row, column)
+                    )
+                else:
+                    list_to_output.append((row, column))
+                continue
 
-        for row, column in zip(start_range, end_range):
-            list_to_output.append(
-                self.board.get_square_or_piece(
-                    row,
-                    column,
-                    get_in_algebraic_notation=get_in_algebraic_notation
-                )
-            )
-            last_square = list_to_output[-1]
-
-            if isinstance(last_square, Piece):
-                if get_only_squares:
-                    list_to_output[-1] = last_square.position
+            if get_only_squares:
+                list_to_output.append(last_square.position)
+            else:
+                list_to_output.append(last_square)
 
-                if last_square.name == PieceName.KING:
-                    if traspass_king and last_square.color == king_color:
-                        continue
+            if last_square.name is PieceName.KING:
+                if traspass_king and last_square.color == king_color:
+                    continue
 
-                if end_at_piece_found:
-                    break
+            if end_at_piece_found:
+                break
 
         return list_to_output
 
@@ -1138,7 +1137,7 @@ class Piece(ABC):
             protect the king.
         """
 
-        attacking_pieces: list[PieceName] = None
+        attacking_pieces: frozenset[PieceName] = None
 
         if direction == 0 or direction == 1:
             attacking_pieces = ATTACKING_ROWS_AND_COLUMNS
@@ -1296,43 +1295,47 @@ class Piece(ABC):
         # direction
         direction_list: list[Piece | None] = []
 
-        # Initialize the row and column values
-        row_column = [None, None]
+        # The squares are read straight from the grid, an empty square is
+        # None and anything else is a piece, this avoids going through
+        # get_square_or_piece and building a position list on every square
+        grid = self.board.board
 
         # Iterate over the range of values to scan in the specified direction
         for f_value in range(start_value, end_value, step):
             # Update the row or column value based on f_value_side
-            row_column[f_value_side] = f_value
-            row_column[1 - f_value_side] = board_scan_value
-
-            # Append the square or piece found at the current position to the
-            # direction list
-            direction_list.append(
-                self.board.get_square_or_piece(
-                    *row_column,
-                    get_in_algebraic_notation=get_in_algebraic_notation
-                )
-            )
-
-            # Get the last square or piece added to the direction list
-            last_square = direction_list[-1]
+            if f_value_side == 0:
+                row, column = f_value, board_scan_value
+            else:
+                row, column = board_scan_value, f_value
+
+            last_square = grid[row][column]
+
+            # Empty squares are added as positions
+            if last_square is None:
+                if get_in_algebraic_notation:
+                    direction_list.append(
+                        convert_to_algebraic_notation(row, column)
+                    )
+                else:
+                    direction_list.append((row, column))
+                continue
 
-            # Check if the last square is a piece
-            if isinstance(last_square, Piece):
-                # If only square positions are needed, replace the piece with
-                # its position
-                if get_only_squares:
-                    direction_list[-1] = last_square.position
+            # If only square positions are needed, add the position of the
+            # piece instead of the piece
+            if get_only_squares:
+                direction_list.append(last_square.position)
+            else:
+                direction_list.append(last_square)
 
-                # If the piece is a king and matches the specified color,
-                # determine if scanning should continue
-                if last_square.name == PieceName.KING:
-                    if traspass_king and last_square.color == king_color:
-                        continue
+            # If the piece is a king and matches the specified color,
+            # determine if scanning should continue
+            if last_square.name is PieceName.KING:
+                if traspass_king and last_square.color == king_color:
+                    continue
 
-                # If the scan should end upon finding a piece, break the loop
-                if end_at_piece_found:
-                    break
+            # If the scan should end upon finding a piece, break the loop
+            if end_at_piece_found:
+                break
 
         # Return the list of squares or pieces found during the scan
         return direction_list
@@ -1340,7 +1343,7 @@ class Piece(ABC):
     def _check_if_a_piece_can_attack_friendly_king_in_given_moves(
         self,
         moves: 'list[tuple[int, int] | Piece | str]',
-        pieces_to_check: list[PieceName]
+        pieces_to_check: frozenset[PieceName]
     ):
 
         for move in moves:
@@ -6,14 +6,14 @@ class PieceColor(Enum):
     BLACK = 1
 
     def opposite(self):
-        if self == PieceColor.WHITE:
+        if self is PieceColor.WHITE:
             return PieceColor.BLACK
         else:
             return PieceColor.WHITE
 
     @staticmethod
     def get_opposite(color):
-        if color == PieceColor.WHITE:
+        if color is PieceColor.WHITE:
             return PieceColor.BLACK
         else:
             return PieceColor.WHITE
@@ -42,10 +42,10 @@ class PieceName(Enum):
 
     @staticmethod
     def get_piece_from_string(piece_string) -> 'PieceName':
-        for piece in PieceName:
-            if piece_string in piece.value:
-                return piece
-        raise ValueError(f"Invalid piece string: {piece_string}")
+        try:
+            return PIECE_NAMES_BY_STRING[piece_string]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid piece string: {piece_string}")
 
 
 class RookSide(Enum):
@@ -53,21 +53,43 @@ class RookSide(Enum):
     KING = 1
 
 
-NO_TRASPASS_KING_PIECES = [
+# Iterating the Enum class goes through its metaclass on every loop, the
+# hot paths iterate this tuple instead
+PIECE_NAMES: tuple[PieceName, ...] = tuple(PieceName)
+
+# Both the name ('Pawn') and the abbreviation ('P') of each piece
+PIECE_NAMES_BY_STRING: dict[str, PieceName] = {
+    string: piece_name
+    for piece_name in PIECE_NAMES
+    for string in piece_name.value
+}
+
+# The character of each piece in a board set up, white pieces in upper case
+PIECES_BY_CHAR: dict[str, tuple[PieceColor, PieceName]] = {
+    char: (color, piece_name)
+    for piece_name in PIECE_NAMES
+    for color, char in (
+        (PieceColor.WHITE, piece_name.value[1]),
+        (PieceColor.BLACK, piece_name.value[1].lower()),
+    )
+}
+
+# The collections below are only used for membership tests
+NO_TRASPASS_KING_PIECES = frozenset((
     PieceName.PAWN,
     PieceName.KING,
     PieceName.KNIGHT
-]
+))
 
-ATTACKING_ROWS_AND_COLUMNS = [
+ATTACKING_ROWS_AND_COLUMNS = frozenset((
     PieceName.ROOK,
     PieceName.QUEEN,
-]
+))
 
-ATTACKING_DIAGONALS = [
+ATTACKING_DIAGONALS = frozenset((
     PieceName.BISHOP,
     PieceName.QUEEN,
-]
+))
 
 STARTING_POSITIONS_FOR_W_PAWNS = [
     (1, 0), (1, 1), (1, 2), (1, 3),